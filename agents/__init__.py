@@ -1,11 +1,15 @@
 from .base import create_agent
+from .cache import AgentResponseCache
 from .news_type_classifier.agent import news_type_classifier_agent
 from .entity_extractor.agent import entity_extractor_agent
 from .relation_sentiment.agent import relation_sentiment_agent
+from .combined_analysis.agent import combined_analysis_agent
 
 __all__ = [
     "create_agent",
+    "AgentResponseCache",
     "news_type_classifier_agent",
     "entity_extractor_agent",
     "relation_sentiment_agent",
+    "combined_analysis_agent",
 ]
@@ -2,13 +2,21 @@ import os
 from dotenv import load_dotenv
 from google.adk.agents import Agent
 
+from agents.fake_llm import FakeLlm, is_fake_model
+
 load_dotenv()
 MODEL_ID = os.getenv("MODEL_ID")
 
 def create_agent(name: str, system_instruction: str, input_schema, output_schema) -> Agent:
+    model = MODEL_ID
+
+    # MODEL_ID=fake... 이면 네트워크 없이 동작하는 가짜 모델로 대체 (벤치마크/오프라인 테스트용)
+    if is_fake_model(MODEL_ID):
+        model = FakeLlm(model=MODEL_ID, agent_name=name, output_schema=output_schema)
+
     return Agent(
         name=name,
-        model=MODEL_ID,
+        model=model,
         instruction=system_instruction,
         input_schema=input_schema,
         output_schema=output_schema,
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from agents.base import MODEL_ID
+
+DEFAULT_CACHE_PATH = Path(os.getenv("AGENT_CACHE_PATH", ".cache/agent_responses.sqlite3"))
+DEFAULT_CACHE_MAX_BYTES = int(float(os.getenv("AGENT_CACHE_MAX_MB", "512")) * 1024 * 1024)
+CACHE_BYPASS = os.getenv("AGENT_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+
+def _json_default(obj):
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class AgentResponseCache:
+    """
+    ADK 에이전트 응답(JSON dict)을 SQLite 에 저장하는 디스크 캐시.
+
+    - 키: 에이전트 이름 + MODEL_ID + 시스템 프롬프트 해시 + 입력 payload 해시
+    - 전체 크기가 max_bytes 를 넘으면 가장 오래 안 쓰인(LRU) 항목부터 삭제
+    - bypass=True 이면 읽기/쓰기 모두 건너뛴다 (AGENT_CACHE_BYPASS=1)
+    - 이벤트 루프 안에서는 aget/aset 을 쓴다 (sqlite 호출을 스레드로 넘겨서 다른 코루틴을 막지 않음).
+      연결 하나를 여러 스레드가 쓰므로 모든 sqlite 호출은 self._lock 안에서 한다.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        bypass: bool = CACHE_BYPASS,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    # 첫 사용 시점에 연결 (import 만으로 파일이 생기지 않도록)
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    agent_name TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(agent, payload: Dict[str, Any]) -> str:
+        prompt_hash = _sha256(str(getattr(agent, "instruction", "")))
+        input_hash = _sha256(
+            json.dumps(payload, sort_keys=True, ensure_ascii=False, default=_json_default)
+        )
+        return _sha256(f"{agent.name}|{MODEL_ID}|{prompt_hash}|{input_hash}")
+
+    def get(self, key: str, decode: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Any:
+        """
+        저장된 값. decode 를 주면 decode(값) 을 돌려주고, decode 가 None 을 내면(스키마가 바뀐 옛 응답 등)
+        캐시 미스로 센다 → hits 는 실제로 쓸 수 있었던 응답만 센다.
+        """
+        if self.bypass:
+            return None
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+        value = json.loads(row[0])
+        if decode is not None:
+            value = decode(value)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self.conn.commit()
+            self.hits += 1
+        return value
+
+    async def aget(self, key: str, decode: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Any:
+        if self.bypass:
+            return None
+        return await asyncio.to_thread(self.get, key, decode)
+
+    def set(self, key: str, agent_name: str, value: Dict[str, Any]) -> None:
+        if self.bypass:
+            return
+
+        data = json.dumps(value, ensure_ascii=False, default=_json_default)
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, agent_name, value, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, agent_name, data, len(data.encode("utf-8")), now, now),
+            )
+            self._evict()
+            self.conn.commit()
+
+    async def aset(self, key: str, agent_name: str, value: Dict[str, Any]) -> None:
+        if self.bypass:
+            return
+        await asyncio.to_thread(self.set, key, agent_name, value)
+
+    def _evict(self) -> None:
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # 오래 안 쓰인 순서대로 지우면서 용량 아래로 내려올 때까지
+        stale_keys = []
+        for key, size in self.conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"hits": self.hits, "misses": self.misses, "bypass": self.bypass}
+        if not self.bypass:
+            with self._lock:
+                entries, size = self.conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+            stats.update({"entries": entries, "bytes": size})
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
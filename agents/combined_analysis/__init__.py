@@ -0,0 +1,8 @@
+from .agent import combined_analysis_agent
+from .schemas import CombinedAnalysisInput, CombinedAnalysisOutput
+
+__all__ = [
+    "combined_analysis_agent",
+    "CombinedAnalysisInput",
+    "CombinedAnalysisOutput",
+]
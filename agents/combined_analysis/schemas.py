@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+from agents.news_type_classifier.schemas import NewsTypeOutput
+from agents.entity_extractor.schemas import EntityExtractorOutput
+from agents.relation_sentiment.schemas import RelationSentimentOutput
+
+class CombinedAnalysisInput(BaseModel):
+    article: str
+
+class CombinedAnalysisOutput(BaseModel):
+    news_type: NewsTypeOutput
+    entity_extraction: EntityExtractorOutput
+    relation_sentiment: RelationSentimentOutput
@@ -0,0 +1,70 @@
+import re
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# 앞뒤 ```json / ``` 코드펜스를 한 번의 sub 로 제거
+CODE_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+@lru_cache(maxsize=None)
+def get_output_adapter(output_schema) -> TypeAdapter:
+    """output_schema 별 TypeAdapter 는 한 번만 만든다."""
+    return TypeAdapter(output_schema)
+
+
+def strip_code_fence(text: str) -> str:
+    return CODE_FENCE_RE.sub("", text)
+
+
+def event_text(event) -> Optional[str]:
+    """ADK 이벤트에서 텍스트 파트만 이어 붙여 꺼낸다. 텍스트가 없으면 None."""
+    content = getattr(event, "content", None)
+    if not content:
+        return None
+
+    parts = getattr(content, "parts", None)
+    if parts:
+        text = "".join(p.text for p in parts if getattr(p, "text", None))
+    else:
+        text = str(content)
+
+    return text or None
+
+
+def _warn_invalid(agent, e: ValidationError) -> None:
+    first = e.errors()[0]
+    loc = ".".join(str(x) for x in first.get("loc", ()))
+    print(f"[경고] {agent.name} 출력 검증 실패 ({e.error_count()}건): {loc} {first.get('msg')}")
+
+
+def decode_agent_text(agent, text: str) -> Optional[BaseModel]:
+    """
+    에이전트의 최종 텍스트 응답을 output_schema 로 바로 검증/파싱한다.
+    JSON 이 깨졌거나 스키마와 맞지 않으면 경고를 남기고 None.
+    """
+    adapter = get_output_adapter(agent.output_schema)
+    try:
+        return adapter.validate_json(strip_code_fence(text))
+    except ValidationError as e:
+        _warn_invalid(agent, e)
+        return None
+
+
+def decode_agent_value(agent, value: Any) -> Optional[BaseModel]:
+    """
+    이미 파싱된 값(event.output, 캐시에 저장된 dict 등)을 output_schema 로 검증한다.
+    """
+    if isinstance(value, agent.output_schema):
+        return value
+
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+
+    adapter = get_output_adapter(agent.output_schema)
+    try:
+        return adapter.validate_python(value)
+    except ValidationError as e:
+        _warn_invalid(agent, e)
+        return None
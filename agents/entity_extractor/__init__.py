@@ -1,9 +1,11 @@
 from .agent import entity_extractor_agent
 from .schemas import EntityExtractorInput, EntityExtractorOutput, Entity
+from .dictionary import extract_entities_from_dictionary
 
 __all__ = [
     "entity_extractor_agent",
     "EntityExtractorInput",
     "EntityExtractorOutput",
     "Entity",
+    "extract_entities_from_dictionary",
 ]
@@ -0,0 +1,194 @@
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from company import company_match
+from company.company_match import extract_companies_from_news, fuzzy_lookup
+from .schemas import Entity
+
+COMPANY_DIR = Path(__file__).resolve().parents[2] / "company"
+KOREA_JSON_PATH = COMPANY_DIR / "corp_merged.json"
+US_JSON_PATH = COMPANY_DIR / "sp_500_list.json"
+INDEX_ARTIFACT_PATH = COMPANY_DIR / "company_index.pkl"
+
+# 사전 매칭만으로는 풀 수 없는 언급 (그룹명 → 대표 계열사 매핑은 LLM 몫)
+GROUP_MENTION_RE = re.compile(r"[가-힣A-Za-z0-9]+\s?(?:그룹|계열사|계열)")
+
+# 기업명처럼 생긴 토큰. 매칭된 alias 로 설명되지 않으면 "미해결 언급"으로 본다.
+COMPANY_LIKE_RE = re.compile(
+    r"[가-힣A-Za-z0-9&]+(?:홀딩스|지주|전자|화학|제약|바이오|건설|증권|은행|카드|생명|보험"
+    r"|에너지|모터스|중공업|물산|상사|텔레콤|엔터테인먼트|푸드)"
+    r"|(?:㈜|\(주\)|주식회사)\s?[가-힣A-Za-z0-9&]+"
+)
+
+# 미해결 언급을 퍼지 조회로 살릴 때 요구하는 최소 유사도 (낮추면 엉뚱한 기업에 붙을 수 있음)
+FUZZY_RESOLVE_MIN_SCORE = 0.7
+
+# 제목(첫 줄) 언급은 본문 언급보다 무겁게 (keyword_kobert 의 제목 가중치와 같은 3배)
+TITLE_MENTION_WEIGHT = 3
+
+
+@lru_cache(maxsize=1)
+def load_company_index() -> Optional[List[Dict[str, Any]]]:
+    """
+    company/ 아래 corp_merged.json + sp_500_list.json 으로 인덱스를 한 번만 만든다.
+    (입력이 그대로면 미리 빌드된 company_index.pkl 을 읽는다)
+    파일이 없으면 None (→ fast path 비활성).
+    """
+    if not KOREA_JSON_PATH.exists() or not US_JSON_PATH.exists():
+        print(f"[경고] 기업 사전 파일이 없어 사전 매칭을 건너뜁니다: {COMPANY_DIR}")
+        return None
+    return company_match.load_company_index(KOREA_JSON_PATH, US_JSON_PATH, INDEX_ARTIFACT_PATH)
+
+
+def _is_numeric_alias(alias: str) -> bool:
+    return alias.isdigit()
+
+
+def _unresolved_mentions(article: str, matched_aliases: List[str]) -> List[re.Match]:
+    """기업명처럼 생긴 토큰 중 매칭된 alias 로 설명되지 않는 것들"""
+    aliases_norm = [a.lower() for a in matched_aliases]
+    unresolved = []
+    for m in COMPANY_LIKE_RE.finditer(article):
+        mention = re.sub(r"^(?:㈜|\(주\)|주식회사)\s?", "", m.group(0)).lower()
+        # 매칭된 alias 와 같거나, alias 로 끝나는 형태("lg전자" ← "lg전자")면 해결된 것으로 본다
+        if not any(mention == a or mention.endswith(a) for a in aliases_norm):
+            unresolved.append(m)
+    return unresolved
+
+
+def _resolve_fuzzy(
+    mentions: List[re.Match],
+    company_index: List[Dict[str, Any]],
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    미해결 언급을 alias n-gram 역색인으로 찾아 company_match 결과 형태로 돌려준다.
+    하나라도 FUZZY_RESOLVE_MIN_SCORE 를 못 넘거나 1, 2위가 동점(모호)이면 None.
+    """
+    resolved: Dict[str, Dict[str, Any]] = {}
+    for m in mentions:
+        hits = fuzzy_lookup(m.group(0), company_index, k=2, min_score=FUZZY_RESOLVE_MIN_SCORE)
+        if not hits or (len(hits) > 1 and hits[1]["score"] == hits[0]["score"]):
+            return None
+
+        top = hits[0]
+        match = resolved.setdefault(
+            company_match.company_key(top),
+            {**top, "matched_aliases": [top["matched_alias"]], "mentions": []},
+        )
+        match["mentions"].append({"alias": m.group(0), "start": m.start(), "end": m.end()})
+
+    for match in resolved.values():
+        match["mention_count"] = len(match["mentions"])
+        match["first_mention"] = match["mentions"][0]["start"]
+    return list(resolved.values())
+
+
+def _merge_matches(
+    matches: List[Dict[str, Any]],
+    extra: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """같은 기업이면 언급만 합친다"""
+    by_key = {company_match.company_key(m): m for m in matches}
+    merged = list(matches)
+    for m in extra:
+        same = by_key.get(company_match.company_key(m))
+        if same is None:
+            merged.append(m)
+            continue
+        same["mentions"] = sorted(same["mentions"] + m["mentions"], key=lambda x: x["start"])
+        same["mention_count"] = len(same["mentions"])
+        same["first_mention"] = same["mentions"][0]["start"]
+    return merged
+
+
+def mention_salience(match: Dict[str, Any], title_end: int) -> int:
+    """언급 횟수 기반 중요도. 제목(title_end 이전) 언급은 TITLE_MENTION_WEIGHT 배."""
+    return sum(
+        TITLE_MENTION_WEIGHT if m["start"] < title_end else 1
+        for m in match.get("mentions", ())
+    )
+
+
+def rank_by_salience(matches: List[Dict[str, Any]], article: str) -> List[Dict[str, Any]]:
+    """
+    company_match 결과를 중요도 내림차순 → 첫 언급 위치 오름차순으로 정렬.
+    기사 첫 줄을 제목으로 본다 (줄바꿈이 없으면 제목 없음).
+    """
+    title_end = max(article.find("\n"), 0)
+    return sorted(
+        matches,
+        key=lambda m: (-mention_salience(m, title_end), m.get("first_mention", 0)),
+    )
+
+
+def match_to_entity(match: Dict[str, Any]) -> Entity:
+    alias = match["matched_aliases"][0]
+
+    if match["source"] == "KR":
+        name = match.get("name") or alias
+        exchange = match.get("exchange")
+    else:
+        name = match.get("company_kor") or match.get("company") or alias
+        exchange = None
+
+    count = match.get("mention_count", 1)
+    if "score" in match:
+        mention = match["mentions"][0]["alias"]
+        reason = f"기업 사전(company_match) alias '{alias}' 퍼지 매칭, 유사도 {match['score']} (언급 {count}회)"
+    else:
+        mention = alias
+        reason = f"기업 사전(company_match) alias '{alias}' 직접 매칭 (언급 {count}회)"
+
+    return Entity(
+        name=name,
+        original_mention=mention,
+        is_listed=True,
+        exchange=exchange,
+        reason=reason,
+        mapped_type="개별기업",
+    )
+
+
+def extract_entities_from_dictionary(
+    article: str,
+    company_index: Optional[List[Dict[str, Any]]] = None,
+) -> Optional[List[Entity]]:
+    """
+    company_match 사전 매칭만으로 기사의 기업 언급을 다 설명할 수 있으면 Entity 리스트를,
+    아니면 None 을 돌려준다 (None → entity_extractor_agent 로 넘어감).
+
+    사전 매칭을 믿지 않는 경우:
+    - 매칭된 기업이 하나도 없음
+    - 숫자 티커로만 잡힌 기업이 있음 (기사 속 숫자와 우연히 겹칠 수 있음)
+    - "OO그룹", "계열사" 같은 그룹 언급이 있음
+    - 기업명처럼 생긴 토큰 중 매칭된 alias 로 설명되지 않고, 퍼지 조회로도 확실히 못 찾는 것이 있음
+    돌려주는 Entity 는 언급 중요도(제목 가중 언급 횟수) 순서.
+    """
+    if company_index is None:
+        company_index = load_company_index()
+    if not company_index:
+        return None
+
+    matches = extract_companies_from_news(article, company_index)
+    if not matches:
+        return None
+
+    if any(all(_is_numeric_alias(a) for a in m["matched_aliases"]) for m in matches):
+        return None
+
+    if GROUP_MENTION_RE.search(article):
+        return None
+
+    matched_aliases = [a for m in matches for a in m["matched_aliases"]]
+    unresolved = _unresolved_mentions(article, matched_aliases)
+    if unresolved:
+        # 띄어쓰기/표기 차이 정도면 퍼지 조회로 살리고, 아니면 LLM 으로
+        fuzzy_matches = _resolve_fuzzy(unresolved, company_index)
+        if fuzzy_matches is None:
+            return None
+        matches = _merge_matches(matches, fuzzy_matches)
+
+    # 중요한 기업부터 → relation_sentiment 단계가 주요 기업을 먼저 보게 된다
+    return [match_to_entity(m) for m in rank_by_salience(matches, article)]
@@ -0,0 +1,136 @@
+import os
+import json
+import random
+import asyncio
+import itertools
+from pathlib import Path
+from typing import Any, AsyncGenerator, List, Literal, Optional, Union, get_args, get_origin
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import BaseModel, PrivateAttr
+
+FAKE_MODEL_PREFIX = "fake"
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+FAKE_LLM_JITTER_MS = float(os.getenv("FAKE_LLM_JITTER_MS", "0"))
+FAKE_LLM_RESPONSES_DIR = os.getenv("FAKE_LLM_RESPONSES_DIR")
+
+# 토큰 수는 대략 글자 2개당 1토큰으로 어림 (한국어 기사 기준)
+CHARS_PER_TOKEN = 2
+
+
+def is_fake_model(model_id: Optional[str]) -> bool:
+    return bool(model_id) and model_id.startswith(FAKE_MODEL_PREFIX)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def sample_value(annotation, field_name: str = "") -> Any:
+    """
+    타입 힌트만 보고 스키마를 통과하는 최소 샘플 값을 만든다.
+    Literal → 첫 번째 값, List[X] → X 하나짜리 리스트, Optional[X] → X
+    """
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+
+    if origin is Literal:
+        return args[0]
+    if origin in (list, List):
+        return [sample_value(args[0], field_name)] if args else []
+    if origin is Union or (origin is not None and type(None) in args):
+        non_none = [a for a in args if a is not type(None)]
+        return sample_value(non_none[0], field_name) if non_none else None
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {
+            name: sample_value(field.annotation, name)
+            for name, field in annotation.model_fields.items()
+        }
+
+    if annotation is bool:
+        return True
+    if annotation is int:
+        return 0
+    if annotation is float:
+        return 0.0
+    return f"샘플 {field_name}".strip()
+
+
+def load_canned_responses(responses_dir: Optional[str], agent_name: str) -> List[str]:
+    """
+    responses_dir/<agent_name>.json 이 있으면 그 안의 응답을 돌려가며 재생한다.
+    파일 내용은 응답 객체 하나 또는 응답 객체 리스트.
+    """
+    if not responses_dir:
+        return []
+
+    path = Path(responses_dir) / f"{agent_name}.json"
+    if not path.exists():
+        return []
+
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if not isinstance(data, list):
+        data = [data]
+    return [json.dumps(d, ensure_ascii=False) for d in data]
+
+
+class FakeLlm(BaseLlm):
+    """
+    네트워크 없이 ADK 에이전트를 돌리기 위한 가짜 모델.
+    - 정해 둔 응답(canned) 이 있으면 순서대로 재생, 없으면 output_schema 로 템플릿 응답 생성
+    - latency_ms ± jitter_ms 만큼 기다렸다가 응답 (실제 LLM 왕복 시간 흉내)
+    """
+
+    model: str = FAKE_MODEL_PREFIX
+    agent_name: str = ""
+    output_schema: Any = None
+    latency_ms: float = FAKE_LLM_LATENCY_MS
+    jitter_ms: float = FAKE_LLM_JITTER_MS
+    responses_dir: Optional[str] = FAKE_LLM_RESPONSES_DIR
+
+    _responses: Any = PrivateAttr(default=None)
+
+    def _next_response_text(self) -> str:
+        if self._responses is None:
+            canned = load_canned_responses(self.responses_dir, self.agent_name)
+            if not canned and self.output_schema is not None:
+                canned = [json.dumps(sample_value(self.output_schema), ensure_ascii=False)]
+            self._responses = itertools.cycle(canned or ["{}"])
+        return next(self._responses)
+
+    def _delay_sec(self) -> float:
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        delay = self._delay_sec()
+        if delay:
+            await asyncio.sleep(delay)
+
+        text = self._next_response_text()
+
+        prompt_chars = sum(
+            len(p.text or "")
+            for c in (llm_request.contents or [])
+            for p in (c.parts or [])
+        )
+        if llm_request.config and isinstance(llm_request.config.system_instruction, str):
+            prompt_chars += len(llm_request.config.system_instruction)
+
+        prompt_tokens = prompt_chars // CHARS_PER_TOKEN
+        output_tokens = estimate_tokens(text)
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+        )
@@ -0,0 +1,224 @@
+import os
+import time
+import random
+import asyncio
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from agents.tracing import annotate
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """모델 엔드포인트가 연속으로 실패해서 호출을 바로 거절하는 상태."""
+
+
+class AgentOutputError(RuntimeError):
+    """응답은 왔지만 비었거나 output_schema 검증에 실패한 경우 (재시도 대상)."""
+
+
+class RetryPolicy:
+    """
+    에이전트 호출 한 번에 적용할 timeout / 재시도 / hedge 설정.
+    기본값은 환경변수(AGENT_*)에서 읽는다.
+    """
+
+    def __init__(
+        self,
+        timeout_sec: float = float(os.getenv("AGENT_TIMEOUT_SEC", "120")),
+        max_retries: int = int(os.getenv("AGENT_MAX_RETRIES", "2")),
+        backoff_base_sec: float = float(os.getenv("AGENT_BACKOFF_BASE_SEC", "1.0")),
+        backoff_max_sec: float = float(os.getenv("AGENT_BACKOFF_MAX_SEC", "20")),
+        hedge_percentile: float = float(os.getenv("AGENT_HEDGE_PERCENTILE", "0")),
+        hedge_min_samples: int = int(os.getenv("AGENT_HEDGE_MIN_SAMPLES", "20")),
+    ):
+        self.timeout_sec = timeout_sec
+        self.max_retries = max_retries
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+        # 0 이면 hedge 끔. 예: 95 → 최근 p95 지연을 넘기면 같은 요청을 하나 더 보낸다
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+
+    def backoff_sec(self, retry_no: int) -> float:
+        """full jitter: [0, min(max, base * 2^(n-1))] 에서 균등 추출"""
+        cap = min(self.backoff_max_sec, self.backoff_base_sec * (2 ** (retry_no - 1)))
+        return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    - closed: 정상 호출
+    - open: 연속 실패가 failure_threshold 에 닿으면 reset_timeout_sec 동안 즉시 CircuitOpenError
+    - half-open: 그 뒤 한 건만 시험 호출, 성공하면 closed / 실패하면 다시 open
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = int(os.getenv("AGENT_BREAKER_FAILURES", "5")),
+        reset_timeout_sec: float = float(os.getenv("AGENT_BREAKER_RESET_SEC", "30")),
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_sec = reset_timeout_sec
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout_sec:
+            return "open"
+        return "half_open"
+
+    def before_call(self) -> bool:
+        """호출해도 되면 통과, 아니면 CircuitOpenError. 이번 호출이 half-open 시험 호출이면 True"""
+        state = self.state
+        if state == "open":
+            raise CircuitOpenError(f"모델 엔드포인트 차단 중 (연속 실패 {self.failures}회)")
+        if state == "half_open":
+            if self._probe_in_flight:
+                raise CircuitOpenError("모델 엔드포인트 시험 호출 진행 중")
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """시험 호출이 성공/실패 기록 없이 끝났을 때 (취소 등) 다음 호출이 다시 시험할 수 있게"""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """에이전트별 최근 성공 지연시간 (hedge 기준값 계산용)."""
+
+    def __init__(self, window: int = 200):
+        self.samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, name: str, latency_sec: float) -> None:
+        self.samples[name].append(latency_sec)
+
+    def percentile(self, name: str, pct: float) -> Optional[float]:
+        values = self.samples.get(name)
+        if not values:
+            return None
+        ordered = sorted(values)
+        idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[idx]
+
+
+DEFAULT_POLICY = RetryPolicy()
+# 세 에이전트가 같은 MODEL_ID 엔드포인트를 쓰므로 breaker 하나를 공유
+model_breaker = CircuitBreaker()
+latency_tracker = LatencyTracker()
+
+
+def _hedge_delay(name: str, policy: RetryPolicy) -> Optional[float]:
+    if policy.hedge_percentile <= 0:
+        return None
+    if len(latency_tracker.samples.get(name, ())) < policy.hedge_min_samples:
+        return None
+    return latency_tracker.percentile(name, policy.hedge_percentile)
+
+
+async def _run_hedged(name: str, attempt: Callable[[], Awaitable[T]], policy: RetryPolicy) -> T:
+    """
+    timeout 안에서 attempt 를 실행한다.
+    hedge 기준 지연을 넘기도록 응답이 없으면 같은 요청을 하나 더 보내고, 먼저 성공한 쪽을 쓴다.
+    """
+    hedge_delay = _hedge_delay(name, policy)
+    if hedge_delay is None or hedge_delay >= policy.timeout_sec:
+        return await asyncio.wait_for(attempt(), policy.timeout_sec)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + policy.timeout_sec
+    pending = {asyncio.ensure_future(attempt())}
+
+    try:
+        done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+        if not done:
+            annotate(hedged=True)
+            pending.add(asyncio.ensure_future(attempt()))
+
+        last_exc: Optional[BaseException] = None
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_exc = task.exception()
+
+        if last_exc is not None and not pending:
+            raise last_exc
+        raise asyncio.TimeoutError(f"{policy.timeout_sec}s 안에 응답 없음")
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def call_with_retries(
+    name: str,
+    attempt: Callable[[], Awaitable[T]],
+    policy: RetryPolicy = DEFAULT_POLICY,
+    breaker: CircuitBreaker = model_breaker,
+) -> T:
+    """
+    attempt() 를 timeout / 재시도(jitter backoff) / hedge / circuit breaker 로 감싸 실행한다.
+    - CircuitOpenError 는 재시도 없이 바로 올린다 (fail fast)
+    - AgentOutputError 는 엔드포인트 장애가 아니므로 breaker 실패로 세지 않는다
+    모든 시도가 실패하면 마지막 예외를 올린다.
+    """
+    last_exc: Optional[BaseException] = None
+
+    for attempt_no in range(policy.max_retries + 1):
+        if attempt_no > 0:
+            delay = policy.backoff_sec(attempt_no)
+            print(
+                f"[경고] {name} 재시도 {attempt_no}/{policy.max_retries} ({delay:.1f}s 후): "
+                f"{type(last_exc).__name__}: {last_exc}"
+            )
+            await asyncio.sleep(delay)
+
+        is_probe = breaker.before_call()
+        start = time.perf_counter()
+
+        try:
+            result = await _run_hedged(name, attempt, policy)
+        except AgentOutputError as e:
+            breaker.record_success()
+            last_exc = e
+            continue
+        except Exception as e:
+            breaker.record_failure()
+            last_exc = e
+            continue
+        finally:
+            # CancelledError 같은 BaseException 으로 빠져나가면 record_* 가 불리지 않으므로
+            # half-open 이 시험 호출 중 상태로 영영 남지 않게 여기서 푼다
+            if is_probe:
+                breaker.release_probe()
+
+        breaker.record_success()
+        latency_tracker.record(name, time.perf_counter() - start)
+        annotate(attempts=attempt_no + 1)
+        return result
+
+    annotate(attempts=policy.max_retries + 1)
+    raise last_exc
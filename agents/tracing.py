@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import uuid
+import functools
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# TRACE_PATH 가 있으면 span 을 JSONL 로 기록, 없으면 아무것도 남기지 않는다
+TRACE_PATH = os.getenv("TRACE_PATH")
+
+TraceSink = Callable[[Dict[str, Any]], None]
+
+
+class JsonlTraceSink:
+    """span 하나를 JSON 한 줄로 append 하는 기본 sink."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.path.open("a", encoding="utf-8")
+
+    def __call__(self, record: Dict[str, Any]) -> None:
+        self._f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+_sink: Optional[TraceSink] = JsonlTraceSink(TRACE_PATH) if TRACE_PATH else None
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def set_trace_sink(sink: Optional[TraceSink]) -> None:
+    """기록 위치를 바꾼다. None 이면 tracing 끔. (dict 를 받는 아무 callable 이나 가능)"""
+    global _sink
+    _sink = sink
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class Span:
+    """
+    with Span("agent", agent="entity_extractor") as span: ...
+    - 벽시계 시간, 첫 이벤트까지 시간, 이벤트 수, 실패 사유를 기록
+    - 바깥 span 이 있으면 같은 trace_id 로 묶인다 (asyncio task 사이에도 contextvars 로 전달)
+    """
+
+    def __init__(self, name: str, **attrs):
+        parent = _current_span.get()
+        self.name = name
+        self.trace_id = parent.trace_id if parent else _new_id()
+        self.span_id = _new_id()
+        self.parent_id = parent.span_id if parent else None
+        self.attrs: Dict[str, Any] = dict(attrs)
+        self.events = 0
+        self.ttfe_ms: Optional[float] = None
+        self.failure_reason: Optional[str] = None
+        self._start = 0.0
+        self._start_time = 0.0
+        self._token = None
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def mark_event(self) -> None:
+        if self.events == 0:
+            self.ttfe_ms = (time.perf_counter() - self._start) * 1000
+        self.events += 1
+
+    def fail(self, reason: str) -> None:
+        self.failure_reason = reason
+
+    def __enter__(self) -> "Span":
+        self._start = time.perf_counter()
+        self._start_time = time.time()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        wall_ms = (time.perf_counter() - self._start) * 1000
+        _current_span.reset(self._token)
+
+        if exc is not None and self.failure_reason is None:
+            self.failure_reason = f"{exc_type.__name__}: {exc}"
+
+        if _sink is not None:
+            record = {
+                "trace_id": self.trace_id,
+                "span_id": self.span_id,
+                "parent_id": self.parent_id,
+                "name": self.name,
+                "start_time": self._start_time,
+                "wall_ms": round(wall_ms, 3),
+                "ttfe_ms": round(self.ttfe_ms, 3) if self.ttfe_ms is not None else None,
+                "events": self.events,
+                "status": "error" if self.failure_reason else "ok",
+                "failure_reason": self.failure_reason,
+                **self.attrs,
+            }
+            try:
+                _sink(record)
+            except Exception as e:
+                print(f"[경고] trace 기록 실패: {e}")
+
+        return False
+
+
+def annotate(**attrs) -> None:
+    """현재 span 에 속성 추가 (span 밖이면 무시)."""
+    span = _current_span.get()
+    if span is not None:
+        span.set(**attrs)
+
+
+def traced(name: str):
+    """async 함수 전체를 span 하나로 감싸는 데코레이터."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with Span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
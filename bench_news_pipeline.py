@@ -0,0 +1,163 @@
+"""
+news_pipeline 오프라인 벤치마크
+
+MODEL_ID=fake 로 가짜 모델(agents/fake_llm.py)을 붙여서 네트워크 없이
+- 단계별 / 전체 지연시간
+- 동시성 수준별 처리량
+- 파이썬 글루 코드(FakeContext, 이벤트 디코딩 등)의 CPU 오버헤드
+를 측정한다.
+
+사용법:
+  python bench_news_pipeline.py [기사수] [지연ms] [지터ms]
+  FAKE_LLM_RESPONSES_DIR=canned/ python bench_news_pipeline.py   → 정해 둔 응답 재생
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import timeit
+import asyncio
+from collections import defaultdict
+from contextlib import redirect_stdout
+from typing import Dict, List
+
+# 가짜 모델은 에이전트 생성 시점에 결정되므로 news_pipeline import 전에 설정
+os.environ["MODEL_ID"] = "fake-bench"
+
+import news_pipeline
+from context import FakeContext
+from agents.decoding import decode_agent_text
+from agents.fake_llm import sample_value
+
+NUM_ARTICLES = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+LATENCY_MS = float(sys.argv[2]) if len(sys.argv) > 2 else 200.0
+JITTER_MS = float(sys.argv[3]) if len(sys.argv) > 3 else 50.0
+CONCURRENCY_LEVELS = [1, 4, 16, 64]
+
+AGENTS = [
+    news_pipeline.news_type_classifier_agent,
+    news_pipeline.entity_extractor_agent,
+    news_pipeline.relation_sentiment_agent,
+    news_pipeline.combined_analysis_agent,
+]
+
+SAMPLE_ARTICLE = (
+    "삼성전자가 3분기 반도체 부문 영업이익이 전년 대비 크게 늘었다고 발표했다. "
+    "SK하이닉스도 HBM 수요 확대로 실적 개선이 예상되며, 엔비디아 향 공급이 늘고 있다. "
+) * 20
+
+
+def set_fake_latency(latency_ms: float, jitter_ms: float) -> None:
+    for agent in AGENTS:
+        agent.model.latency_ms = latency_ms
+        agent.model.jitter_ms = jitter_ms
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def summarize(values: List[float]) -> str:
+    return (
+        f"p50 {percentile(values, 50):8.1f}ms  "
+        f"p95 {percentile(values, 95):8.1f}ms  "
+        f"max {max(values):8.1f}ms"
+    )
+
+
+# 단계별 시간 측정을 위해 run_async_agent 를 감싼다
+stage_latencies: Dict[str, List[float]] = defaultdict(list)
+_original_run_async_agent = news_pipeline.run_async_agent
+
+
+async def timed_run_async_agent(agent, context, payload):
+    start = time.perf_counter()
+    try:
+        return await _original_run_async_agent(agent, context, payload)
+    finally:
+        stage_latencies[agent.name].append((time.perf_counter() - start) * 1000)
+
+
+news_pipeline.run_async_agent = timed_run_async_agent
+
+
+async def run_level(articles: List[str], concurrency: int, mode: str) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    e2e: List[float] = []
+
+    async def one(article: str) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await news_pipeline.run_news_analysis_async(article, False, mode)
+            e2e.append((time.perf_counter() - start) * 1000)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    await asyncio.gather(*(one(a) for a in articles))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "wall_sec": wall,
+        "throughput": len(articles) / wall,
+        "cpu_ms_per_article": cpu * 1000 / len(articles),
+        "e2e": e2e,
+    }
+
+
+def bench_pipeline(mode: str) -> None:
+    articles = [f"[{i}] {SAMPLE_ARTICLE}" for i in range(NUM_ARTICLES)]
+
+    print(f"\n=== 모드: {mode} (기사 {NUM_ARTICLES}건, 지연 {LATENCY_MS}±{JITTER_MS}ms) ===")
+    print(f"{'동시성':>6} | {'처리량(건/s)':>12} | {'CPU ms/건':>10} | 전체 지연")
+
+    for concurrency in CONCURRENCY_LEVELS:
+        stage_latencies.clear()
+        with redirect_stdout(io.StringIO()):
+            res = asyncio.run(run_level(articles, concurrency, mode))
+
+        print(
+            f"{concurrency:>6} | {res['throughput']:>12.2f} | "
+            f"{res['cpu_ms_per_article']:>10.2f} | {summarize(res['e2e'])}"
+        )
+
+    # 마지막 동시성 수준에서의 단계별 지연
+    for name, values in stage_latencies.items():
+        print(f"  - {name:<22} {summarize(values)}")
+
+
+def bench_glue_overhead() -> None:
+    """LLM 지연 0 으로 두고 파이썬 글루 코드 자체의 비용만 본다."""
+    print("\n=== 글루 코드 오버헤드 (지연 0ms) ===")
+
+    n = 2000
+    per_call = timeit.timeit(FakeContext, number=n) / n * 1e6
+    print(f"FakeContext() 생성        {per_call:8.1f}us")
+
+    for agent in AGENTS:
+        text = "```json\n" + json.dumps(sample_value(agent.output_schema), ensure_ascii=False) + "\n```"
+        per_call = timeit.timeit(lambda: decode_agent_text(agent, text), number=n) / n * 1e6
+        print(f"decode {agent.name:<18} {per_call:8.1f}us  ({len(text)}자)")
+
+    set_fake_latency(0.0, 0.0)
+    for mode in news_pipeline.ANALYSIS_MODES:
+        with redirect_stdout(io.StringIO()):
+            res = asyncio.run(run_level([SAMPLE_ARTICLE] * 200, 1, mode))
+        print(f"파이프라인 1건 ({mode:<8})  {res['cpu_ms_per_article'] * 1000:8.1f}us CPU")
+
+
+if __name__ == "__main__":
+    # 캐시가 켜져 있으면 두 번째 기사부터 LLM 을 안 타므로 측정에서 제외
+    news_pipeline.response_cache.bypass = True
+
+    set_fake_latency(LATENCY_MS, JITTER_MS)
+    for mode in news_pipeline.ANALYSIS_MODES:
+        bench_pipeline(mode)
+
+    bench_glue_overhead()
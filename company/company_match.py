@@ -1,11 +1,25 @@
+import os
+import sys
 import json
 import re
+import pickle
+import heapq
+import hashlib
+import itertools
+import math
+import unicodedata
+import multiprocessing
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
 
 KOREA_JSON_PATH = Path("corp_merged.json")
 US_JSON_PATH = Path("sp_500_list.json")
+INDEX_ARTIFACT_PATH = Path("company_index.pkl")
+
+# 아티팩트 구조(슬림 레코드/오토마톤 상태)가 바뀌면 올린다
+INDEX_ARTIFACT_VERSION = 2
 
 
 def load_json(path: Path):
@@ -35,165 +49,799 @@ def normalize_english_name(name: str) -> str:
     n = n.strip(" ,")
     return n
 
-def korean_word_boundary_match(text: str, word: str) -> bool:
+# 기업명 바로 뒤에 붙어도 같은 단어로 보는 조사 (긴 것부터 확인)
+# "삼성전자가", "SK하이닉스는", "현대차의" 는 매칭, "삼성전자서비스" 는 조사 뒤가 또 글자라서 거절
+JOSA_SUFFIXES = (
+    "이", "가", "은", "는", "을", "를", "의", "에", "와", "과", "도", "로", "만", "나", "랑", "서",
+    "으로", "에서", "에게", "한테", "께서", "까지", "부터", "보다", "처럼", "마저", "조차", "이나",
+    "이랑", "이며", "이고", "이다", "이라", "라는", "라고", "로서", "로써", "측", "측은", "측이",
+    "에는", "에도", "에서는", "에서도", "에서의", "에게는", "으로는", "으로도", "으로의", "으로서",
+    "로는", "로도", "로의", "와는", "와도", "와의", "과는", "과도", "과의", "까지는", "부터는",
+    "보다는", "만의", "만이", "만은", "이라는", "이라고", "이었다", "였다", "이지만", "지만",
+)
+
+
+def _compile_josa_table(suffixes) -> Dict[int, frozenset]:
+    """길이별 조사 집합. 후보 위치에서 긴 길이부터 슬라이스 한 번 + set 조회로 끝난다."""
+    table: Dict[int, set] = {}
+    for josa in suffixes:
+        table.setdefault(len(josa), set()).add(josa)
+    return {n: frozenset(table[n]) for n in sorted(table, reverse=True)}
+
+
+JOSA_TABLE = _compile_josa_table(JOSA_SUFFIXES)
+
+
+def _josa_end(text: str, end: int, is_word_char) -> Optional[int]:
     """
-    한글 기업명이 부분 문자열로 잘못 매칭되는 것을 방지.
-    앞뒤가 한글/영문/숫자가 아닌 경우만 매칭으로 인정.
+    text[end:] 이 조사 + 단어 경계로 시작하면 조사 끝 위치, 아니면 None.
+    조사 뒤에 또 글자가 오면(예: "서" + "비스") 조사가 아니라 더 긴 단어의 일부로 본다.
     """
-    pattern = rf"(?<![가-힣A-Za-z0-9]){re.escape(word)}(?![가-힣A-Za-z0-9])"
-    return re.search(pattern, text) is not None
+    for n, josas in JOSA_TABLE.items():
+        stop = end + n
+        if stop > len(text) or text[end:stop] not in josas:
+            continue
+        if stop == len(text) or not is_word_char(text[stop]):
+            return stop
+    return None
 
 
-def build_company_index() -> List[Dict[str, Any]]:
+def korean_word_boundary_match(text: str, word: str) -> bool:
+    """
+    한글 기업명이 부분 문자열로 잘못 매칭되는 것을 방지.
+    앞이 한글/영문/숫자가 아니고, 뒤가 한글/영문/숫자가 아니거나 조사(+경계)인 경우만 매칭으로 인정.
+    """
+    pattern = rf"(?<![가-힣A-Za-z0-9]){re.escape(word)}"
+    for m in re.finditer(pattern, text):
+        end = m.end()
+        if end == len(text) or not _is_ko_word_char(text[end]):
+            return True
+        if _josa_end(text, end, _is_ko_word_char) is not None:
+            return True
+    return False
+
+
+def korea_index_entry(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """corp_merged.json 한 행 → 인덱스 레코드 (alias 가 하나도 없으면 None)"""
+    aliases = set()
+
+    name = (row.get("name") or "").strip()
+    eng = (row.get("corp_eng_name") or "").strip()
+    ticker = (row.get("ticker") or "").strip()
+
+    if name:
+        aliases.add(name)
+
+    if eng:
+        aliases.add(eng)
+        simplified_eng = normalize_english_name(eng)
+        if simplified_eng and simplified_eng.lower() != eng.lower():
+            aliases.add(simplified_eng)
+
+    numeric_ticker = "".join(ch for ch in ticker if ch.isdigit())
+    if numeric_ticker:
+        aliases.add(numeric_ticker)
+
+    if not aliases:
+        return None
+
+    return {
+        "source": "KR",
+        "name": name,
+        "corp_eng_name": eng,
+        "ticker": ticker,
+        "exchange": row.get("exchange"),
+        "corp_code": row.get("corp_code"),
+        "raw": row,  
+        "aliases": sorted(aliases, key=len, reverse=True),  # 길이 긴 것부터
+    }
+
+
+def us_index_entry(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """sp_500_list.json 한 행 → 인덱스 레코드 (alias 가 하나도 없으면 None)"""
+    aliases = set()
+
+    company = (row.get("company") or "").strip()
+    company_kor = (row.get("company_kor") or "").strip()
+    symbol = (row.get("symbol") or "").strip()
+
+    if company:
+        aliases.add(company)
+        aliases.add(normalize_english_name(company))
+    if company_kor:
+        aliases.add(company_kor)
+    if symbol:
+        aliases.add(symbol)
+
+    aliases = {a for a in aliases if a}  
+
+    if not aliases:
+        return None
+
+    return {
+        "source": "US",
+        "company": company,
+        "company_kor": company_kor,
+        "symbol": symbol,
+        "CIK": row.get("CIK"),
+        "raw": row,
+        "aliases": sorted(aliases, key=len, reverse=True),
+    }
+
+
+def build_company_index(
+    korea_path: Path = KOREA_JSON_PATH,
+    us_path: Path = US_JSON_PATH,
+) -> List[Dict[str, Any]]:
     """
     한국 + 미국 기업 정보를 읽어서,
     각 기업별 alias 목록을 포함한 통합 인덱스를 만든다.
     """
-    kor_list = load_json(KOREA_JSON_PATH)
-    us_list = load_json(US_JSON_PATH)
+    kor_list = load_json(korea_path)
+    us_list = load_json(us_path)
 
     index: List[Dict[str, Any]] = []
 
     # 🇰🇷 한국 상장사
     for row in kor_list:
-        aliases = set()
+        entry = korea_index_entry(row)
+        if entry is not None:
+            index.append(entry)
 
-        name = (row.get("name") or "").strip()
-        eng = (row.get("corp_eng_name") or "").strip()
-        ticker = (row.get("ticker") or "").strip()
+    # 🇺🇸 미국 S&P 500
+    for row in us_list:
+        entry = us_index_entry(row)
+        if entry is not None:
+            index.append(entry)
 
-        if name:
-            aliases.add(name)
+    return index
 
-        if eng:
-            aliases.add(eng)
-            simplified_eng = normalize_english_name(eng)
-            if simplified_eng and simplified_eng.lower() != eng.lower():
-                aliases.add(simplified_eng)
 
-        numeric_ticker = "".join(ch for ch in ticker if ch.isdigit())
-        if numeric_ticker:
-            aliases.add(numeric_ticker)
+# -----------------------------
+# alias 다중 패턴 매칭 (Aho-Corasick)
+# -----------------------------
+def _is_word_char(ch: str) -> bool:
+    """정규식 \\w 와 같은 기준 (한글 포함)"""
+    return ch.isalnum() or ch == "_"
 
-        if not aliases:
-            continue
 
-        index.append(
-            {
-                "source": "KR",
-                "name": name,
-                "corp_eng_name": eng,
-                "ticker": ticker,
-                "exchange": row.get("exchange"),
-                "corp_code": row.get("corp_code"),
-                "raw": row,  
-                "aliases": sorted(aliases, key=len, reverse=True),  # 길이 긴 것부터
-            }
-        )
+def _is_ko_word_char(ch: str) -> bool:
+    """korean_word_boundary_match 의 [가-힣A-Za-z0-9] 기준"""
+    return "가" <= ch <= "힣" or (ch.isascii() and ch.isalnum())
 
-    # 🇺🇸 미국 S&P 500
-    for row in us_list:
-        aliases = set()
 
-        company = (row.get("company") or "").strip()
-        company_kor = (row.get("company_kor") or "").strip()
-        symbol = (row.get("symbol") or "").strip()
+CHAR_BITS = 21
+
+# alias 별 경계 규칙
+BOUNDARY_KO = 0           # 한글 alias: [가-힣A-Za-z0-9] 경계 + 뒤에 조사 허용
+BOUNDARY_EN = 1           # 영문이 섞인 alias: \b 경계 + 뒤에 조사 허용
+BOUNDARY_EN_STRICT = 2    # 종목 심볼/짧은 영문 alias: \b 경계만 ("A는", "C의" 같은 익명 표기에 걸리지 않게)
+
+# 영문 alias 뒤 조사를 허용하는 최소 길이 (한글이 섞인 alias 는 길이와 상관없이 허용)
+EN_JOSA_MIN_LEN = 3
 
-        if company:
-            aliases.add(company)
-            aliases.add(normalize_english_name(company))
-        if company_kor:
-            aliases.add(company_kor)
-        if symbol:
-            aliases.add(symbol)
 
-        aliases = {a for a in aliases if a}  
+def _alias_boundary_rule(alias_norm: str, is_symbol: bool) -> int:
+    if re.search(r"[a-z]", alias_norm) is None:
+        return BOUNDARY_KO
+    if HANGUL_RE.search(alias_norm) or (not is_symbol and len(alias_norm) >= EN_JOSA_MIN_LEN):
+        return BOUNDARY_EN
+    return BOUNDARY_EN_STRICT
 
-        if not aliases:
+
+class AliasMatcher:
+    """
+    모든 alias(소문자)로 Aho-Corasick 오토마톤을 한 번 만들어 두고,
+    기사를 한 번만 훑어서 후보 위치를 찾은 뒤 후보에만 경계 규칙을 적용한다.
+    비용: alias 수 × 본문 길이 → 본문 길이 + 후보 수
+    """
+
+    def __init__(self, company_index: List[Dict[str, Any]]):
+        # 패턴별 정보: (alias_norm, 경계 규칙 BOUNDARY_*, [(기업 인덱스, 원래 alias), ...])
+        self.patterns: List[Tuple[str, int, List[Tuple[int, str]]]] = []
+        pattern_ids: Dict[str, int] = {}
+        # 어느 기업에서든 종목 심볼로 쓰이는 alias (소문자)
+        symbols = {
+            (comp.get("symbol") or "").lower() for comp in company_index if comp.get("symbol")
+        }
+
+        for comp_idx, comp in enumerate(company_index):
+            for alias in comp["aliases"]:
+                alias_norm = alias.lower()
+                if not alias_norm:
+                    continue
+                pid = pattern_ids.get(alias_norm)
+                if pid is None:
+                    pid = len(self.patterns)
+                    pattern_ids[alias_norm] = pid
+                    # 영문 포함 여부 / 심볼 여부로 경계 규칙을 정한다
+                    rule = _alias_boundary_rule(alias_norm, alias_norm in symbols)
+                    self.patterns.append((alias_norm, rule, []))
+                self.patterns[pid][2].append((comp_idx, alias))
+
+        self._build([p[0] for p in self.patterns])
+
+    def to_state(self) -> Dict[str, Any]:
+        """pickle 용 상태 (클래스 경로에 의존하지 않도록 기본 자료형만)"""
+        return {"patterns": self.patterns, "goto": self.goto, "fail": self.fail, "out": self.out}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "AliasMatcher":
+        matcher = cls.__new__(cls)
+        matcher.patterns = state["patterns"]
+        matcher.goto = state["goto"]
+        matcher.fail = state["fail"]
+        matcher.out = state["out"]
+        return matcher
+
+    def _build(self, words: List[str]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+
+        for pid, word in enumerate(words):
+            node = 0
+            for ch in word:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(pid)
+
+        # 루트 자식의 fail 은 루트(0), 그 아래는 BFS 순서로 채운다
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                # fail 경로의 출력까지 미리 합쳐 두면 스캔 중에 따라갈 필요가 없다
+                out[nxt].extend(out[fail[nxt]])
+
+        # 노드별 dict 대신 (노드 << 21 | 문자코드) → 다음 노드 하나의 dict 로 펼친다
+        # (유니코드 코드포인트는 21비트 안에 들어감, pickle 로드도 훨씬 빠름)
+        self.goto = {
+            (n << CHAR_BITS) | ord(ch): nxt
+            for n, children in enumerate(goto)
+            for ch, nxt in children.items()
+        }
+        self.fail = fail
+        self.out = [tuple(o) for o in out]
+
+    def iter_hits(self, text_norm: str):
+        """(시작, 끝, 패턴 id) 를 본문 순서대로. 겹치는 후보도 모두 나온다."""
+        goto, fail, out, patterns = self.goto, self.fail, self.out, self.patterns
+        node = 0
+        for i, ch in enumerate(text_norm):
+            code = ord(ch)
+            nxt = goto.get((node << CHAR_BITS) | code)
+            while nxt is None and node:
+                node = fail[node]
+                nxt = goto.get((node << CHAR_BITS) | code)
+            node = nxt or 0
+            for pid in out[node]:
+                yield i + 1 - len(patterns[pid][0]), i + 1, pid
+
+    @staticmethod
+    def _english_boundary_ok(text: str, start: int, end: int, allow_josa: bool = True) -> bool:
+        # \b 는 양쪽 문자의 \w 여부가 다를 때 성립
+        before = start > 0 and _is_word_char(text[start - 1])
+        first = _is_word_char(text[start])
+        if before == first:
+            return False
+        last = _is_word_char(text[end - 1])
+        after = end < len(text) and _is_word_char(text[end])
+        if last != after:
+            return True
+        # "Nvidia는", "SK하이닉스가" 처럼 영문 alias 뒤에 바로 붙은 조사도 같은 단어로 본다
+        return allow_josa and last and _josa_end(text, end, _is_word_char) is not None
+
+    @staticmethod
+    def _korean_boundary_ok(text: str, start: int, end: int) -> bool:
+        if start > 0 and _is_ko_word_char(text[start - 1]):
+            return False
+        if end < len(text) and _is_ko_word_char(text[end]):
+            return _josa_end(text, end, _is_ko_word_char) is not None
+        return True
+
+    def find(self, text_norm: str) -> Dict[int, List[Tuple[str, int, int]]]:
+        """
+        기업 인덱스 → 경계 규칙을 통과한 (원래 alias, 시작, 끝) 리스트.
+        끝 위치 순서대로 반복 언급도, 같은 기업 alias 끼리 겹친 후보도 모두 담는다
+        (한 번의 언급으로 합치는 건 collapse_overlapping_hits).
+        """
+        found: Dict[int, List[Tuple[str, int, int]]] = {}
+
+        for start, end, pid in self.iter_hits(text_norm):
+            _, rule, owners = self.patterns[pid]
+            if rule == BOUNDARY_KO:
+                ok = self._korean_boundary_ok(text_norm, start, end)
+            else:
+                ok = self._english_boundary_ok(text_norm, start, end, allow_josa=rule == BOUNDARY_EN)
+            if not ok:
+                continue
+
+            for comp_idx, alias in owners:
+                found.setdefault(comp_idx, []).append((alias, start, end))
+
+        return found
+
+
+def collapse_overlapping_hits(hits: List[Tuple[str, int, int]]) -> List[Tuple[str, int, int]]:
+    """
+    같은 기업 alias 끼리 겹치면("SK hynix" / "SK hynix Inc.") 한 번의 언급으로 보고 긴 쪽만 남긴다.
+    겹침은 사슬로 이어질 수 있으므로(A∩B, B∩C) 시작 위치 순으로 훑으면서 지금까지 묶인 구간의
+    가장 먼 끝과 비교해 한 덩어리로 묶고, 덩어리마다 가장 긴 hit 하나를 고른다.
+    """
+    mentions: List[Tuple[str, int, int]] = []
+    cluster_end = -1
+    for alias, start, end in sorted(hits, key=lambda h: (h[1], -h[2])):
+        if mentions and start < cluster_end:
+            if end - start > mentions[-1][2] - mentions[-1][1]:
+                mentions[-1] = (alias, start, end)
+            cluster_end = max(cluster_end, end)
             continue
+        mentions.append((alias, start, end))
+        cluster_end = end
+    return mentions
+
+
+# 같은 company_index 로 여러 번 호출될 때 오토마톤을 다시 만들지 않도록 마지막 것 하나를 기억
+_matcher_cache: Dict[str, Any] = {"index": None, "matcher": None}
+
+
+def get_alias_matcher(company_index: List[Dict[str, Any]]) -> AliasMatcher:
+    if _matcher_cache["index"] is not company_index:
+        _matcher_cache["matcher"] = AliasMatcher(company_index)
+        _matcher_cache["index"] = company_index
+    return _matcher_cache["matcher"]
+
+
+# -----------------------------
+# alias n-gram 역색인 (정확히 일치하지 않는 언급의 퍼지 조회)
+# -----------------------------
+FUZZY_NOISE_RE = re.compile(r"주식회사|㈜|\(주\)|[\s.,·&'\"()\[\]-]+")
+# 영문 법인 접미사는 거의 모든 이름에 붙어 있어서 n-gram 으로서 변별력이 없다
+FUZZY_LEGAL_SUFFIX_RE = re.compile(r"\b(?:co|corp|corporation|inc|incorporated|ltd|limited|company|plc)\b\.?")
+HANGUL_RE = re.compile(r"[가-힣]")
+
+
+def normalize_for_fuzzy(name: str) -> str:
+    """
+    NFKC + 소문자 + 공백/문장부호/(주)/영문 법인 접미사 제거
+    ("삼성 전자", "(주)삼성전자" → "삼성전자", "SK hynix Inc." → "skhynix")
+    """
+    if not name:
+        return ""
+    s = unicodedata.normalize("NFKC", name).lower()
+    stripped = FUZZY_LEGAL_SUFFIX_RE.sub(" ", s)
+    # 접미사만으로 된 이름("Company")이면 지우지 않는다
+    if stripped.strip(" ,."):
+        s = stripped
+    return FUZZY_NOISE_RE.sub("", s)
 
-        index.append(
+
+def char_ngrams(norm: str) -> frozenset:
+    """
+    앞뒤에 ^, $ 를 붙인 문자 n-gram 집합.
+    영문은 trigram, 한글이 섞이면 bigram (한글 음절 하나가 영문 몇 글자 분량이라 trigram 은 너무 성김)
+    """
+    n = 2 if HANGUL_RE.search(norm) else 3
+    padded = f"^{norm}$"
+    if len(padded) <= n:
+        return frozenset([padded])
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+class NgramIndex:
+    """
+    이름 → key 퍼지 조회용 n-gram 역색인.
+    search() 는 질의의 n-gram posting list 만 훑어서 Dice 계수 상위 k 개를 돌려준다
+    (전체 이름을 하나씩 비교하지 않으므로 수만 개 이름에서도 수십 μs 수준).
+    """
+
+    def __init__(self):
+        # 항목: (key, 원래 이름, n-gram 집합)
+        self.items: List[Tuple[Any, str, frozenset]] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.exact: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, key: Any, name: str) -> None:
+        norm = normalize_for_fuzzy(name)
+        if not norm:
+            return
+        grams = char_ngrams(norm)
+        item_id = len(self.items)
+        self.items.append((key, name, grams))
+        self.exact.setdefault(norm, []).append(item_id)
+        for g in grams:
+            self.postings.setdefault(g, []).append(item_id)
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.5) -> List[Tuple[Any, float, str]]:
+        """(key, 점수 0~1, 매칭된 이름) 을 점수 내림차순으로. 같은 key 는 가장 높은 점수 하나만."""
+        norm = normalize_for_fuzzy(query)
+        if not norm:
+            return []
+
+        best: Dict[Any, Tuple[float, str]] = {}
+        for item_id in self.exact.get(norm, ()):
+            key, name, _ = self.items[item_id]
+            best[key] = (1.0, name)
+
+        if len(best) < k:
+            grams = char_ngrams(norm)
+            # prefix filtering: Dice >= min_score 이려면 최소 need 개 n-gram 을 공유해야 하므로,
+            # posting 이 짧은(드문) n-gram 앞쪽 len - need + 1 개 중 하나에는 반드시 들어 있다.
+            # 후보는 그 posting 에서만 모으고, 흔한 n-gram 의 긴 posting 은 훑지 않는다.
+            need = max(1, math.ceil(min_score * len(grams) / (2 - min_score)))
+            rare_first = sorted(grams, key=lambda g: len(self.postings.get(g, ())))
+            candidates = set()
+            for g in rare_first[: len(grams) - need + 1]:
+                candidates.update(self.postings.get(g, ()))
+
+            for item_id in candidates:
+                key, name, item_grams = self.items[item_id]
+                score = 2 * len(grams & item_grams) / (len(grams) + len(item_grams))
+                if score >= min_score and score > best.get(key, (0.0, ""))[0]:
+                    best[key] = (score, name)
+
+        top = heapq.nlargest(k, best.items(), key=lambda kv: kv[1][0])
+        return [(key, round(score, 4), name) for key, (score, name) in top]
+
+
+_fuzzy_cache: Dict[str, Any] = {"index": None, "ngram": None}
+
+
+def get_fuzzy_index(company_index: List[Dict[str, Any]]) -> NgramIndex:
+    """company_index 의 모든 alias(숫자 티커 제외) → 기업 인덱스 n-gram 역색인 (마지막 것 하나 캐시)"""
+    if _fuzzy_cache["index"] is not company_index:
+        ngram = NgramIndex()
+        for comp_idx, comp in enumerate(company_index):
+            for alias in comp["aliases"]:
+                if not alias.isdigit():
+                    ngram.add(comp_idx, alias)
+        _fuzzy_cache["ngram"] = ngram
+        _fuzzy_cache["index"] = company_index
+    return _fuzzy_cache["ngram"]
+
+
+def fuzzy_lookup(
+    mention: str,
+    company_index: List[Dict[str, Any]],
+    k: int = 5,
+    min_score: float = 0.5,
+) -> List[Dict[str, Any]]:
+    """
+    alias 와 정확히 일치하지 않는 언급("삼성 전자", 오타, 줄임말)을 비슷한 alias 순으로 찾는다.
+    결과는 extract_companies_from_news 와 같은 기업 필드 + score / matched_alias.
+    """
+    results = []
+    for comp_idx, score, alias in get_fuzzy_index(company_index).search(mention, k, min_score):
+        result = company_fields(company_index[comp_idx])
+        result.update({"score": score, "matched_alias": alias})
+        results.append(result)
+    return results
+
+
+# -----------------------------
+# 미리 빌드한 인덱스 아티팩트
+# -----------------------------
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def company_key(comp: Dict[str, Any]) -> str:
+    """KR 은 corp_code, US 는 symbol"""
+    if comp["source"] == "KR":
+        return comp.get("corp_code") or comp.get("ticker") or comp.get("name")
+    return comp.get("symbol") or comp.get("company")
+
+
+def build_index_artifact(
+    korea_path: Path = KOREA_JSON_PATH,
+    us_path: Path = US_JSON_PATH,
+    artifact_path: Path = INDEX_ARTIFACT_PATH,
+) -> Dict[str, Any]:
+    """
+    build_company_index 결과에서 raw 행을 뺀 슬림 레코드 + alias 오토마톤을
+    한 파일로 저장한다. 입력 JSON 해시를 같이 적어 두고, 입력이 바뀌면 다시 빌드한다.
+    """
+    index = build_company_index(korea_path, us_path)
+    companies = [{k: v for k, v in comp.items() if k != "raw"} for comp in index]
+    matcher = AliasMatcher(companies)
+
+    payload = {
+        "version": INDEX_ARTIFACT_VERSION,
+        "inputs": {
+            "korea": file_sha256(korea_path),
+            "us": file_sha256(us_path),
+        },
+        "companies": companies,
+        "by_key": {company_key(c): i for i, c in enumerate(companies)},
+        "matcher": matcher.to_state(),
+    }
+    _write_artifact(payload, artifact_path)
+    return payload
+
+
+def _write_artifact(payload: Dict[str, Any], artifact_path: Path) -> None:
+    tmp_path = Path(str(artifact_path) + ".tmp")
+    with tmp_path.open("wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, artifact_path)
+
+
+def patch_index_artifact(
+    korea_upserts: List[Dict[str, Any]],
+    korea_removed: Iterable[str],
+    previous_korea_sha256: str,
+    korea_path: Path = KOREA_JSON_PATH,
+    us_path: Path = US_JSON_PATH,
+    artifact_path: Path = INDEX_ARTIFACT_PATH,
+) -> Dict[str, Any]:
+    """
+    corp_merged.json 에서 바뀐 행만 아티팩트에 반영한다 (전체 JSON 재파싱/정규화 생략).
+    - korea_upserts: 추가/변경된 corp_merged 행, korea_removed: 빠진 기업 key(corp_code)
+    - 아티팩트가 previous_korea_sha256(패치 전 corp_merged.json) 기준이 아니면 전체 빌드로 돌아간다
+    - alias 가 그대로인 변경(거래소, 수정일 등)은 오토마톤을 그대로 두고,
+      alias 가 바뀌거나 기업이 추가/삭제된 경우에만 슬림 레코드로 오토마톤을 다시 만든다
+    """
+    payload = None
+    if artifact_path.exists():
+        with artifact_path.open("rb") as f:
+            payload = pickle.loads(f.read())
+
+    if (
+        payload is None
+        or payload.get("version") != INDEX_ARTIFACT_VERSION
+        or payload["inputs"].get("korea") != previous_korea_sha256
+        or payload["inputs"].get("us") != file_sha256(us_path)
+    ):
+        print(f"[INFO] 아티팩트가 이전 입력 기준이 아니라 전체 빌드합니다 → {artifact_path}")
+        return build_index_artifact(korea_path, us_path, artifact_path)
+
+    companies: List[Optional[Dict[str, Any]]] = payload["companies"]
+    by_key: Dict[str, int] = payload["by_key"]
+    rebuild_matcher = False
+
+    for key in korea_removed:
+        idx = by_key.pop(key, None)
+        if idx is not None:
+            companies[idx] = None
+            rebuild_matcher = True
+
+    for row in korea_upserts:
+        entry = korea_index_entry(row)
+        if entry is None:
+            continue
+        entry.pop("raw")
+        key = company_key(entry)
+        idx = by_key.get(key)
+        if idx is None:
+            by_key[key] = len(companies)
+            companies.append(entry)
+            rebuild_matcher = True
+        else:
+            if set(companies[idx]["aliases"]) != set(entry["aliases"]):
+                rebuild_matcher = True
+            companies[idx] = entry
+
+    if rebuild_matcher:
+        # 삭제된 자리를 당겨서 기업 인덱스를 다시 매긴다 (오토마톤 출력이 기업 인덱스를 들고 있음)
+        companies = [c for c in companies if c is not None]
+        payload["companies"] = companies
+        payload["by_key"] = {company_key(c): i for i, c in enumerate(companies)}
+        payload["matcher"] = AliasMatcher(companies).to_state()
+
+    payload["inputs"] = {"korea": file_sha256(korea_path), "us": file_sha256(us_path)}
+    _write_artifact(payload, artifact_path)
+
+    # 같은 프로세스의 캐시가 옛 인덱스를 들고 있지 않게
+    _matcher_cache["index"] = None
+    _fuzzy_cache["index"] = None
+    return payload
+
+
+def load_index_artifact(
+    korea_path: Path = KOREA_JSON_PATH,
+    us_path: Path = US_JSON_PATH,
+    artifact_path: Path = INDEX_ARTIFACT_PATH,
+) -> Optional[Dict[str, Any]]:
+    """아티팩트가 있고 버전/입력 해시가 지금 입력 파일과 같으면 payload, 아니면 None."""
+    if not artifact_path.exists():
+        return None
+
+    with artifact_path.open("rb") as f:
+        payload = pickle.loads(f.read())
+
+    if payload.get("version") != INDEX_ARTIFACT_VERSION:
+        return None
+    if payload.get("inputs") != {"korea": file_sha256(korea_path), "us": file_sha256(us_path)}:
+        return None
+
+    return payload
+
+
+def load_company_index(
+    korea_path: Path = KOREA_JSON_PATH,
+    us_path: Path = US_JSON_PATH,
+    artifact_path: Path = INDEX_ARTIFACT_PATH,
+) -> List[Dict[str, Any]]:
+    """
+    최신 아티팩트가 있으면 그걸 읽고(JSON 파싱/정규화/오토마톤 빌드 생략),
+    없거나 입력이 바뀌었으면 새로 빌드해서 저장한다.
+    오토마톤은 get_alias_matcher 캐시에 바로 올려 둔다.
+    """
+    payload = load_index_artifact(korea_path, us_path, artifact_path)
+    if payload is None:
+        print(f"[INFO] 기업 인덱스 아티팩트 빌드 중... → {artifact_path}")
+        payload = build_index_artifact(korea_path, us_path, artifact_path)
+
+    companies = payload["companies"]
+    _matcher_cache["index"] = companies
+    _matcher_cache["matcher"] = AliasMatcher.from_state(payload["matcher"])
+    return companies
+
+
+def company_fields(comp: Dict[str, Any]) -> Dict[str, Any]:
+    """결과에 실을 기업 필드 (한국/미국 구분)"""
+    result = {"source": comp["source"]}
+    if comp["source"] == "KR":
+        result.update(
             {
-                "source": "US",
-                "company": company,
-                "company_kor": company_kor,
-                "symbol": symbol,
-                "CIK": row.get("CIK"),
-                "raw": row,
-                "aliases": sorted(aliases, key=len, reverse=True),
+                "name": comp.get("name"),
+                "corp_eng_name": comp.get("corp_eng_name"),
+                "ticker": comp.get("ticker"),
+                "exchange": comp.get("exchange"),
+                "corp_code": comp.get("corp_code"),
             }
         )
-
-    return index
+    else:  # US
+        result.update(
+            {
+                "company": comp.get("company"),
+                "company_kor": comp.get("company_kor"),
+                "symbol": comp.get("symbol"),
+                "CIK": comp.get("CIK"),
+            }
+        )
+    return result
 
 
 def extract_companies_from_news(text: str, company_index: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     뉴스 본문(text)에서 어떤 기업이 언급됐는지 alias 기반으로 찾아낸다.
     - company_index: build_company_index() 결과
+    - 같은 스캔에서 언급 위치(mentions: [시작, 끝) 문자 오프셋), 언급 횟수, 첫 언급 위치도 같이 채운다
     """
     results = []
 
+    # 오프셋은 text.lower() 기준 (한글/영문은 원문과 같음)
     text_norm = text.lower()
-
-    for comp in company_index:
-        matched_aliases = []
-
-        for alias in comp["aliases"]:
-            alias_norm = alias.lower()
-            if not alias_norm:
-                continue
-
-            # 알파벳(영문자)이 하나라도 들어간 alias → 단어 경계로 매칭
-            if re.search(r"[a-z]", alias_norm):
-                # \bNVDA\b, \bNvidia\b 이런 식
-                pattern = r"\b" + re.escape(alias_norm) + r"\b"
-                if re.search(pattern, text_norm):
-                    matched_aliases.append(alias)
-            else:
-                if korean_word_boundary_match(text_norm, alias_norm):
-                    matched_aliases.append(alias)
-
-        if matched_aliases:
-            # 중복 제거
-            unique_matched = sorted(set(matched_aliases), key=len, reverse=True)
-            result = {
-                "source": comp["source"],
+    found = get_alias_matcher(company_index).find(text_norm)
+
+    for comp_idx in sorted(found):
+        comp = company_index[comp_idx]
+        # matched_aliases 는 겹친 짧은 alias 까지 전부, mentions 는 겹친 후보를 하나로 합친 것
+        unique_matched = sorted({alias for alias, _, _ in found[comp_idx]}, key=len, reverse=True)
+        mentions = collapse_overlapping_hits(found[comp_idx])
+        result = company_fields(comp)
+        result.update(
+            {
                 "matched_aliases": unique_matched,
+                "mentions": [{"alias": alias, "start": start, "end": end} for alias, start, end in mentions],
+                "mention_count": len(mentions),
+                "first_mention": mentions[0][1],
             }
-            # 한국/미국 구분해서 필드 넣기
-            if comp["source"] == "KR":
-                result.update(
-                    {
-                        "name": comp.get("name"),
-                        "corp_eng_name": comp.get("corp_eng_name"),
-                        "ticker": comp.get("ticker"),
-                        "exchange": comp.get("exchange"),
-                        "corp_code": comp.get("corp_code"),
-                    }
-                )
-            else:  # US
-                result.update(
-                    {
-                        "company": comp.get("company"),
-                        "company_kor": comp.get("company_kor"),
-                        "symbol": comp.get("symbol"),
-                        "CIK": comp.get("CIK"),
-                    }
-                )
-
-            results.append(result)
+        )
+        results.append(result)
 
     return results
 
 
+# -----------------------------
+# 여러 기사 일괄 매칭 (프로세스 풀)
+# -----------------------------
+# 워커가 쓸 인덱스. fork 로 띄우면 부모가 올려 둔 인덱스/오토마톤을 복사 없이(copy-on-write) 그대로 본다.
+_pool_index: Optional[List[Dict[str, Any]]] = None
+
+# 이보다 적으면 프로세스를 띄우는 비용이 더 커서 그냥 현재 프로세스에서 돈다
+MATCH_MANY_MIN_PARALLEL = 64
+
+
+def _init_pool_worker(korea_path: Path, us_path: Path, artifact_path: Path) -> None:
+    """fork 가 없는 플랫폼(spawn)용: 워커마다 아티팩트를 한 번 읽는다."""
+    global _pool_index
+    if _pool_index is None:
+        _pool_index = load_company_index(korea_path, us_path, artifact_path)
+
+
+def _match_in_worker(item: Tuple[int, str]) -> Tuple[int, List[Dict[str, Any]]]:
+    pos, text = item
+    return pos, extract_companies_from_news(text, _pool_index)
+
+
+def match_many(
+    texts: Iterable[str],
+    company_index: Optional[List[Dict[str, Any]]] = None,
+    processes: Optional[int] = None,
+    ordered: bool = True,
+    chunksize: int = 16,
+    korea_path: Path = KOREA_JSON_PATH,
+    us_path: Path = US_JSON_PATH,
+    artifact_path: Path = INDEX_ARTIFACT_PATH,
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    여러 기사를 한 번에 매칭해서 (입력 순번, extract_companies_from_news 결과) 를 yield 한다.
+    - ordered=True 면 입력 순서대로, False 면 끝나는 대로 (순번으로 다시 맞출 수 있음)
+    - 인덱스는 부모에서 한 번만 올리고 워커 풀이 공유 (fork → copy-on-write, spawn → 워커별 아티팩트 로드)
+    - texts 는 제너레이터여도 되고, 풀에는 chunksize 단위로 흘려 보낸다
+    """
+    global _pool_index
+
+    if company_index is None:
+        company_index = load_company_index(korea_path, us_path, artifact_path)
+    # 오토마톤도 fork 전에 만들어 둬야 워커들이 각자 빌드하지 않는다
+    get_alias_matcher(company_index)
+
+    processes = processes or os.cpu_count() or 1
+    items = enumerate(texts)
+
+    # 입력이 적거나 프로세스 1개면 풀 없이 처리
+    head = list(itertools.islice(items, MATCH_MANY_MIN_PARALLEL))
+    if processes <= 1 or len(head) < MATCH_MANY_MIN_PARALLEL:
+        for pos, text in itertools.chain(head, items):
+            yield pos, extract_companies_from_news(text, company_index)
+        return
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        _pool_index = company_index
+        ctx = multiprocessing.get_context("fork")
+        pool = ctx.Pool(processes)
+    else:
+        ctx = multiprocessing.get_context("spawn")
+        pool = ctx.Pool(processes, _init_pool_worker, (korea_path, us_path, artifact_path))
+
+    try:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(_match_in_worker, itertools.chain(head, items), chunksize)
+    finally:
+        pool.terminate()
+        _pool_index = None
+
+
 if __name__ == "__main__":
-    
+    # python company_match.py build → company_index.pkl 만 (다시) 빌드
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        payload = build_index_artifact()
+        print(f"[INFO] 기업 {len(payload['companies'])}개 / alias {len(payload['matcher']['patterns'])}개 → {INDEX_ARTIFACT_PATH}")
+        sys.exit(0)
+
+    # python company_match.py batch <기사 .txt 폴더> → 파일별 결과를 JSONL 로 stdout 에
+    if len(sys.argv) > 2 and sys.argv[1] == "batch":
+        paths = sorted(Path(sys.argv[2]).glob("*.txt"))
+        texts = (p.read_text(encoding="utf-8") for p in paths)
+        for pos, found in match_many(texts):
+            print(json.dumps({"file": paths[pos].name, "companies": found}, ensure_ascii=False))
+        sys.exit(0)
 
     with open("news1.txt", "r", encoding="utf-8") as file:
         news_text = file.read()
 
-    company_index = build_company_index()
+    company_index = load_company_index()
     found = extract_companies_from_news(news_text, company_index)
 
     print("=== FOUND COMPANIES ===")
@@ -0,0 +1,357 @@
+import os
+import sys
+import json
+import sqlite3
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+from company_match import file_sha256, normalize_for_fuzzy
+
+# 다른 디렉토리(disclosure/...)에서 불러도 같은 파일을 보도록 이 파일 위치 기준
+COMPANY_DIR = Path(__file__).resolve().parent
+CORP_MERGED_PATH = COMPANY_DIR / "corp_merged.json"
+US_JSON_PATH = COMPANY_DIR / "sp_500_list.json"
+MARKET_DIR = COMPANY_DIR.parent / "disclosure" / "IPO시점지분희석률"
+NAVER_MCAP_PATH = MARKET_DIR / "naver_market_caps.json"
+COMPANY_MARKET_PATH = MARKET_DIR / "company_list_market.json"
+STORE_PATH = COMPANY_DIR / "company_store.sqlite"
+
+# company_list_market 에서 corp_merged 레코드에 덧붙이는 필드
+# (나머지 필드는 만들 당시 corp_merged 의 사본이라 덮어쓰면 최신 값이 옛 값으로 돌아간다)
+MARKET_FIELDS = ("krx_code", "market", "market_cap_unit_million_krw")
+
+# 테이블 구조가 바뀌면 올린다
+STORE_VERSION = 2
+
+# IN (...) 한 번에 넣는 값 개수 (SQLite 바인딩 변수 한도 아래로)
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+
+CREATE TABLE companies (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,      -- KR / US
+    corp_code TEXT,
+    ticker TEXT,               -- KR 종목코드 (대문자)
+    symbol TEXT,               -- US 심볼 (대문자)
+    name TEXT,
+    data TEXT NOT NULL         -- 원본 레코드 JSON (KR 은 company_list_market 의 시총 필드까지)
+);
+CREATE INDEX idx_companies_corp_code ON companies (corp_code);
+CREATE INDEX idx_companies_ticker ON companies (ticker);
+CREATE INDEX idx_companies_symbol ON companies (symbol);
+
+-- 기업 하나에 이름 여러 개 (한글명, 영문명, US 한글명)
+CREATE TABLE company_names (
+    name_norm TEXT NOT NULL,
+    company_id INTEGER NOT NULL REFERENCES companies (id)
+);
+CREATE INDEX idx_company_names_norm ON company_names (name_norm);
+
+-- 네이버 시총 크롤링 결과 (종목 단위, 우선주 포함)
+CREATE TABLE market_caps (
+    name TEXT,
+    name_norm TEXT,
+    code TEXT,
+    market TEXT,
+    market_cap_unit_million_krw INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX idx_market_caps_norm ON market_caps (name_norm);
+CREATE INDEX idx_market_caps_code ON market_caps (code);
+"""
+
+
+def normalize_store_name(name: Optional[str]) -> str:
+    """이름 인덱스 키 (company_match.normalize_for_fuzzy 와 같은 규칙)"""
+    return normalize_for_fuzzy(str(name or ""))
+
+
+def _load_optional_json(path: Optional[Path]) -> List[Dict[str, Any]]:
+    if path is None or not path.exists():
+        return []
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _input_hashes(paths: Dict[str, Optional[Path]]) -> Dict[str, Optional[str]]:
+    return {key: (file_sha256(path) if path is not None and path.exists() else None) for key, path in paths.items()}
+
+
+def build_company_store(
+    store_path: Path = STORE_PATH,
+    corp_path: Path = CORP_MERGED_PATH,
+    us_path: Path = US_JSON_PATH,
+    mcap_path: Optional[Path] = NAVER_MCAP_PATH,
+    market_path: Optional[Path] = COMPANY_MARKET_PATH,
+) -> None:
+    """
+    JSON 들을 읽어서 SQLite 파일 하나로 만든다 (임시 파일에 쓰고 교체).
+    시총 파일 두 개는 None 이거나 없으면 건너뛴다.
+    """
+    inputs = {"corp": corp_path, "us": us_path, "mcap": mcap_path, "market": market_path}
+
+    # corp_code → company_list_market 레코드 (krx_code / market / 시총)
+    market_by_code = {r.get("corp_code"): r for r in _load_optional_json(market_path)}
+
+    tmp_path = Path(str(store_path) + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+
+        company_rows = []
+        name_rows = []
+
+        def add_company(source: str, record: Dict[str, Any], names: Iterable[str], **keys):
+            company_id = len(company_rows) + 1
+            company_rows.append(
+                (
+                    company_id,
+                    source,
+                    keys.get("corp_code"),
+                    (keys.get("ticker") or "").strip().upper() or None,
+                    (keys.get("symbol") or "").strip().upper() or None,
+                    keys.get("name"),
+                    json.dumps(record, ensure_ascii=False),
+                )
+            )
+            for norm in {normalize_store_name(n) for n in names}:
+                if norm:
+                    name_rows.append((norm, company_id))
+
+        # 🇰🇷 corp_merged (+ company_list_market 의 시총 필드)
+        for row in _load_optional_json(corp_path):
+            market = market_by_code.get(row.get("corp_code"), {})
+            record = {**row, **{k: market[k] for k in MARKET_FIELDS if k in market}}
+            add_company(
+                "KR",
+                record,
+                [row.get("name"), row.get("corp_eng_name")],
+                corp_code=row.get("corp_code"),
+                ticker=str(row.get("ticker") or ""),
+                name=row.get("name"),
+            )
+
+        # 🇺🇸 S&P 500
+        for row in _load_optional_json(us_path):
+            add_company(
+                "US",
+                row,
+                [row.get("company"), row.get("company_kor")],
+                symbol=row.get("symbol"),
+                name=row.get("company"),
+            )
+
+        conn.executemany("INSERT INTO companies VALUES (?, ?, ?, ?, ?, ?, ?)", company_rows)
+        conn.executemany("INSERT INTO company_names VALUES (?, ?)", name_rows)
+        conn.executemany(
+            "INSERT INTO market_caps VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    item.get("name"),
+                    normalize_store_name(item.get("name")),
+                    item.get("code"),
+                    item.get("market"),
+                    item.get("market_cap_unit_million_krw"),
+                    json.dumps(item, ensure_ascii=False),
+                )
+                for item in _load_optional_json(mcap_path)
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("version", str(STORE_VERSION)), ("inputs", json.dumps(_input_hashes(inputs)))],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, store_path)
+    print(f"[INFO] 기업 저장소 빌드 완료: 기업 {len(company_rows)}개 / 이름 {len(name_rows)}개 → {store_path}")
+
+
+def _store_is_fresh(store_path: Path, inputs: Dict[str, Path]) -> bool:
+    if not store_path.exists():
+        return False
+    conn = sqlite3.connect(store_path)
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        conn.close()
+    return meta.get("version") == str(STORE_VERSION) and json.loads(meta.get("inputs", "{}")) == _input_hashes(inputs)
+
+
+def _chunks(values: List[str], size: int = LOOKUP_CHUNK) -> Iterator[List[str]]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class CompanyStore:
+    """
+    기업 마스터 조회용 읽기 전용 핸들.
+    단건 조회는 by_*, 여러 건은 by_*s (IN (...) 묶음 조회, 입력 키 → 결과 dict).
+    반환 레코드는 원본 JSON 레코드(dict) 그대로.
+    """
+
+    def __init__(self, store_path: Path = STORE_PATH):
+        self.store_path = store_path
+        # 읽기 전용으로 연다 (경로의 한글/특수문자는 as_uri 가 인코딩)
+        self.conn = sqlite3.connect(Path(store_path).resolve().as_uri() + "?mode=ro", uri=True)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "CompanyStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---------- 공통 ----------
+    def _lookup_many(self, column: str, keys: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        for chunk in _chunks(sorted({k for k in keys if k})):
+            marks = ",".join("?" * len(chunk))
+            for key, data in self.conn.execute(
+                f"SELECT {column}, data FROM companies WHERE {column} IN ({marks}) ORDER BY id", chunk
+            ):
+                found.setdefault(key, []).append(json.loads(data))
+        return found
+
+    # ---------- 기업 ----------
+    def by_corp_code(self, corp_code: str) -> Optional[Dict[str, Any]]:
+        return self.by_corp_codes([corp_code]).get(corp_code)
+
+    def by_corp_codes(self, corp_codes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        return {k: v[0] for k, v in self._lookup_many("corp_code", list(corp_codes)).items()}
+
+    def by_ticker(self, ticker: str) -> Optional[Dict[str, Any]]:
+        return self.by_tickers([ticker]).get(ticker)
+
+    def by_tickers(self, tickers: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        tickers = list(tickers)
+        keyed = {str(t).strip().upper(): t for t in tickers}
+        found = self._lookup_many("ticker", list(keyed))
+        return {keyed[k]: v[0] for k, v in found.items()}
+
+    def by_symbol(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return self.by_symbols([symbol]).get(symbol)
+
+    def by_symbols(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        symbols = list(symbols)
+        keyed = {str(s).strip().upper(): s for s in symbols}
+        found = self._lookup_many("symbol", list(keyed))
+        return {keyed[k]: v[0] for k, v in found.items()}
+
+    def by_name(self, name: str, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """정규화 이름이 같은 기업 전부 (한글명/영문명/US 한글명 어느 것이든)"""
+        return self.by_names([name], source).get(name, [])
+
+    def by_names(self, names: Iterable[str], source: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        names = list(names)
+        norms: Dict[str, List[str]] = {}
+        for name in names:
+            norm = normalize_store_name(name)
+            if norm:
+                norms.setdefault(norm, []).append(name)
+
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        for chunk in _chunks(list(norms)):
+            marks = ",".join("?" * len(chunk))
+            sql = (
+                "SELECT n.name_norm, c.data FROM company_names n JOIN companies c ON c.id = n.company_id "
+                f"WHERE n.name_norm IN ({marks})"
+            )
+            params: List[Any] = list(chunk)
+            if source:
+                sql += " AND c.source = ?"
+                params.append(source)
+            for norm, data in self.conn.execute(sql + " ORDER BY c.id", params):
+                record = json.loads(data)
+                for name in norms[norm]:
+                    found.setdefault(name, []).append(record)
+        return found
+
+    def corp_codes_by_names(self, names: Iterable[str]) -> Dict[str, str]:
+        """이름 → corp_code (한국 기업만, 같은 이름이 여럿이면 첫 번째)"""
+        return {
+            name: records[0]["corp_code"]
+            for name, records in self.by_names(names, source="KR").items()
+            if records[0].get("corp_code")
+        }
+
+    def iter_companies(self, source: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        sql = "SELECT data FROM companies"
+        params: List[Any] = []
+        if source:
+            sql += " WHERE source = ?"
+            params.append(source)
+        for (data,) in self.conn.execute(sql + " ORDER BY id", params):
+            yield json.loads(data)
+
+    # ---------- 시총 ----------
+    def market_caps_by_names(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """이름 → 네이버 시총 레코드 (정규화 이름이 같은 종목이 여럿이면 시총이 큰 쪽)"""
+        names = list(names)
+        norms: Dict[str, List[str]] = {}
+        for name in names:
+            norm = normalize_store_name(name)
+            if norm:
+                norms.setdefault(norm, []).append(name)
+
+        found: Dict[str, Dict[str, Any]] = {}
+        for chunk in _chunks(list(norms)):
+            marks = ",".join("?" * len(chunk))
+            for norm, data in self.conn.execute(
+                f"SELECT name_norm, data FROM market_caps WHERE name_norm IN ({marks}) "
+                "ORDER BY market_cap_unit_million_krw DESC",
+                chunk,
+            ):
+                for name in norms[norm]:
+                    found.setdefault(name, json.loads(data))
+        return found
+
+    def market_cap_by_code(self, code: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT data FROM market_caps WHERE code = ? ORDER BY market_cap_unit_million_krw DESC LIMIT 1", (code,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def market_cap_names(self) -> List[str]:
+        """시총 테이블의 종목명 전부 (퍼지 색인 만들 때)"""
+        return [name for (name,) in self.conn.execute("SELECT DISTINCT name FROM market_caps WHERE name IS NOT NULL")]
+
+
+def open_company_store(
+    store_path: Path = STORE_PATH,
+    corp_path: Path = CORP_MERGED_PATH,
+    us_path: Path = US_JSON_PATH,
+    mcap_path: Optional[Path] = NAVER_MCAP_PATH,
+    market_path: Optional[Path] = COMPANY_MARKET_PATH,
+) -> CompanyStore:
+    """입력 JSON 해시가 저장소와 같으면 그대로 열고, 다르면 다시 빌드해서 연다."""
+    inputs = {"corp": corp_path, "us": us_path, "mcap": mcap_path, "market": market_path}
+    if not _store_is_fresh(store_path, inputs):
+        build_company_store(store_path, corp_path, us_path, mcap_path, market_path)
+    return CompanyStore(store_path)
+
+
+if __name__ == "__main__":
+    # python company_store.py build → 강제로 다시 빌드
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        build_company_store()
+        sys.exit(0)
+
+    # python company_store.py <이름/종목코드/corp_code> ... → 조회
+    with open_company_store() as store:
+        for query in sys.argv[1:]:
+            hits = store.by_names([query]).get(query) or [
+                r for r in (store.by_corp_code(query), store.by_ticker(query), store.by_symbol(query)) if r
+            ]
+            print(json.dumps({"query": query, "hits": hits}, ensure_ascii=False))
@@ -1,8 +1,11 @@
 import os
-import io
+import json
+import hashlib
 import zipfile
 import xml.etree.ElementTree as ET
+from datetime import date
 from pathlib import Path
+from typing import Optional
 
 import pandas as pd
 from dotenv import load_dotenv
@@ -17,53 +20,158 @@ CORP_CODE_URL = "https://opendart.fss.or.kr/api/corpCode.xml"
 
 OUT_CSV = Path("dart_corp_code.csv")
 OUT_JSON = Path("dart_corp_code.json")
+OUT_PARQUET = Path("dart_corp_code.parquet")
+# 마지막으로 파싱한 XML 의 해시 (같으면 다시 파싱하지 않음)
+OUT_META = Path("dart_corp_code.meta.json")
 
+# 받은 zip 은 다운로드 날짜별로 보관 (같은 날 다시 돌리면 재다운로드 안 함)
+ZIP_CACHE_DIR = Path(".cache/corp_code")
+# 날짜별 zip 을 최근 몇 개까지 남길지 (나머지는 새로 받을 때 삭제)
+ZIP_CACHE_KEEP = int(os.getenv("CORP_CODE_ZIP_KEEP", "3"))
+
+FIELDS = ["corp_code", "corp_name", "corp_eng_name", "stock_code", "modify_date"]
+
+
+def download_corp_code_zip(day: Optional[date] = None) -> Path:
+    """오늘 날짜 zip 이 캐시에 있으면 그대로, 없으면 받아서 디스크에 바로 저장 (메모리에 안 올림)"""
+    day = day or date.today()
+    zip_path = ZIP_CACHE_DIR / f"corpCode_{day:%Y%m%d}.zip"
+    if zip_path.exists():
+        print(f"[INFO] 캐시된 zip 사용 → {zip_path}")
+        return zip_path
 
-def download_and_parse_corp_code():
-    """
-    corpCode.xml(zip) 전체 받아서
-    corp_code / corp_name / corp_eng_name / stock_code / modify_date
-    테이블로 변환
-    """
     print("[INFO] corpCode.xml zip 다운로드 중...")
     import requests
 
-    params = {"crtfc_key": API_KEY}
-    resp = requests.get(CORP_CODE_URL, params=params, timeout=30)
-    resp.raise_for_status()
-
-    # 응답은 zip 바이너리
-    zf = zipfile.ZipFile(io.BytesIO(resp.content))
-    # 보통 내부에 xml 파일 1개만 있음
-    inner_name = zf.namelist()[0]
-    xml_bytes = zf.read(inner_name)
+    ZIP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = zip_path.with_suffix(".zip.tmp")
 
+    params = {"crtfc_key": API_KEY}
+    with requests.get(CORP_CODE_URL, params=params, timeout=30, stream=True) as resp:
+        resp.raise_for_status()
+        with tmp_path.open("wb") as f:
+            for chunk in resp.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+
+    # 키 오류 등은 zip 대신 XML/JSON 에러 응답이 온다
+    if not zipfile.is_zipfile(tmp_path):
+        message = tmp_path.read_text(encoding="utf-8", errors="replace")[:200]
+        tmp_path.unlink()
+        raise RuntimeError(f"corpCode.xml 응답이 zip 이 아닙니다: {message}")
+
+    os.replace(tmp_path, zip_path)
+    prune_zip_cache()
+    return zip_path
+
+
+def prune_zip_cache(keep: int = ZIP_CACHE_KEEP) -> None:
+    """날짜별 zip 중 최근 keep 개만 남긴다 (파일명이 corpCode_YYYYMMDD 라 이름순 = 날짜순)"""
+    old = sorted(ZIP_CACHE_DIR.glob("corpCode_*.zip"), reverse=True)[max(keep, 1):]
+    for path in old:
+        path.unlink(missing_ok=True)
+    if old:
+        print(f"[INFO] 오래된 corpCode zip {len(old)}개 삭제 → {ZIP_CACHE_DIR}")
+
+
+def xml_sha256(zip_path: Path) -> str:
+    """zip 안 XML 내용의 해시 (zip 자체는 압축 시각 등으로 바이트가 달라질 수 있어서 내용 기준)"""
+    h = hashlib.sha256()
+    with zipfile.ZipFile(zip_path) as zf:
+        # 보통 내부에 xml 파일 1개만 있음
+        with zf.open(zf.namelist()[0]) as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def iter_corp_rows(zip_path: Path):
+    """
+    XML 을 통째로 올리지 않고 <list> 하나씩 읽어서 dict 로 내보낸다.
+    처리한 요소는 바로 clear 해서 트리가 쌓이지 않게 한다.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        with zf.open(zf.namelist()[0]) as f:
+            context = ET.iterparse(f, events=("start", "end"))
+            _, root = next(context)
+            for event, el in context:
+                if event != "end" or el.tag != "list":
+                    continue
+                yield {
+                    "corp_code": el.findtext("corp_code"),          # 8자리 고유번호
+                    "corp_name": el.findtext("corp_name"),          # 한글 정식명칭
+                    "corp_eng_name": el.findtext("corp_eng_name"),  # 영문 정식명칭
+                    "stock_code": el.findtext("stock_code"),        # 6자리 종목코드(상장사만)
+                    "modify_date": el.findtext("modify_date"),      # YYYYMMDD
+                }
+                el.clear()
+                root.clear()
+
+
+def load_meta() -> dict:
+    if not OUT_META.exists():
+        return {}
+    with OUT_META.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_saved_table() -> pd.DataFrame:
+    """이전에 저장한 결과 읽기 (Parquet 이 있으면 Parquet, 없으면 CSV)"""
+    if OUT_PARQUET.exists():
+        try:
+            return pd.read_parquet(OUT_PARQUET)
+        except ImportError:
+            pass
+    return pd.read_csv(OUT_CSV, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+
+
+def parse_corp_code(zip_path: Path) -> pd.DataFrame:
     print("[INFO] XML 파싱 중...")
-    root = ET.fromstring(xml_bytes)
-
-    rows = []
-    for el in root.findall("list"):
-        rows.append(
-            {
-                "corp_code": el.findtext("corp_code"),          # 8자리 고유번호
-                "corp_name": el.findtext("corp_name"),          # 한글 정식명칭
-                "corp_eng_name": el.findtext("corp_eng_name"),  # 영문 정식명칭
-                "stock_code": el.findtext("stock_code"),        # 6자리 종목코드(상장사만)
-                "modify_date": el.findtext("modify_date"),      # YYYYMMDD
-            }
-        )
-
-    df = pd.DataFrame(rows)
+    df = pd.DataFrame(iter_corp_rows(zip_path), columns=FIELDS)
     print(f"[INFO] 총 {len(df)}개 기업 로드 완료")
+    return df
+
+
+def save_meta(content_hash: str, zip_path: Path, rows: int) -> None:
+    with OUT_META.open("w", encoding="utf-8") as f:
+        json.dump({"sha256": content_hash, "zip": zip_path.name, "rows": rows}, f, ensure_ascii=False, indent=2)
+
 
+def save_table(df: pd.DataFrame) -> None:
     # CSV 저장
     df.to_csv(OUT_CSV, index=False, encoding="utf-8-sig")
     print(f"[INFO] CSV 저장 완료 → {OUT_CSV}")
 
+    # Parquet 저장 (pyarrow / fastparquet 가 없으면 건너뜀)
+    try:
+        df.to_parquet(OUT_PARQUET, index=False)
+        print(f"[INFO] Parquet 저장 완료 → {OUT_PARQUET}")
+    except ImportError:
+        print("[경고] pyarrow/fastparquet 가 없어 Parquet 저장을 건너뜁니다")
+
     # JSON 저장
     df.to_json(OUT_JSON, orient="records", force_ascii=False, indent=2)
     print(f"[INFO] JSON 저장 완료 → {OUT_JSON}")
 
+
+def download_and_parse_corp_code(force: bool = False):
+    """
+    corpCode.xml(zip) 전체 받아서
+    corp_code / corp_name / corp_eng_name / stock_code / modify_date
+    테이블로 변환
+    - zip 은 날짜별로 디스크 캐시
+    - XML 내용 해시가 지난번과 같고 결과 파일이 있으면 파싱/저장 생략 (force=True 면 무조건 다시)
+    """
+    zip_path = download_corp_code_zip()
+    content_hash = xml_sha256(zip_path)
+
+    meta = load_meta()
+    if not force and meta.get("sha256") == content_hash and OUT_JSON.exists() and OUT_CSV.exists():
+        print("[INFO] corpCode.xml 내용이 지난번과 같아 파싱을 건너뜁니다")
+        return load_saved_table()
+
+    df = parse_corp_code(zip_path)
+    save_table(df)
+    save_meta(content_hash, zip_path, len(df))
     return df
 
 
@@ -1,113 +1,235 @@
 import json
+import re
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
+
+import pandas as pd
+
+from company_match import FUZZY_LEGAL_SUFFIX_RE, FUZZY_NOISE_RE, char_ngrams
 
 LISTED_JSON_PATH = Path("listed_companies_korea.json")
 DART_JSON_PATH = Path("dart_corp_code.json")
 OUTPUT_JSON_PATH = Path("corp_merged.json")
 UNMATCHED_JSON_PATH = Path("corp_unmatched.json")
 
+# 2차(퍼지) 매칭 설정
+BLOCK_PREFIX_LEN = 2          # 정규화한 이름 앞 몇 글자가 같아야 후보로 보나
+FUZZY_MIN_SCORE = 0.8         # 이름 n-gram Dice 유사도 하한
+FUZZY_MIN_SCORE_SAME_TICKER = 0.5   # 종목코드까지 같으면 이 정도만 비슷해도 인정
+# 우선주 종목명 (예: 삼성전자우, 현대차2우B) — 이름만 비슷하면 보통주 DART 레코드에 붙어 버린다
+PREFERRED_SHARE_RE = re.compile(r"\d?우[A-C]?$")
+
+# merge_listed_with_dart 가 listed 레코드에 붙이는 필드
+DART_FIELDS = (
+    "corp_code",
+    "corp_eng_name",
+    "dart_stock_code",
+    "dart_modify_date",
+    "dart_match",
+    "dart_corp_name",
+    "dart_match_score",
+)
+
 
 def load_json(path: Path):
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
 
-def build_dart_index(dart_list: List[Dict[str, Any]]):
-    """
-    dart_corp_code.json 을 빠르게 검색할 수 있도록 index 생성
-    - name_index: corp_name(strip 기준) → [rows...]
-    - stock_index: stock_code → [rows...]
-    """
-    name_index: Dict[str, List[Dict[str, Any]]] = {}
-    stock_index: Dict[str, List[Dict[str, Any]]] = {}
+def numeric_ticker(ticker: pd.Series) -> pd.Series:
+    """숫자만 남긴 종목코드 (6자리가 아니면 빈 문자열)"""
+    digits = ticker.str.replace(r"\D", "", regex=True)
+    return digits.where(digits.str.len() == 6, "")
 
-    for row in dart_list:
-        name = (row.get("corp_name") or "").strip()
-        if name:
-            name_index.setdefault(name, []).append(row)
 
-        stock = (row.get("stock_code") or "").strip()
-        if stock:
-            stock_index.setdefault(stock, []).append(row)
-
-    return name_index, stock_index
+def build_frames(listed_companies: List[Dict[str, Any]], dart_data: List[Dict[str, Any]]):
+    """
+    매칭용 키만 뽑은 DataFrame 두 개.
+    - listed: pos(원래 순서), name_key, ticker_raw, ticker_num
+    - dart: dpos(원래 순서), name_key, stock_key
+    """
+    listed = pd.DataFrame(
+        {
+            "pos": range(len(listed_companies)),
+            "name_key": pd.Series([str(c.get("name") or "").strip() for c in listed_companies], dtype=str),
+            "ticker_raw": pd.Series([str(c.get("ticker") or "").strip().upper() for c in listed_companies], dtype=str),
+        }
+    )
+    listed["ticker_num"] = numeric_ticker(listed["ticker_raw"])
+
+    dart = pd.DataFrame(
+        {
+            "dpos": range(len(dart_data)),
+            "name_key": pd.Series([(r.get("corp_name") or "").strip() for r in dart_data], dtype=str),
+            "stock_key": pd.Series([(r.get("stock_code") or "").strip().upper() for r in dart_data], dtype=str),
+        }
+    )
+    return listed, dart
 
 
-def find_dart_record(
-    company: Dict[str, Any],
-    name_index: Dict[str, List[Dict[str, Any]]],
-    stock_index: Dict[str, List[Dict[str, Any]]],
-) -> Optional[Dict[str, Any]]:
+def match_exact(listed: pd.DataFrame, dart: pd.DataFrame) -> pd.DataFrame:
+    """
+    pos → dpos (+ dart_match) 를 merge 두 번으로 구한다.
+    1순위: corp_name == name (같은 이름이 여럿이면 stock_code == 숫자 ticker 인 것, 그래도 여럿이면 첫 번째)
+    2순위: stock_code == ticker (숫자 6자리인 경우만, 여럿이면 첫 번째)
     """
-    1순위: corp_name == company["name"] 로 매칭
-    2순위: stock_code == ticker (숫자 6자리인 경우만)
-    여러 개 나오면 그냥 첫 번째 사용
+    by_name = listed.merge(dart[dart["name_key"] != ""], on="name_key")
+    by_name["ticker_hit"] = (by_name["ticker_num"] != "") & (by_name["stock_key"] == by_name["ticker_num"])
+    by_name = (
+        by_name.sort_values(["pos", "ticker_hit", "dpos"], ascending=[True, False, True])
+        .drop_duplicates("pos")
+        .assign(dart_match="name")
+    )
+
+    rest = listed[~listed["pos"].isin(by_name["pos"]) & (listed["ticker_num"] != "")]
+    by_stock = (
+        rest.merge(dart[dart["stock_key"] != ""], left_on="ticker_num", right_on="stock_key")
+        .sort_values(["pos", "dpos"])
+        .drop_duplicates("pos")
+        .assign(dart_match="stock_code")
+    )
+
+    return pd.concat(
+        [by_name[["pos", "dpos", "dart_match"]], by_stock[["pos", "dpos", "dart_match"]]],
+        ignore_index=True,
+    )
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """company_match.normalize_for_fuzzy 의 컬럼 단위 버전 (NFKC, 소문자, 법인 접미사/문장부호 제거)"""
+    s = names.str.normalize("NFKC").str.lower()
+    stripped = s.str.replace(FUZZY_LEGAL_SUFFIX_RE.pattern, " ", regex=True)
+    # 접미사만으로 된 이름이면 지우지 않는다
+    s = stripped.where(stripped.str.strip(" ,.") != "", s)
+    return s.str.replace(FUZZY_NOISE_RE.pattern, "", regex=True)
+
+
+def match_fuzzy(listed: pd.DataFrame, dart: pd.DataFrame) -> pd.DataFrame:
     """
-    name = (company.get("name") or "").strip()
-    ticker = (company.get("ticker") or "").strip()
-
-    # 1) 이름으로 매칭
-    if name in name_index:
-        candidates = name_index[name]
-        if len(candidates) == 1:
-            return candidates[0]
-        else:
-            # 같은 이름이 여러 개라면, ticker(숫자)로 한 번 더 거르기
-            numeric_ticker = "".join(ch for ch in ticker if ch.isdigit())
-            if len(numeric_ticker) == 6:
-                filtered = [
-                    r for r in candidates
-                    if (r.get("stock_code") or "").strip() == numeric_ticker
-                ]
-                if filtered:
-                    return filtered[0]
-            # 그래도 여러 개면 일단 첫 번째
-            return candidates[0]
-
-    # 2) 이름으로 못 찾았으면, ticker가 순수 숫자 6자리인 경우 stock_code로 시도
-    numeric_ticker = "".join(ch for ch in ticker if ch.isdigit())
-    if len(numeric_ticker) == 6 and numeric_ticker in stock_index:
-        candidates = stock_index[numeric_ticker]
-        if len(candidates) == 1:
-            return candidates[0]
-        # 여러 개면 그냥 첫 번째
-        return candidates[0]
-
-    # 아무 것도 못 찾은 경우
-    return None
+    1차에서 못 찾은 상장사를 (1차에서 아직 아무도 가져가지 않은) DART 이름과 다시 맞춰 본다.
+    블로킹 키(정규화 이름 앞 BLOCK_PREFIX_LEN 글자 / 종목코드 원문·숫자) 가 같은 쌍만 후보로 만들고,
+    후보 쌍에만 n-gram 유사도를 계산한다 → DART 가 커져도 비교 횟수는 블록 크기만큼만 는다.
+    우선주 이름(PREFERRED_SHARE_RE) 은 종목코드가 같은 후보만 인정한다 ("SK하이닉스우" → SK하이닉스 방지).
+    DART 행 하나는 상장사 하나에만 붙인다: 여러 상장사가 같은 dpos 를 고르면 가장 나은 하나만 남기고,
+    1등이 동점이면 모두 미매칭으로 돌린다 → corp_merged 에 corp_code 가 중복되지 않는다.
+    """
+    if listed.empty:
+        return pd.DataFrame(columns=["pos", "dpos", "dart_match", "dart_match_score"])
+
+    listed = listed.assign(norm=normalize_names(listed["name_key"]))
+    dart = dart.assign(norm=normalize_names(dart["name_key"]))
+    listed["prefix"] = listed["norm"].str[:BLOCK_PREFIX_LEN]
+    dart["prefix"] = dart["norm"].str[:BLOCK_PREFIX_LEN]
+
+    dart_cols = ["dpos", "norm", "stock_key"]
+    pairs = pd.concat(
+        [
+            listed[listed["prefix"] != ""].merge(dart[dart_cols + ["prefix"]], on="prefix", suffixes=("", "_d")),
+            listed[listed["ticker_raw"] != ""].merge(
+                dart[dart["stock_key"] != ""][dart_cols], left_on="ticker_raw", right_on="stock_key", suffixes=("", "_d")
+            ),
+            listed[listed["ticker_num"] != ""].merge(
+                dart[dart["stock_key"] != ""][dart_cols], left_on="ticker_num", right_on="stock_key", suffixes=("", "_d")
+            ),
+        ],
+        ignore_index=True,
+    ).drop_duplicates(["pos", "dpos"])
+
+    if pairs.empty:
+        return pd.DataFrame(columns=["pos", "dpos", "dart_match", "dart_match_score"])
+
+    pairs["same_ticker"] = (pairs["stock_key"] != "") & (
+        (pairs["stock_key"] == pairs["ticker_raw"]) | (pairs["stock_key"] == pairs["ticker_num"])
+    )
+    preferred = pairs["name_key"].str.contains(PREFERRED_SHARE_RE.pattern, regex=True)
+    pairs = pairs[pairs["same_ticker"] | ~preferred].copy()
+    pairs["min_score"] = FUZZY_MIN_SCORE
+    pairs.loc[pairs["same_ticker"], "min_score"] = FUZZY_MIN_SCORE_SAME_TICKER
+
+    # 길이 필터: n-gram 수가 a, b 일 때 Dice 는 2*min(a,b)/(a+b) 를 넘을 수 없으므로
+    # 그 상한이 하한 점수에도 못 미치는 쌍은 n-gram 을 만들기 전에 버린다 (n-gram 수 ≈ 글자 수 + 1)
+    len_a = pairs["norm"].str.len() + 1
+    len_b = pairs["norm_d"].str.len() + 1
+    upper = 2 * pd.concat([len_a, len_b], axis=1).min(axis=1) / (len_a + len_b)
+    pairs = pairs[upper >= pairs["min_score"]]
+
+    # 같은 이름은 n-gram 을 한 번만 만든다
+    names_a, names_b = pairs["norm"].tolist(), pairs["norm_d"].tolist()
+    grams = {name: char_ngrams(name) for name in set(names_a) | set(names_b)}
+    pairs = pairs.assign(
+        score=[
+            2 * len(grams[a] & grams[b]) / (len(grams[a]) + len(grams[b]))
+            for a, b in zip(names_a, names_b)
+        ]
+    )
+    ok = pairs["score"] >= pairs["min_score"]
+
+    best = (
+        pairs[ok]
+        .sort_values(["pos", "same_ticker", "score", "dpos"], ascending=[True, False, False, True])
+        .drop_duplicates("pos")
+        .sort_values(["dpos", "same_ticker", "score", "pos"], ascending=[True, False, False, True])
+    )
+    top = best.drop_duplicates("dpos")
+    runner_up = best[best.duplicated("dpos")].drop_duplicates("dpos")
+    tied = top.merge(runner_up, on=["dpos", "same_ticker", "score"])["dpos"]
+    best = top[~top["dpos"].isin(tied)]
+    return pd.DataFrame(
+        {
+            "pos": best["pos"],
+            "dpos": best["dpos"],
+            "dart_match": "fuzzy",
+            "dart_match_score": best["score"].round(4),
+        }
+    )
 
 
-def main():
-    print("[INFO] JSON 로딩 중...")
-    listed_companies = load_json(LISTED_JSON_PATH)
-    dart_data = load_json(DART_JSON_PATH)
+def merge_listed_with_dart(
+    listed_companies: List[Dict[str, Any]],
+    dart_data: List[Dict[str, Any]],
+):
+    """(merged, unmatched) — merged 는 listed 레코드 + dart 필드, 둘 다 listed 원래 순서"""
+    listed, dart = build_frames(listed_companies, dart_data)
 
-    print(f"[INFO] 상장사 개수: {len(listed_companies)}")
-    print(f"[INFO] DART 전체 기업 개수: {len(dart_data)}")
+    exact = match_exact(listed, dart)
+    fuzzy = match_fuzzy(listed[~listed["pos"].isin(exact["pos"])], dart[~dart["dpos"].isin(exact["dpos"])])
+    print(f"[INFO] 1차(이름/종목코드) 매칭: {len(exact)}개, 2차(퍼지) 복구: {len(fuzzy)}개")
 
-    name_index, stock_index = build_dart_index(dart_data)
+    matches = pd.concat([exact, fuzzy], ignore_index=True).sort_values("pos")
+    fuzzy_scores = dict(zip(fuzzy["pos"], fuzzy["dart_match_score"]))
 
     merged: List[Dict[str, Any]] = []
-    unmatched: List[Dict[str, Any]] = []
-
-    for comp in listed_companies:
-        dart_row = find_dart_record(comp, name_index, stock_index)
-
-        if dart_row is None:
-            unmatched.append(comp)
-            continue
-
-        # listed 레코드 + dart 필드 3개 병합
+    for pos, dpos, how in zip(matches["pos"], matches["dpos"], matches["dart_match"]):
+        dart_row = dart_data[int(dpos)]
+        # listed 레코드 + dart 필드 병합
         merged_record = {
-            **comp,
+            **listed_companies[int(pos)],
             "corp_code": dart_row.get("corp_code"),
             "corp_eng_name": dart_row.get("corp_eng_name"),
             "dart_stock_code": dart_row.get("stock_code"),
             "dart_modify_date": dart_row.get("modify_date"),
+            "dart_match": how,
         }
+        if how == "fuzzy":
+            merged_record["dart_corp_name"] = dart_row.get("corp_name")
+            merged_record["dart_match_score"] = float(fuzzy_scores[pos])
         merged.append(merged_record)
 
+    matched_pos = set(matches["pos"].tolist())
+    unmatched = [c for i, c in enumerate(listed_companies) if i not in matched_pos]
+    return merged, unmatched
+
+
+def main():
+    print("[INFO] JSON 로딩 중...")
+    listed_companies = load_json(LISTED_JSON_PATH)
+    dart_data = load_json(DART_JSON_PATH)
+
+    print(f"[INFO] 상장사 개수: {len(listed_companies)}")
+    print(f"[INFO] DART 전체 기업 개수: {len(dart_data)}")
+
+    merged, unmatched = merge_listed_with_dart(listed_companies, dart_data)
+
     # 결과 저장
     with OUTPUT_JSON_PATH.open("w", encoding="utf-8") as f:
         json.dump(merged, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,295 @@
+import sys
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+from corp_name import (
+    FIELDS,
+    OUT_CSV,
+    download_and_parse_corp_code,
+    download_corp_code_zip,
+    load_meta,
+    load_saved_table,
+    parse_corp_code,
+    save_meta,
+    save_table,
+    xml_sha256,
+)
+from merge_ko_eng_name import (
+    DART_FIELDS,
+    LISTED_JSON_PATH,
+    OUTPUT_JSON_PATH,
+    UNMATCHED_JSON_PATH,
+    load_json,
+    merge_listed_with_dart,
+)
+from merge_ko_eng_name import main as full_merge
+from company_match import INDEX_ARTIFACT_PATH, file_sha256, patch_index_artifact
+
+# 실행마다 바뀐 내역을 한 줄씩 덧붙인다
+CHANGELOG_PATH = Path("corp_changelog.jsonl")
+
+# DART 행이 바뀌면 corp_merged 레코드에 옮겨 적는 필드 (DART 필드 → merged 필드)
+DART_TO_MERGED = {
+    "corp_eng_name": "corp_eng_name",
+    "stock_code": "dart_stock_code",
+    "modify_date": "dart_modify_date",
+}
+
+
+def diff_corp_tables(old: pd.DataFrame, new: pd.DataFrame):
+    """
+    corp_code 기준으로 (추가 행 목록, 삭제 행 목록, [(이전 행, 새 행), ...]).
+    DART 는 행이 바뀌면 modify_date 를 올리지만, 혹시 몰라 나머지 필드도 같이 비교한다 (전부 벡터 연산).
+    """
+    old = old[FIELDS].fillna("").astype(str)
+    new = new[FIELDS].fillna("").astype(str)
+    both = old.merge(new, on="corp_code", how="outer", suffixes=("_old", ""), indicator=True)
+
+    common = both[both["_merge"] == "both"]
+    differs = pd.Series(False, index=common.index)
+    for field in FIELDS[1:]:
+        differs |= common[field] != common[field + "_old"]
+
+    old_cols = {field + "_old": field for field in FIELDS[1:]}
+
+    def rows(df: pd.DataFrame, old_side: bool) -> List[Dict[str, Any]]:
+        if old_side:
+            df = df[["corp_code"] + list(old_cols)].rename(columns=old_cols)
+        return df[FIELDS].to_dict(orient="records")
+
+    added = rows(both[both["_merge"] == "right_only"], old_side=False)
+    removed = rows(both[both["_merge"] == "left_only"], old_side=True)
+    changed = list(zip(rows(common[differs], old_side=True), rows(common[differs], old_side=False)))
+    return added, removed, changed
+
+
+def field_changes(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """{필드: [이전 값, 새 값]} (달라진 필드만)"""
+    return {k: [old.get(k), new.get(k)] for k in sorted(set(old) | set(new)) if old.get(k) != new.get(k)}
+
+
+def listed_part(record: Dict[str, Any]) -> Dict[str, Any]:
+    """corp_merged 레코드에서 DART 필드를 뺀 원래 listed 레코드"""
+    return {k: v for k, v in record.items() if k not in DART_FIELDS}
+
+
+def apply_listed_changes(
+    listed: List[Dict[str, Any]],
+    merged: List[Dict[str, Any]],
+    unmatched: List[Dict[str, Any]],
+    log,
+):
+    """
+    listed_companies_korea.json 변경(ticker 기준)을 반영한다.
+    - 상장폐지 → merged/unmatched 에서 제거
+    - 정보 변경 → listed 필드만 교체 (이름이 바뀌었으면 DART 를 다시 찾도록 rematch 로)
+    - 신규 상장 → rematch
+    반환: (남은 merged, 남은 unmatched, DART 전체와 다시 맞출 listed 레코드)
+    """
+    by_ticker = {str(c.get("ticker")): c for c in listed}
+    seen = set()
+    kept: List[Dict[str, Any]] = []
+    rematch: List[Dict[str, Any]] = []
+
+    for rec in merged:
+        ticker = str(rec.get("ticker"))
+        cur = by_ticker.get(ticker)
+        if cur is None:
+            log("listed", "removed", ticker, rec.get("name"))
+            continue
+        seen.add(ticker)
+
+        base = listed_part(rec)
+        if base != cur:
+            log("listed", "changed", ticker, cur.get("name"), field_changes(base, cur))
+            if base.get("name") != cur.get("name"):
+                rematch.append(cur)
+                continue
+            rec = {**cur, **{k: rec[k] for k in DART_FIELDS if k in rec}}
+        kept.append(rec)
+
+    still_unmatched: List[Dict[str, Any]] = []
+    for rec in unmatched:
+        ticker = str(rec.get("ticker"))
+        cur = by_ticker.get(ticker)
+        if cur is None:
+            log("listed", "removed", ticker, rec.get("name"))
+            continue
+        seen.add(ticker)
+        if cur != rec:
+            log("listed", "changed", ticker, cur.get("name"), field_changes(rec, cur))
+            if rec.get("name") != cur.get("name"):
+                rematch.append(cur)
+                continue
+        still_unmatched.append(cur)
+
+    for ticker, cur in by_ticker.items():
+        if ticker not in seen:
+            log("listed", "added", ticker, cur.get("name"))
+            rematch.append(cur)
+
+    return kept, still_unmatched, rematch
+
+
+def apply_dart_changes(
+    merged: List[Dict[str, Any]],
+    added: List[Dict[str, Any]],
+    removed: List[Dict[str, Any]],
+    changed: List[tuple],
+    log,
+):
+    """
+    DART 추가/삭제/변경 행을 merged 에 반영한다.
+    - 삭제된 corp_code 에 붙어 있던 상장사 → rematch (DART 전체와 다시)
+    - 변경 → corp_code 연결은 그대로 두고 영문명/종목코드/수정일만 갱신
+    반환: (남은 merged, rematch 할 listed 레코드)
+    """
+    for row in added:
+        log("dart", "added", row["corp_code"], row["corp_name"])
+
+    removed_codes = set()
+    for row in removed:
+        log("dart", "removed", row["corp_code"], row["corp_name"])
+        removed_codes.add(row["corp_code"])
+
+    new_rows: Dict[str, Dict[str, Any]] = {}
+    for old_row, new_row in changed:
+        log("dart", "changed", new_row["corp_code"], new_row["corp_name"], field_changes(old_row, new_row))
+        new_rows[new_row["corp_code"]] = new_row
+
+    kept: List[Dict[str, Any]] = []
+    rematch: List[Dict[str, Any]] = []
+    for rec in merged:
+        code = rec.get("corp_code")
+        if code in removed_codes:
+            rematch.append(listed_part(rec))
+            continue
+        row = new_rows.get(code)
+        if row is not None:
+            rec = {**rec, **{dst: row[src] for src, dst in DART_TO_MERGED.items()}}
+            if "dart_corp_name" in rec:
+                rec["dart_corp_name"] = row["corp_name"]
+        kept.append(rec)
+
+    return kept, rematch
+
+
+def append_changelog(entries: List[Dict[str, Any]]) -> None:
+    if not entries:
+        return
+    with CHANGELOG_PATH.open("a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def refresh(force: bool = False) -> List[Dict[str, Any]]:
+    """
+    corp_merged.json / corp_unmatched.json / company_index.pkl 을 바뀐 행만 반영해서 갱신하고
+    변경 내역(changelog 항목 목록)을 돌려준다.
+    - DART: 새 corpCode.xml 을 이전 dart_corp_code 테이블과 corp_code 기준으로 비교 (XML 해시가 같으면 건너뜀)
+    - listed: listed_companies_korea.json 을 기존 merged/unmatched 와 ticker 기준으로 비교
+    - 다시 맞출 것만 merge_listed_with_dart 로 매칭
+      · 새로 들어왔거나 연결이 끊긴 상장사 → DART 전체
+      · 원래 못 찾던 상장사 → 추가/변경된 DART 행만 (나머지 행과는 이미 안 맞는다는 걸 앎)
+    - 이전 결과가 없거나 force=True 면 전체 빌드
+    """
+    if force or not OUTPUT_JSON_PATH.exists() or not OUT_CSV.exists():
+        print("[INFO] 이전 결과가 없어 전체 빌드합니다")
+        download_and_parse_corp_code(force=True)
+        full_merge()
+        return []
+
+    run_at = datetime.now().isoformat(timespec="seconds")
+    entries: List[Dict[str, Any]] = []
+
+    def log(target: str, op: str, key: str, name: Optional[str], changes: Optional[Dict[str, Any]] = None):
+        entry = {"run_at": run_at, "target": target, "op": op, "key": key, "name": name}
+        if changes:
+            entry["changes"] = changes
+        entries.append(entry)
+
+    # --- DART corpCode 비교 ---
+    zip_path = download_corp_code_zip()
+    content_hash = xml_sha256(zip_path)
+    new_table: Optional[pd.DataFrame] = None
+    added: List[Dict[str, Any]] = []
+    removed: List[Dict[str, Any]] = []
+    changed: List[tuple] = []
+
+    if load_meta().get("sha256") != content_hash:
+        new_table = parse_corp_code(zip_path)
+        added, removed, changed = diff_corp_tables(load_saved_table(), new_table)
+        print(f"[INFO] DART 변경: 추가 {len(added)} / 삭제 {len(removed)} / 변경 {len(changed)}")
+    else:
+        print("[INFO] corpCode.xml 내용이 지난번과 같습니다")
+
+    # --- merged 패치 ---
+    previous_sha = file_sha256(OUTPUT_JSON_PATH)
+    merged_before = load_json(OUTPUT_JSON_PATH)
+    unmatched_before = load_json(UNMATCHED_JSON_PATH) if UNMATCHED_JSON_PATH.exists() else []
+    listed = load_json(LISTED_JSON_PATH)
+
+    merged, unmatched, rematch = apply_listed_changes(listed, merged_before, unmatched_before, log)
+    merged, orphaned = apply_dart_changes(merged, added, removed, changed, log)
+    rematch += orphaned
+
+    candidates = added + [new_row for _, new_row in changed]
+    if unmatched and candidates:
+        found, unmatched = merge_listed_with_dart(unmatched, candidates)
+        merged += found
+
+    if rematch:
+        dart_all = (new_table if new_table is not None else load_saved_table())[FIELDS].fillna("")
+        found, missing = merge_listed_with_dart(rematch, dart_all.to_dict(orient="records"))
+        merged += found
+        unmatched += missing
+
+    # listed 순서로 되돌린다
+    order = {str(c.get("ticker")): i for i, c in enumerate(listed)}
+    merged.sort(key=lambda r: order[str(r.get("ticker"))])
+    unmatched.sort(key=lambda r: order[str(r.get("ticker"))])
+
+    # merged 변경 (corp_code 기준) → changelog + 인덱스 패치 대상
+    before_by_code = {r.get("corp_code"): r for r in merged_before}
+    after_by_code = {r.get("corp_code"): r for r in merged}
+    upserts: List[Dict[str, Any]] = []
+    for code, rec in after_by_code.items():
+        old = before_by_code.get(code)
+        if old is None:
+            log("merged", "added", code, rec.get("name"))
+            upserts.append(rec)
+        elif old != rec:
+            log("merged", "changed", code, rec.get("name"), field_changes(old, rec))
+            upserts.append(rec)
+    removed_codes = [code for code in before_by_code if code not in after_by_code]
+    for code in removed_codes:
+        log("merged", "removed", code, before_by_code[code].get("name"))
+
+    if upserts or removed_codes or unmatched != unmatched_before:
+        with OUTPUT_JSON_PATH.open("w", encoding="utf-8") as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2)
+        with UNMATCHED_JSON_PATH.open("w", encoding="utf-8") as f:
+            json.dump(unmatched, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] merged 패치: 추가/변경 {len(upserts)}개, 삭제 {len(removed_codes)}개 → {OUTPUT_JSON_PATH}")
+
+        if INDEX_ARTIFACT_PATH.exists():
+            patch_index_artifact(upserts, removed_codes, previous_sha)
+            print(f"[INFO] 인덱스 아티팩트 패치 완료 → {INDEX_ARTIFACT_PATH}")
+
+    # 새 DART 테이블은 merged 까지 반영한 뒤에 저장 (중간에 죽으면 다음 실행이 같은 diff 를 다시 적용)
+    if new_table is not None:
+        save_table(new_table)
+        save_meta(content_hash, zip_path, len(new_table))
+
+    append_changelog(entries)
+    print(f"[INFO] 변경 내역 {len(entries)}건 → {CHANGELOG_PATH}")
+    return entries
+
+
+if __name__ == "__main__":
+    # python refresh_master.py [--full]
+    refresh(force="--full" in sys.argv[1:])
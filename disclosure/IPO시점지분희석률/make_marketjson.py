@@ -1,9 +1,25 @@
 import json
 import os
+import re
+import sys
+from pathlib import Path
+
+# company/company_match.py 의 n-gram 퍼지 조회 / company_store.py 의 기업 저장소를 같이 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "company"))
+from company_match import NgramIndex
+from company_store import open_company_store
 
 CORP_FILE = "corp_merged.json"          # corp 리스트 파일
 MCAP_FILE = "naver_market_caps.json"    # 시총 크롤링한 파일
 OUTPUT_FILE = "company_list_market.json"
+# 이 스크립트 전용 기업 저장소. OUTPUT_FILE 은 매번 다시 쓰므로 저장소 입력에 넣지 않고,
+# 입력이 다른 기본 저장소(company/company_store.sqlite)와는 파일을 나눠서 서로 다시 빌드시키지 않게 한다
+STORE_FILE = "company_store_mcap.sqlite"
+
+# 이름이 정확히 같지 않을 때 퍼지 매칭으로 인정할 최소 유사도
+FUZZY_MATCH_MIN_SCORE = 0.85
+# 우선주("삼성전자우", "현대차2우B")는 본주 이름과 한 글자 차이라 퍼지 후보에서 뺀다
+PREFERRED_SHARE_RE = re.compile(r"\d?우[A-C]?$")
 
 
 def load_json(path):
@@ -29,27 +45,21 @@ def main():
         raise FileNotFoundError(MCAP_FILE)
 
     corp_list = load_json(CORP_FILE)
-    mcap_list = load_json(MCAP_FILE)
 
-    # 시총 JSON -> 이름 기준 dict로 변환
-    mcap_by_name = {}
-    for item in mcap_list:
-        raw_name = item.get("name")
-        norm = normalize_name(raw_name)
-        if not norm:
-            continue
+    # 시총 JSON 은 기업 저장소의 market_caps 테이블로 조회 (이름 인덱스, 같은 이름이면 시총 큰 쪽)
+    store = open_company_store(store_path=Path(STORE_FILE), mcap_path=Path(MCAP_FILE), market_path=None)
+    mcap_by_name = store.market_caps_by_names(normalize_name(corp.get("name")) for corp in corp_list)
 
-        # 같은 이름이 여러 번 나오면, 시총이 더 큰 쪽을 남김김
-        if norm in mcap_by_name:
-            if item.get("market_cap_unit_million_krw", 0) > mcap_by_name[norm].get(
-                "market_cap_unit_million_krw", 0
-            ):
-                mcap_by_name[norm] = item
-        else:
-            mcap_by_name[norm] = item
+    # 정확히 같은 이름이 없을 때 쓰는 n-gram 역색인 (key = 시총 테이블 종목명)
+    mcap_name_index = NgramIndex()
+    for name in store.market_cap_names():
+        norm = normalize_name(name)
+        if norm and not PREFERRED_SHARE_RE.search(norm):
+            mcap_name_index.add(name, norm)
 
     merged = []
     missed = []
+    fuzzy_matched = 0
 
     # corp_merged 한 줄씩 돌면서 이름 매칭
     for corp in corp_list:
@@ -57,6 +67,11 @@ def main():
         norm = normalize_name(raw_name)
 
         mcap_info = mcap_by_name.get(norm)
+        if not mcap_info and norm:
+            hits = mcap_name_index.search(norm, k=1, min_score=FUZZY_MATCH_MIN_SCORE)
+            if hits:
+                mcap_info = store.market_caps_by_names([hits[0][0]]).get(hits[0][0])
+                fuzzy_matched += 1
         if not mcap_info:
             missed.append(raw_name)
             continue
@@ -70,11 +85,12 @@ def main():
         }
         merged.append(merged_item)
 
-    
+    store.close()
+
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
         json.dump(merged, f, ensure_ascii=False, indent=2)
 
-    print(f"merge 완료: {len(merged)}개 → {OUTPUT_FILE}")
+    print(f"merge 완료: {len(merged)}개 (퍼지 매칭 {fuzzy_matched}개) → {OUTPUT_FILE}")
     print(f"corp_merged 에만 있고 시총 JSON에는 없는 회사 수: {len(missed)}")
 
 
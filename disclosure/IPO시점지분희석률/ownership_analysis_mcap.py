@@ -1,11 +1,16 @@
 import os
+import sys
 import json
-import time
-import requests
+import itertools
 from utils import to_float_ratio, to_int, parse_date_str
 from tqdm import tqdm
 from dotenv import load_dotenv
 from constants.thresholds import CAP_BUCKET_THRESHOLDS # constants/thresholds 에 CAP_BUCKET_THRESHOLDS 정의
+
+# disclosure/dart_client.py 의 공용 OpenDART 클라이언트를 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dart_client import DartError, DartSession
+
 load_dotenv()
 DART_KEY = os.getenv("OPEN_DART_API_KEY")
 
@@ -41,35 +46,29 @@ def get_thresholds_for_company(company: dict) -> dict:
     return CAP_BUCKET_THRESHOLDS.get(bucket, CAP_BUCKET_THRESHOLDS["unknown"])
 
 
-# DART API 호출 - 최대주주변동현황 (hyslrChgSttus)
-def call_hyslr_change(corp_code: str, year: int):
-    url = "https://opendart.fss.or.kr/api/hyslrChgSttus.json"
-    params = {
-        "crtfc_key": DART_KEY,
+# DART API 요청 파라미터 - 최대주주변동현황 (hyslrChgSttus)
+def hyslr_change_params(corp_code: str, year: int) -> dict:
+    return {
         "corp_code": corp_code,
         "bsns_year": str(year),
         "reprt_code": "11011", 
     }
-    try:
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
 
     
-# 한 회사(corp_code)에 대해 최근 N년치 hyslrChgSttus 조회 후 리스트로 반환
-def collect_change_events_for_company(company: dict):
+# 한 회사(corp_code)의 최근 N년치 hyslrChgSttus 응답 [(year, 응답), ...] → 이벤트 리스트
+def collect_change_events_for_company(company: dict, responses: list):
 
     corp_code = company.get("corp_code")
     corp_name = company.get("name")
     all_rows = []
 
-    for year in YEARS:
-        data = call_hyslr_change(corp_code, year)
-        if data.get("status") != "000":
+    for year, data in responses:
+        if isinstance(data, DartError):
+            print(f"[경고] {corp_name}({corp_code}) {year}년 조회 실패: {data}")
             continue
-        rows = data.get("list", [])
+        if not data.ok:
+            continue
+        rows = data.list
         if not rows:
             continue
 
@@ -98,8 +97,6 @@ def collect_change_events_for_company(company: dict):
                 }
             )
 
-        time.sleep(0.1)  # API 과도호출 방지
-
     all_rows.sort(key=lambda x: (x["mxmm_shrholdr_nm"] or "", x["change_on"] or ""))
     return all_rows
 
@@ -260,23 +257,31 @@ def main():
     ipo_events_all = []
     alerts_all = []
 
-    for comp in tqdm(companies, desc="Collecting & analyzing"):
-        corp_code = comp.get("corp_code")
-        if not corp_code:
-            continue
+    targets = [comp for comp in companies if comp.get("corp_code")]
 
-        # 1) 최대주주변동현황 데이터 수집
-        events = collect_change_events_for_company(comp)
-        if not events:
-            continue
+    # (회사, 연도) 조합을 한꺼번에 흘려 보내고, 결과는 순서대로 받아서 회사 단위로 묶는다
+    jobs = [(idx, year) for idx in range(len(targets)) for year in YEARS]
+    params_list = (hyslr_change_params(targets[idx]["corp_code"], year) for idx, year in jobs)
+
+    with DartSession(api_key=DART_KEY) as dart:
+        responses = zip(jobs, (resp for _, resp in dart.map_json("hyslrChgSttus.json", params_list)))
+        by_company = itertools.groupby(responses, key=lambda job_resp: job_resp[0][0])
+
+        for idx, group in tqdm(by_company, total=len(targets), desc="Collecting & analyzing"):
+            comp = targets[idx]
+
+            # 1) 최대주주변동현황 데이터 수집
+            events = collect_change_events_for_company(comp, [(year, resp) for (_, year), resp in group])
+            if not events:
+                continue
 
-        # 2) IPO 희석 이벤트 탐지
-        ipo_events = detect_ipo_dilution(comp, events)
-        ipo_events_all.extend(ipo_events)
+            # 2) IPO 희석 이벤트 탐지
+            ipo_events = detect_ipo_dilution(comp, events)
+            ipo_events_all.extend(ipo_events)
 
-        # 3) 지분 급변 신호 탐지 (시총 기반 threshold)
-        alerts = detect_ownership_change(comp, events)
-        alerts_all.extend(alerts)
+            # 3) 지분 급변 신호 탐지 (시총 기반 threshold)
+            alerts = detect_ownership_change(comp, events)
+            alerts_all.extend(alerts)
 
     # 결과 저장
     with open(OUTPUT_IPO_FILE, "w", encoding="utf-8") as f:
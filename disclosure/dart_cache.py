@@ -0,0 +1,191 @@
+"""
+OpenDART JSON 응답 디스크 캐시
+
+- 키: endpoint + 정규화한 params(crtfc_key 제외, 키 정렬, 값은 문자열 strip) 의 sha256
+  → 같은 요청이면 어느 스크립트에서 불러도 같은 파일을 본다
+- 저장: <DART_CACHE_DIR>/<endpoint>/<키 앞 2자리>/<키>.json.gz (gzip JSON, tmp 에 쓰고 교체)
+- 정상(000)/조회 데이터 없음(013) 응답만 저장. 에러 응답은 저장하지 않는다
+- 유효기간은 읽을 때 판단 (저장 시각 기준으로 정책 적용) → 정책을 바꾸면 기존 항목에도 바로 적용
+  · 받을 때 이미 마감된 기간(사업연도 보고서 제출기한 지남 / 조회 종료일이 지남) → 만료 없음
+  · 아직 열린 기간(올해, 작년 사업보고서 제출 전) → DART_CACHE_OPEN_TTL_SEC
+  · 기간 파라미터가 없는 endpoint → ENDPOINT_TTL_SEC, 없으면 DART_CACHE_OPEN_TTL_SEC
+
+python dart_cache.py stats   # endpoint 별 항목 수 / 용량
+python dart_cache.py prune   # 만료된 항목 삭제
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import hashlib
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent
+
+DART_CACHE_DIR = Path(os.getenv("DART_CACHE_DIR", str(BASE_DIR / ".cache" / "dart")))
+# DART_CACHE=0 이면 캐시를 아예 쓰지 않는다
+DART_CACHE_ENABLED = os.getenv("DART_CACHE", "1") != "0"
+# 아직 바뀔 수 있는 기간(올해 등) 응답의 유효시간
+DART_CACHE_OPEN_TTL_SEC = float(os.getenv("DART_CACHE_OPEN_TTL_SEC", str(6 * 3600)))
+
+# 사업연도 Y 의 정기보고서가 모두 제출됐다고 보는 날 (사업보고서 제출기한 3/31 + 정정 여유)
+CLOSE_MONTH_DAY = (6, 1)
+
+# 기간 파라미터가 없는 endpoint 의 유효시간 (초)
+ENDPOINT_TTL_SEC = {
+    "company.json": 7 * 86400,   # 기업개황
+}
+
+# 캐시 키에서 빼는 파라미터
+IGNORED_PARAMS = {"crtfc_key"}
+
+
+def normalize_params(params: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        str(k): str(v).strip()
+        for k, v in sorted(params.items())
+        if k not in IGNORED_PARAMS and v is not None
+    }
+
+
+def cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    payload = json.dumps([endpoint, normalize_params(params)], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _parse_yyyymmdd(value: str) -> Optional[date]:
+    try:
+        return datetime.strptime(value, "%Y%m%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def period_closed(params: Dict[str, str], today: Optional[date] = None) -> Optional[bool]:
+    """
+    요청이 가리키는 기간이 이미 마감됐는지.
+    - bsns_year=Y → 오늘이 (Y+1)년 CLOSE_MONTH_DAY 이후면 마감
+    - end_de=YYYYMMDD (기간 조회) → 종료일이 오늘보다 앞이면 마감
+    기간 파라미터가 없으면 None
+    """
+    today = today or date.today()
+
+    year = params.get("bsns_year")
+    if year and year.isdigit():
+        return today >= date(int(year) + 1, *CLOSE_MONTH_DAY)
+
+    end_de = _parse_yyyymmdd(params.get("end_de", ""))
+    if end_de is not None:
+        return end_de < today
+
+    return None
+
+
+def ttl_sec(endpoint: str, params: Dict[str, str], today: Optional[date] = None) -> Optional[float]:
+    """유효시간(초). None 이면 만료 없음"""
+    closed = period_closed(params, today)
+    if closed:
+        return None
+    if closed is None and endpoint in ENDPOINT_TTL_SEC:
+        return ENDPOINT_TTL_SEC[endpoint]
+    return DART_CACHE_OPEN_TTL_SEC
+
+
+class DartCache:
+    """
+    cache = DartCache()
+    hit = cache.get("hyslrSttus.json", params)   # (status, message, data) 또는 None
+    cache.put("hyslrSttus.json", params, status, message, data)
+    """
+
+    def __init__(self, root: Path = DART_CACHE_DIR):
+        self.root = Path(root)
+
+    def path_for(self, endpoint: str, params: Dict[str, Any]) -> Path:
+        key = cache_key(endpoint, params)
+        folder = endpoint.replace("/", "_")
+        return self.root / folder / key[:2] / f"{key}.json.gz"
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # 쓰다 만 파일 / 깨진 파일은 없는 것으로 보고 다시 받는다
+            return None
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+        # 마감 여부는 받은 날 기준 (마감 전에 받은 013 이 영구 캐시되지 않게)
+        fetched_at = float(entry.get("fetched_at", 0))
+        ttl = ttl_sec(entry.get("endpoint", ""), entry.get("params", {}), date.fromtimestamp(fetched_at))
+        if ttl is None:
+            return True
+        now = time.time() if now is None else now
+        return now - fetched_at < ttl
+
+    def get(self, endpoint: str, params: Dict[str, Any]) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        entry = self._read(self.path_for(endpoint, params))
+        if entry is None or not self.is_fresh(entry):
+            return None
+        return entry["status"], entry.get("message", ""), entry["data"]
+
+    def put(self, endpoint: str, params: Dict[str, Any], status: str, message: str, data: Dict[str, Any]) -> None:
+        path = self.path_for(endpoint, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "endpoint": endpoint,
+            "params": normalize_params(params),
+            "status": status,
+            "message": message,
+            "fetched_at": time.time(),
+            "data": data,
+        }
+        # 여러 스크립트가 같은 키를 동시에 쓸 수 있으니 tmp 이름에 pid 를 넣는다
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def iter_entries(self):
+        for path in self.root.glob("*/*/*.json.gz"):
+            yield path, self._read(path)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        out: Dict[str, Dict[str, int]] = {}
+        for path in self.root.glob("*/*/*.json.gz"):
+            s = out.setdefault(path.parent.parent.name, {"entries": 0, "bytes": 0})
+            s["entries"] += 1
+            s["bytes"] += path.stat().st_size
+        return out
+
+    def prune(self) -> int:
+        """만료됐거나 읽을 수 없는 항목 삭제 → 삭제 개수"""
+        removed = 0
+        now = time.time()
+        for path, entry in self.iter_entries():
+            if entry is None or not self.is_fresh(entry, now):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+if __name__ == "__main__":
+    cache = DartCache()
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "stats"
+
+    if cmd == "prune":
+        print(f"[INFO] 만료된 캐시 {cache.prune()}개 삭제 → {cache.root}")
+    elif cmd == "stats":
+        stats = cache.stats()
+        for endpoint, s in sorted(stats.items()):
+            print(f"{endpoint:30s} {s['entries']:>8d}개 {s['bytes'] / 1024 / 1024:>8.1f} MB")
+        print(f"[INFO] 캐시 위치: {cache.root}")
+    else:
+        print("사용법: python dart_cache.py [stats|prune]")
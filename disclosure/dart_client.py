@@ -0,0 +1,437 @@
+"""
+OpenDART 공용 클라이언트
+
+- 커넥션 풀(keep-alive) 하나를 모든 요청이 같이 쓴다 (httpx.AsyncClient)
+- 초당 요청 수는 토큰 버킷 하나로 전역 제한 (코루틴이 몇 개든 합쳐서 DART_RATE_PER_SEC)
+- DART status 코드를 결과/예외 타입으로 구분
+  · 000 정상 / 013 조회 데이터 없음 / 014 파일 없음 → DartResult
+  · 010/011/012/901 키·IP 문제 → DartAuthError (재시도 안 함)
+  · 020 요청 제한 초과 → 버킷을 잠시 멈추고 재시도, 계속되면 DartRateLimitError
+  · 800/900, HTTP 5xx, 연결 오류 → 재시도, 계속되면 DartServerError
+  · 그 밖(021/100/101 등) → DartRequestError
+- 동기 스크립트는 DartSession 으로 감싸서 쓴다 (백그라운드 이벤트 루프에서 요청을 동시에 흘리고 결과는 입력 순서대로)
+- JSON 응답(000/013)은 dart_cache.DartCache 에 저장해 두고 유효기간 안이면 호출하지 않는다
+  (DART_CACHE=0 이면 끔, DART_CACHE_REFRESH=1 이면 읽지 않고 새로 받아 덮어씀)
+- 공시 원문(document.xml) 은 document_archive.DocumentArchive 에 rcept_no 별로 한 번만 받아 둔다
+  (DART_DOCUMENT_ARCHIVE=0 이면 끔)
+
+의존성: httpx 를 직접 쓴다 (pip install httpx). google-adk 설치 시 따라오지만 그것에 기대지 않는다.
+"""
+
+import io
+import os
+import time
+import random
+import asyncio
+import zipfile
+import threading
+import xml.etree.ElementTree as ET
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import httpx
+
+from dart_cache import DART_CACHE_ENABLED, DartCache
+from document_archive import DART_DOCUMENT_ARCHIVE_ENABLED, DocumentArchive
+
+T = TypeVar("T")
+I = TypeVar("I")
+
+DART_API_URL = "https://opendart.fss.or.kr/api/"
+
+# OpenDART 는 분당 1,000건 안팎을 넘기면 020 을 준다 → 기본은 그 아래로
+DART_RATE_PER_SEC = float(os.getenv("DART_RATE_PER_SEC", "10"))
+DART_BURST = int(os.getenv("DART_BURST", "5"))
+DART_MAX_CONNECTIONS = int(os.getenv("DART_MAX_CONNECTIONS", "8"))
+DART_TIMEOUT_SEC = float(os.getenv("DART_TIMEOUT_SEC", "20"))
+DART_MAX_RETRIES = int(os.getenv("DART_MAX_RETRIES", "3"))
+DART_BACKOFF_BASE_SEC = float(os.getenv("DART_BACKOFF_BASE_SEC", "1.0"))
+# 020 을 받으면 버킷 전체를 이만큼 멈춘다
+DART_RATE_LIMIT_PAUSE_SEC = float(os.getenv("DART_RATE_LIMIT_PAUSE_SEC", "30"))
+DART_CACHE_REFRESH = os.getenv("DART_CACHE_REFRESH", "0") == "1"
+
+DART_STATUS_MESSAGES = {
+    "000": "정상",
+    "010": "등록되지 않은 키",
+    "011": "사용할 수 없는 키",
+    "012": "접근할 수 없는 IP",
+    "013": "조회된 데이터가 없음",
+    "014": "파일이 존재하지 않음",
+    "020": "요청 제한 초과",
+    "021": "조회 가능한 회사 개수 초과",
+    "100": "필드의 부적절한 값",
+    "101": "부적절한 접근",
+    "800": "시스템 점검으로 인한 서비스 중지",
+    "900": "정의되지 않은 오류",
+    "901": "개인정보 보유기간 만료 계정",
+}
+
+OK_STATUSES = {"000"}
+EMPTY_STATUSES = {"013", "014"}
+AUTH_STATUSES = {"010", "011", "012", "901"}
+RATE_LIMIT_STATUSES = {"020"}
+SERVER_STATUSES = {"800", "900"}
+
+
+class DartError(RuntimeError):
+    """OpenDART 호출 실패 (status 는 DART status 코드, HTTP 오류면 "http_<코드>", 연결 오류면 "network")"""
+
+    def __init__(self, status: str, message: str, endpoint: str = "", params: Optional[Dict[str, Any]] = None):
+        super().__init__(f"[{status}] {message} ({endpoint})")
+        self.status = status
+        self.message = message
+        self.endpoint = endpoint
+        self.params = params or {}
+
+
+class DartAuthError(DartError):
+    """키/IP 문제. 계속 호출해도 소용없으므로 스크립트를 멈춰야 한다."""
+
+
+class DartRateLimitError(DartError):
+    """020 이 재시도 후에도 계속됨."""
+
+
+class DartServerError(DartError):
+    """점검/서버 오류/연결 오류가 재시도 후에도 계속됨."""
+
+
+class DartRequestError(DartError):
+    """요청 값이 잘못됨 (재시도 대상 아님)."""
+
+
+def error_for_status(status: str, message: str, endpoint: str, params: Dict[str, Any]) -> DartError:
+    if status in AUTH_STATUSES:
+        cls = DartAuthError
+    elif status in RATE_LIMIT_STATUSES:
+        cls = DartRateLimitError
+    elif status in SERVER_STATUSES or status == "network" or status.startswith("http_5"):
+        cls = DartServerError
+    else:
+        cls = DartRequestError
+    return cls(status, message or DART_STATUS_MESSAGES.get(status, ""), endpoint, params)
+
+
+class DartResult:
+    """정상(000) 또는 데이터 없음(013/014) 응답"""
+
+    __slots__ = ("status", "message", "data")
+
+    def __init__(self, status: str, message: str, data: Dict[str, Any]):
+        self.status = status
+        self.message = message
+        self.data = data
+
+    @property
+    def ok(self) -> bool:
+        return self.status in OK_STATUSES
+
+    @property
+    def no_data(self) -> bool:
+        return self.status in EMPTY_STATUSES
+
+    @property
+    def list(self) -> List[Dict[str, Any]]:
+        return self.data.get("list") or []
+
+    def __repr__(self) -> str:
+        return f"DartResult(status={self.status!r}, rows={len(self.list)})"
+
+
+def _xml_status(raw: bytes) -> Tuple[str, str]:
+    """document.xml 이 zip 대신 돌려주는 에러 XML 에서 (status, message)"""
+    try:
+        root = ET.fromstring(raw)
+        return (root.findtext("status") or "900"), (root.findtext("message") or "")
+    except ET.ParseError:
+        return "900", raw[:200].decode("utf-8", errors="replace")
+
+
+class TokenBucket:
+    """
+    초당 rate 개, 최대 burst 개까지 쌓이는 토큰 버킷 (한 이벤트 루프 안의 모든 코루틴이 공유).
+    기다리는 쪽은 lock 순서대로 한 명씩 토큰을 받는다.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """020 을 받았을 때: 그동안 아무도 토큰을 못 받게 하고 쌓인 토큰도 비운다"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        self.updated = self.paused_until
+
+
+class DartClient:
+    """
+    async with DartClient() as dart:
+        res = await dart.get_json("hyslrSttus.json", corp_code=..., bsns_year="2024", reprt_code="11011")
+        raw = await dart.get_document(rcept_no)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_per_sec: float = DART_RATE_PER_SEC,
+        burst: int = DART_BURST,
+        max_connections: int = DART_MAX_CONNECTIONS,
+        timeout_sec: float = DART_TIMEOUT_SEC,
+        max_retries: int = DART_MAX_RETRIES,
+        use_cache: bool = DART_CACHE_ENABLED,
+        refresh_cache: bool = DART_CACHE_REFRESH,
+        use_archive: bool = DART_DOCUMENT_ARCHIVE_ENABLED,
+    ):
+        self.api_key = api_key or os.getenv("OPEN_DART_API_KEY")
+        if not self.api_key:
+            raise RuntimeError("OPEN_DART_API_KEY 가 .env 에 설정되어 있지 않습니다.")
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.max_connections = max_connections
+        self.timeout_sec = timeout_sec
+        self.max_retries = max_retries
+        self.cache: Optional[DartCache] = DartCache() if use_cache else None
+        self.refresh_cache = refresh_cache
+        self.archive: Optional[DocumentArchive] = DocumentArchive() if use_archive else None
+        self.bucket: Optional[TokenBucket] = None
+        self.http: Optional[httpx.AsyncClient] = None
+        # 호출 통계 (status 별 건수)
+        self.stats: Dict[str, int] = {}
+
+    async def __aenter__(self) -> "DartClient":
+        # 버킷의 Lock 은 이 루프에 묶이므로 여기서 만든다
+        self.bucket = TokenBucket(self.rate_per_sec, self.burst)
+        self.http = httpx.AsyncClient(
+            base_url=DART_API_URL,
+            timeout=self.timeout_sec,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.http.aclose()
+
+    def _count(self, status: str) -> None:
+        self.stats[status] = self.stats.get(status, 0) + 1
+
+    def _backoff_sec(self, retry_no: int) -> float:
+        """full jitter: [0, base * 2^(n-1)]"""
+        return random.uniform(0, DART_BACKOFF_BASE_SEC * (2 ** (retry_no - 1)))
+
+    async def _call(self, endpoint: str, params: Dict[str, Any], parse: Callable[[httpx.Response], T]) -> T:
+        """
+        토큰을 받고 요청 → parse(resp).
+        parse 는 결과를 돌려주거나 DartError 를 올린다. 재시도할 만한 오류면 backoff 후 다시.
+        """
+        query = {"crtfc_key": self.api_key, **params}
+        last_exc: Optional[DartError] = None
+
+        for attempt_no in range(self.max_retries + 1):
+            if attempt_no > 0:
+                await asyncio.sleep(self._backoff_sec(attempt_no))
+
+            await self.bucket.acquire()
+            try:
+                resp = await self.http.get(endpoint, params=query)
+            except httpx.HTTPError as e:
+                last_exc = DartServerError("network", f"{type(e).__name__}: {e}", endpoint, params)
+                self._count("network")
+                continue
+
+            if resp.status_code >= 500:
+                last_exc = DartServerError(f"http_{resp.status_code}", resp.reason_phrase, endpoint, params)
+                self._count(last_exc.status)
+                continue
+            if resp.status_code >= 400:
+                self._count(f"http_{resp.status_code}")
+                raise DartRequestError(f"http_{resp.status_code}", resp.reason_phrase, endpoint, params)
+
+            try:
+                result = parse(resp)
+            except (DartRateLimitError, DartServerError) as e:
+                self._count(e.status)
+                if isinstance(e, DartRateLimitError):
+                    print(f"[경고] DART 요청 제한 초과(020) → {DART_RATE_LIMIT_PAUSE_SEC:.0f}s 대기")
+                    self.bucket.pause(DART_RATE_LIMIT_PAUSE_SEC)
+                last_exc = e
+                continue
+            except DartError as e:
+                self._count(e.status)
+                raise
+            return result
+
+        raise last_exc
+
+    async def get_json(self, endpoint: str, **params: Any) -> DartResult:
+        """JSON API (*.json) 호출. 000/013 → DartResult, 나머지는 DartError 계열."""
+
+        def parse(resp: httpx.Response) -> DartResult:
+            try:
+                data = resp.json()
+            except ValueError:
+                raise DartServerError("900", f"JSON 파싱 실패: {resp.text[:200]}", endpoint, params)
+            status = str(data.get("status", "900"))
+            message = data.get("message", "")
+            if status in OK_STATUSES or status in EMPTY_STATUSES:
+                self._count(status)
+                return DartResult(status, message, data)
+            raise error_for_status(status, message, endpoint, params)
+
+        if self.cache is not None and not self.refresh_cache:
+            hit = self.cache.get(endpoint, params)
+            if hit is not None:
+                self._count("cache")
+                return DartResult(*hit)
+
+        result = await self._call(endpoint, params, parse)
+        if self.cache is not None:
+            self.cache.put(endpoint, params, result.status, result.message, result.data)
+        return result
+
+    async def get_document(self, rcept_no: str) -> Optional[bytes]:
+        """공시 원문(document.xml) zip 바이트. 파일이 없으면(014) None. 아카이브에 있으면 호출 없이."""
+        params = {"rcept_no": rcept_no}
+
+        if self.archive is not None and rcept_no in self.archive:
+            self._count("archive")
+            return self.archive.get_raw(rcept_no)
+
+        def parse(resp: httpx.Response) -> Optional[bytes]:
+            raw = resp.content
+            if zipfile.is_zipfile(io.BytesIO(raw)):
+                self._count("000")
+                return raw
+            status, message = _xml_status(raw)
+            if status in EMPTY_STATUSES:
+                self._count(status)
+                return None
+            raise error_for_status(status, message, "document.xml", params)
+
+        raw = await self._call("document.xml", params, parse)
+        if self.archive is not None:
+            self.archive.put(rcept_no, raw)
+        return raw
+
+
+class DartSession:
+    """
+    동기 스크립트용 DartClient 래퍼.
+    백그라운드 스레드에 이벤트 루프를 하나 띄워 두고 그 안의 DartClient 로 요청을 보낸다.
+
+    with DartSession() as dart:
+        for params, res in dart.map_json("piicDecsn.json", params_list):
+            ...
+    """
+
+    def __init__(self, window: Optional[int] = None, **client_kwargs: Any):
+        self.client = DartClient(**client_kwargs)
+        # map_* 에서 동시에 띄워 둘 요청 수 (버킷이 속도를 제한하므로 커넥션 수 정도면 충분)
+        self.window = window or self.client.max_connections * 2
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "DartSession":
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="dart-client", daemon=True)
+        self.thread.start()
+        self._run(self.client.__aenter__())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            self._run(self.client.__aexit__(*exc))
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+        if self.client.stats:
+            print(f"[INFO] DART 호출 통계: {self.client.stats}")
+
+    def _run(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    # ---------- 단건 (블로킹) ----------
+    def get_json(self, endpoint: str, **params: Any) -> DartResult:
+        return self._run(self.client.get_json(endpoint, **params))
+
+    def get_document(self, rcept_no: str) -> Optional[bytes]:
+        return self._run(self.client.get_document(rcept_no))
+
+    # ---------- 여러 건 (동시에, 결과는 입력 순서대로) ----------
+    def imap(
+        self,
+        func: Callable[[DartClient, I], Awaitable[T]],
+        items: Iterable[I],
+    ) -> Iterator[Tuple[I, Any]]:
+        """
+        items 마다 func(client, item) 을 window 개까지 동시에 띄우고 (item, 결과) 를 입력 순서대로 yield.
+        DartError 는 결과 자리에 예외 객체로 돌려준다 (스크립트가 건별로 건너뛸 수 있게).
+        DartAuthError 만은 더 호출해 봐야 소용없으므로 바로 올린다.
+        """
+        pending: deque = deque()
+        items_iter = iter(items)
+
+        def submit() -> bool:
+            item = next(items_iter, _END)
+            if item is _END:
+                return False
+            pending.append((item, asyncio.run_coroutine_threadsafe(func(self.client, item), self.loop)))
+            return True
+
+        try:
+            while len(pending) < self.window and submit():
+                pass
+            while pending:
+                item, future = pending.popleft()
+                try:
+                    result = future.result()
+                except DartAuthError:
+                    raise
+                except DartError as e:
+                    result = e
+                submit()
+                yield item, result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def map_json(self, endpoint: str, params_list: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Any]]:
+        return self.imap(lambda client, params: client.get_json(endpoint, **params), params_list)
+
+    def map_documents(self, rcept_nos: Iterable[Optional[str]]) -> Iterator[Tuple[Optional[str], Any]]:
+        """rcept_no 가 비어 있으면 호출 없이 None"""
+
+        async def fetch(client: DartClient, rcept_no: Optional[str]) -> Optional[bytes]:
+            if not rcept_no:
+                return None
+            return await client.get_document(rcept_no)
+
+        return self.imap(fetch, rcept_nos)
+
+
+_END = object()
@@ -0,0 +1,235 @@
+"""
+공시 원문(document.xml) 로컬 아카이브
+
+- rcept_no 하나당 DART 가 준 zip 바이트를 그대로 한 번만 저장 (다시 압축하지 않음)
+- documents.pack : zip 바이트를 이어 붙인 append-only 파일
+- index.jsonl    : {"rcept_no", "offset", "length", "status", "sha256", "fetched_at"} 한 줄씩 (append-only)
+  · status 014(원문 파일 없음) 도 기록해서 다시 묻지 않는다 (length 0)
+- 읽을 때는 index 만 메모리에 올리고, zip 은 요청된 rcept_no 만 pack 에서 꺼내 그때 푼다
+- 여러 스크립트가 같은 아카이브에 동시에 쓸 수 있다: put 은 archive.lock 파일에 프로세스 간 배타 락을 잡고
+  (다른 프로세스가 그 사이 붙인 index 줄을 먼저 읽어 들인 뒤) pack → index 순서로 붙인다
+
+DartClient.get_document 가 먼저 여기서 찾고, 없을 때만 DART 에 요청해서 받은 걸 넣는다.
+→ 파싱 규칙만 바꿔서 다시 돌리면 네트워크 없이 CPU 만 쓴다.
+
+python document_archive.py stats              # 문서 수 / 용량
+python document_archive.py show <rcept_no>    # 원문 XML 앞부분 출력
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import hashlib
+import zipfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+BASE_DIR = Path(__file__).resolve().parent
+
+DART_DOCUMENT_ARCHIVE_DIR = Path(
+    os.getenv("DART_DOCUMENT_ARCHIVE_DIR", str(BASE_DIR / ".cache" / "document_archive"))
+)
+# DART_DOCUMENT_ARCHIVE=0 이면 아카이브를 쓰지 않는다 (매번 DART 에서 받음)
+DART_DOCUMENT_ARCHIVE_ENABLED = os.getenv("DART_DOCUMENT_ARCHIVE", "1") != "0"
+
+PACK_NAME = "documents.pack"
+INDEX_NAME = "index.jsonl"
+LOCK_NAME = "archive.lock"
+
+
+def decode_document_zip(raw: bytes) -> Optional[str]:
+    """
+    document.xml 응답 바이트 → 공시 원문 XML 문자열
+    1) zip 이면 안의 첫 .xml 을 euc-kr(안 되면 utf-8) 로 디코딩
+    2) zip 이 아니면 그대로 텍스트로 보고, DART 에러 문구가 있으면 None
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(raw)) as z:
+            xml_files = [n for n in z.namelist() if n.lower().endswith(".xml")]
+            if not xml_files:
+                return None
+            xml_bytes = z.read(xml_files[0])
+        try:
+            return xml_bytes.decode("euc-kr")
+        except UnicodeDecodeError:
+            return xml_bytes.decode("utf-8", errors="ignore")
+    except zipfile.BadZipFile:
+        pass
+
+    try:
+        text = raw.decode("euc-kr")
+    except UnicodeDecodeError:
+        text = raw.decode("utf-8", errors="ignore")
+
+    if "오류가 발생하였습니다" in text or "접수번호 오류" in text:
+        return None
+    return text
+
+
+class DocumentArchive:
+    """
+    archive = DocumentArchive()
+    if "20240802000202" in archive:
+        xml_text = archive.get_xml("20240802000202")
+    archive.put(rcept_no, raw_zip)      # raw_zip 이 None 이면 014(파일 없음) 으로 기록
+    """
+
+    def __init__(self, root: Path = DART_DOCUMENT_ARCHIVE_DIR):
+        self.root = Path(root)
+        self.pack_path = self.root / PACK_NAME
+        self.index_path = self.root / INDEX_NAME
+        self.lock_path = self.root / LOCK_NAME
+        # rcept_no → (offset, length, status)
+        self.index: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+        # index.jsonl 을 어디까지 읽었는지 (다른 프로세스가 붙인 줄만 이어서 읽는다)
+        self._index_pos = 0
+        self._load_index()
+
+    @contextmanager
+    def _process_lock(self):
+        """같은 아카이브를 쓰는 다른 프로세스와의 배타 락 (스레드 간에는 self._lock)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _load_index(self, warn: bool = True) -> None:
+        """index.jsonl 에서 아직 안 읽은 완전한 줄만 읽어 들인다"""
+        if not self.index_path.exists():
+            return
+        pack_size = self.pack_path.stat().st_size if self.pack_path.exists() else 0
+        skipped = 0
+        with self.index_path.open("rb") as f:
+            f.seek(self._index_pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # 쓰다가 끊긴 마지막 줄 (다음 put 이 줄바꿈부터 쓰므로 다시 읽지 않는다)
+                    skipped += 1
+                    break
+                self._index_pos += len(line)
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    skipped += 1
+                    continue
+                offset, length = int(rec["offset"]), int(rec["length"])
+                if offset + length > pack_size:
+                    # index 는 pack 을 쓴 다음에 쓰므로 보통 없지만, pack 이 잘린 경우 방어
+                    skipped += 1
+                    continue
+                self.index[rec["rcept_no"]] = (offset, length, rec.get("status", "000"))
+        if skipped and warn:
+            print(f"[경고] 문서 아카이브 index 에서 읽지 못한 줄 {skipped}개 무시 → {self.index_path}")
+
+    def __contains__(self, rcept_no: str) -> bool:
+        return rcept_no in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def status(self, rcept_no: str) -> Optional[str]:
+        entry = self.index.get(rcept_no)
+        return entry[2] if entry else None
+
+    def get_raw(self, rcept_no: str) -> Optional[bytes]:
+        """저장된 zip 바이트 (없거나 014 면 None)"""
+        entry = self.index.get(rcept_no)
+        if entry is None or entry[1] == 0:
+            return None
+        offset, length, _ = entry
+        with self.pack_path.open("rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def get_xml(self, rcept_no: str) -> Optional[str]:
+        """저장된 zip 을 풀어서 원문 XML 문자열 (없으면 None)"""
+        raw = self.get_raw(rcept_no)
+        if raw is None:
+            return None
+        return decode_document_zip(raw)
+
+    def put(self, rcept_no: str, raw: Optional[bytes]) -> None:
+        """이미 있으면 무시. pack 에 먼저 쓰고 index 줄을 나중에 붙인다"""
+        if not rcept_no or rcept_no in self.index:
+            return
+        data = raw or b""
+        status = "000" if raw else "014"
+
+        with self._lock, self._process_lock():
+            # 락을 기다리는 동안 다른 프로세스가 넣었을 수 있다
+            self._load_index(warn=False)
+            if rcept_no in self.index:
+                return
+            with self.pack_path.open("ab") as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            rec = {
+                "rcept_no": rcept_no,
+                "offset": offset,
+                "length": len(data),
+                "status": status,
+                "sha256": hashlib.sha256(data).hexdigest() if data else None,
+                "fetched_at": time.time(),
+            }
+            line = (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+            with self.index_path.open("ab") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() > self._index_pos:
+                    # 끊긴 줄 뒤에 붙이면 같은 줄이 되므로 새 줄에서 시작
+                    f.write(b"\n")
+                    f.flush()
+                self._index_pos = f.tell()
+                f.write(line)
+            self._index_pos += len(line)
+
+            self.index[rcept_no] = (offset, len(data), status)
+
+    def iter_xml(self) -> Iterator[Tuple[str, Optional[str]]]:
+        """저장된 모든 문서를 (rcept_no, XML) 로 하나씩 (필요할 때마다 풀어서)"""
+        for rcept_no in list(self.index):
+            yield rcept_no, self.get_xml(rcept_no)
+
+
+if __name__ == "__main__":
+    archive = DocumentArchive()
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "stats"
+
+    if cmd == "stats":
+        missing = sum(1 for _, length, _ in archive.index.values() if length == 0)
+        size = archive.pack_path.stat().st_size if archive.pack_path.exists() else 0
+        print(f"[INFO] 문서 {len(archive)}개 (원문 없음 014: {missing}개), pack {size / 1024 / 1024:.1f} MB")
+        print(f"[INFO] 아카이브 위치: {archive.root}")
+    elif cmd == "show" and len(sys.argv) > 2:
+        xml_text = archive.get_xml(sys.argv[2])
+        if xml_text is None:
+            print(f"[경고] 아카이브에 없음: rcept_no={sys.argv[2]} (status={archive.status(sys.argv[2])})")
+        else:
+            print(xml_text[:2000])
+    else:
+        print("사용법: python document_archive.py [stats | show <rcept_no>]")
@@ -1,10 +1,15 @@
 import os
+import sys
 import json
 import csv
 import math
 import unicodedata
 from typing import Dict, Any, List, Optional
 
+# company/company_store.py 의 기업 저장소로 등록 안 된 회사명도 corp_code 를 찾는다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "company"))
+from company_store import CompanyStore, open_company_store
+
 # -----------------------------
 #  설정: 입력 / 출력 경로
 # -----------------------------
@@ -81,13 +86,17 @@ def classify_entity_type_from_name(name: str) -> str:
 #  Node Registry
 # -----------------------------
 class NodeRegistry:
-    def __init__(self):
+    def __init__(self, store: Optional[CompanyStore] = None):
         # corp_code 기준 회사 노드
         self.corp_nodes: Dict[str, Dict[str, Any]] = {}
         # 이름 기준 엔티티 노드 (회사 아닌 투자자/주주 등)
         self.entity_nodes: Dict[str, Dict[str, Any]] = {}
         # corp_name 정규화 → corp_code 매핑 (회사명으로 투자자 매칭용)
         self.corp_name_key_to_code: Dict[str, str] = {}
+        # 기업 저장소 (있으면 위 매핑에 없는 이름 → 영문명/표기가 다른 이름도 조회)
+        self.store = store
+        # 저장소에서도 못 찾은 이름 키 (같은 이름을 다시 조회하지 않게)
+        self._store_misses: set = set()
         # node_id 카운터 (엔티티용)
         self._entity_seq = 1
 
@@ -147,6 +156,8 @@ class NodeRegistry:
 
         # 1) 상장사 이름과 매칭되는 경우 → 회사 노드 재사용
         corp_code = self.corp_name_key_to_code.get(key)
+        if corp_code is None:
+            corp_code = self._lookup_store(name, key)
         if corp_code is not None and corp_code in self.corp_nodes:
             return self.corp_nodes[corp_code]["node_id"]
 
@@ -172,6 +183,16 @@ class NodeRegistry:
         self.entity_nodes[key] = node
         return node_id
 
+    def _lookup_store(self, name: str, key: str) -> Optional[str]:
+        if self.store is None or key in self._store_misses:
+            return None
+        corp_code = self.store.corp_codes_by_names([name]).get(name)
+        if corp_code is None:
+            self._store_misses.add(key)
+        else:
+            self.corp_name_key_to_code[key] = corp_code
+        return corp_code
+
     # ---------- 모든 노드 리스트 반환 ----------
     def all_nodes(self) -> List[Dict[str, Any]]:
         return list(self.corp_nodes.values()) + list(self.entity_nodes.values())
@@ -439,7 +460,8 @@ def main():
     print(f"[INFO] ipo_dilution_events_mcap: {len(ipo_items)} rows")
 
     # 엔티티 정규화: 회사들 먼저 Registry에 등록
-    node_reg = NodeRegistry()
+    store = open_company_store()
+    node_reg = NodeRegistry(store)
     build_corp_registry(node_reg, cap_inc_items, own_items, ipo_items)
     print(f"[INFO] registered companies: {len(node_reg.corp_nodes)}")
 
@@ -460,6 +482,7 @@ def main():
 
     save_nodes_to_csv(all_nodes, NODES_CSV_PATH)
     save_edges_to_csv(all_edges, EDGES_CSV_PATH)
+    store.close()
 
     print()
     print(f"nodes.csv  → {NODES_CSV_PATH}")
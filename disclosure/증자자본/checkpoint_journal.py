@@ -0,0 +1,163 @@
+"""
+append-only JSONL 체크포인트 저널
+
+결과 리스트 전체를 매 건마다 indent=2 로 다시 쓰는 대신
+- 진행 중에는 새 레코드 한 줄만 <출력파일>.journal.jsonl 에 덧붙이고
+  (flush 는 매번, fsync 는 JOURNAL_FSYNC_EVERY 건 / JOURNAL_FSYNC_SEC 초마다 한 번)
+- 끝나면 compact() 로 최종 JSON(기존과 같은 형식) 을 한 번 쓰고 저널을 지운다
+- 다시 시작하면 최종 JSON + 저널을 합쳐서 이어간다 (같은 key 는 뒤의 것이 이김)
+  · 끊긴 마지막 줄은 무시
+  · compact 가 최종 JSON 교체 후 저널 삭제 전에 끊겨도 key 로 중복이 걸러진다
+
+journal = CheckpointJournal(OUTPUT_PATH, key=lambda rec: rec["event"]["rcept_no"])
+results = journal.load()
+with journal:
+    for ...:
+        journal.append(record)      # results 에도 같이 붙는다
+journal.compact()
+"""
+
+import os
+import json
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+JOURNAL_FSYNC_EVERY = int(os.getenv("JOURNAL_FSYNC_EVERY", "50"))
+JOURNAL_FSYNC_SEC = float(os.getenv("JOURNAL_FSYNC_SEC", "5"))
+
+
+def merge_by_key(
+    records: List[Dict[str, Any]],
+    key: Callable[[Dict[str, Any]], Optional[Hashable]],
+) -> List[Dict[str, Any]]:
+    """같은 key 는 처음 나온 자리에 마지막 값을 둔다 (key 가 None 이면 그대로 둔다)"""
+    merged: List[Dict[str, Any]] = []
+    position: Dict[Hashable, int] = {}
+    for rec in records:
+        k = key(rec)
+        if k is None:
+            merged.append(rec)
+        elif k in position:
+            merged[position[k]] = rec
+        else:
+            position[k] = len(merged)
+            merged.append(rec)
+    return merged
+
+
+class CheckpointJournal:
+    def __init__(
+        self,
+        output_path: str,
+        key: Callable[[Dict[str, Any]], Optional[Hashable]],
+        journal_path: Optional[str] = None,
+    ):
+        self.output_path = output_path
+        self.journal_path = journal_path or output_path + ".journal.jsonl"
+        self.key = key
+        self.records: List[Dict[str, Any]] = []
+        self._f = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    # ---------- 읽기 ----------
+    def _read_output(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.output_path):
+            return []
+        try:
+            with open(self.output_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            print(f"[WARN] 기존 결과 읽기 실패 → 저널만 사용: {self.output_path}")
+            return []
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.journal_path):
+            return []
+        records: List[Dict[str, Any]] = []
+        broken = 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # 쓰다가 끊긴 줄
+                    broken += 1
+        if broken:
+            print(f"[WARN] 저널에서 읽지 못한 줄 {broken}개 무시: {self.journal_path}")
+        return records
+
+    def load(self, include_output: bool = True) -> List[Dict[str, Any]]:
+        """
+        최종 JSON(include_output=True 일 때) + 저널을 합친 레코드 리스트.
+        돌려준 리스트는 self.records 그 자체라서 append() 하면 같이 늘어난다.
+        """
+        output = self._read_output() if include_output else []
+        journaled = self._read_journal()
+        if journaled:
+            print(f"저널에서 {len(journaled)}개 복구: {self.journal_path}")
+        self.records = merge_by_key(output + journaled, self.key)
+        return self.records
+
+    # ---------- 쓰기 ----------
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+        needs_newline = False
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > 0:
+            with open(self.journal_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        self._f = open(self.journal_path, "a", encoding="utf-8")
+        if needs_newline:
+            self._f.write("\n")
+
+    def append(self, record: Dict[str, Any]) -> None:
+        if self._f is None:
+            self._open()
+        self._f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._f.flush()
+        self.records.append(record)
+
+        self._unsynced += 1
+        if self._unsynced >= JOURNAL_FSYNC_EVERY or time.monotonic() - self._last_sync >= JOURNAL_FSYNC_SEC:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._f is not None and self._unsynced:
+            self._f.flush()
+            os.fsync(self._f.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self._f is not None:
+            self.sync()
+            self._f.close()
+            self._f = None
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # 중간에 죽어도 저널은 남겨 둔다 (다음 load 에서 이어감)
+        self.close()
+
+    # ---------- 정리 ----------
+    def compact(self, records: Optional[List[Dict[str, Any]]] = None) -> None:
+        """records(기본: self.records 를 key 로 합친 것) 를 최종 JSON 으로 한 번 쓰고 저널 삭제"""
+        self.close()
+        if records is None:
+            records = merge_by_key(self.records, self.key)
+
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        tmp_path = self.output_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.output_path)
+
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
@@ -1,69 +1,57 @@
-import io
 import os
-import zipfile
-import requests
+import sys
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Any, Optional
+
+# disclosure/dart_client.py 의 공용 OpenDART 클라이언트를 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dart_client import DartError, DartSession
+from document_archive import DocumentArchive, decode_document_zip
 
 load_dotenv()
 DART_KEY = os.getenv("OPEN_DART_API_KEY")
 
-DOC_URL = "https://opendart.fss.or.kr/api/document.xml"
-
 
-def fetch_document_xml(rcept_no: str) -> Optional[str]:
+def document_xml_text(raw: Any, rcept_no: str) -> Optional[str]:
     """
-    DART document.xml API 호출 유틸리티
-
-    처리 흐름:
-    1) API 호출
-    2) ZIP 응답이면 → XML 파일 추출
-    3) ZIP 아니면 → 텍스트(XML)로 디코딩 시도
-    4) 오류 응답이면 None 반환
+    dart.get_document / map_documents 결과 → 원문 XML 문자열
+    - DartError(요청 실패) / None(원문 파일 없음) / 에러 문구 응답이면 None
+    - zip 풀기와 디코딩은 document_archive.decode_document_zip 공용
     """
-
-    params = {
-        "crtfc_key": DART_KEY,
-        "rcept_no": rcept_no,
-    }
-
-    try:
-        resp = requests.get(DOC_URL, params=params, timeout=20)
-        resp.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"document.xml 요청 실패: rcept_no={rcept_no}, 이유={e}")
+    if isinstance(raw, DartError):
+        print(f"[WARN] document.xml 요청 실패: rcept_no={rcept_no}, 이유={raw}")
+        return None
+    if raw is None:
         return None
 
-    raw = resp.content
-
-
-    try:
-        with zipfile.ZipFile(io.BytesIO(raw)) as z:
-            xml_files = [n for n in z.namelist() if n.lower().endswith(".xml")]
-            if not xml_files:
-                return None
-
-            xml_bytes = z.read(xml_files[0])
+    xml_text = decode_document_zip(raw)
+    if xml_text is None:
+        print(f"[WARN] document.xml 응답에 XML 없음 / 에러 문구 감지: rcept_no={rcept_no}")
+    return xml_text
 
-        try:
-            return xml_bytes.decode("euc-kr")
-        except UnicodeDecodeError:
-            return xml_bytes.decode("utf-8", errors="ignore")
 
-    except zipfile.BadZipFile:
-        
-        pass
+def fetch_document_xml(rcept_no: str, dart: Optional[DartSession] = None) -> Optional[str]:
+    """
+    DART document.xml 원문 가져오기 유틸리티
 
+    처리 흐름:
+    1) 문서 아카이브에 있으면 네트워크 없이 거기서 꺼낸다
+    2) 없으면 API 호출 (dart 세션을 넘기면 그 세션의 커넥션/속도 제한을 같이 쓴다)
+       → 받은 zip 은 아카이브에 저장됨
+    3) ZIP 풀어서 XML 디코딩, 오류 응답이면 None 반환
+    """
+    if dart is None:
+        archive = DocumentArchive()
+        if rcept_no in archive:
+            return archive.get_xml(rcept_no)
+        with DartSession(api_key=DART_KEY) as session:
+            return fetch_document_xml(rcept_no, session)
 
     try:
-        text = raw.decode("euc-kr")
-    except UnicodeDecodeError:
-        text = raw.decode("utf-8", errors="ignore")
-
-    if "오류가 발생하였습니다" in text or "접수번호 오류" in text:
-        return None
-
-    return text
+        raw = dart.get_document(rcept_no)
+    except DartError as e:
+        raw = e
+    return document_xml_text(raw, rcept_no)
 
 
 def save_debug_xml(
@@ -18,83 +18,25 @@
 """
 
 import os
-import io
+import sys
 import json
-import time
-import zipfile
-import requests
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+# disclosure/dart_client.py 의 공용 OpenDART 클라이언트를 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dart_client import DartSession
+from fetch_document_xml import document_xml_text
+
 load_dotenv()
 DART_KEY = os.getenv("OPEN_DART_API_KEY")
 
-DOC_URL = "https://opendart.fss.or.kr/api/document.xml"
 INPUT_FILE = "./output/capital_increase_third_party_tables.json"
 OUTPUT_FILE = "./output/capital_increase_third_party_table_with_alloc.json"
 
 
-# ---------------------------
-# 1) document.xml 가져오기 (ZIP → XML)
-# ---------------------------
-def fetch_document_xml(rcept_no: str) -> Optional[str]:
-    """
-    document.xml API 호출 후:
-    1) resp.content를 ZIP으로 먼저 시도
-    2) BadZipFile이면 일반 텍스트(euc-kr → utf-8)로 디코딩 시도
-    """
-    params = {
-        "crtfc_key": DART_KEY,
-        "rcept_no": rcept_no,
-    }
-
-    try:
-        resp = requests.get(DOC_URL, params=params, timeout=20)
-        resp.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"[WARN] document.xml 요청 실패: rcept_no={rcept_no}, 이유={e}")
-        return None
-
-    raw = resp.content
-
-    # 1) ZIP 우선 시도
-    try:
-        with zipfile.ZipFile(io.BytesIO(raw)) as z:
-            names = z.namelist()
-            xml_candidates = [n for n in names if n.lower().endswith(".xml")]
-            if not xml_candidates:
-                print(f"[WARN] ZIP 안에 xml 파일 없음: rcept_no={rcept_no}, files={names}")
-                return None
-
-            xml_name = xml_candidates[0]
-            xml_bytes = z.read(xml_name)
-
-        try:
-            xml_text = xml_bytes.decode("euc-kr")
-        except UnicodeDecodeError:
-            xml_text = xml_bytes.decode("utf-8", errors="ignore")
-
-        return xml_text
-
-    except zipfile.BadZipFile:
-        # ZIP 아니면 일반 텍스트로
-        pass
-
-    # 2) 일반 텍스트 디코딩
-    try:
-        txt = raw.decode("euc-kr")
-    except UnicodeDecodeError:
-        txt = raw.decode("utf-8", errors="ignore")
-
-    if "오류가 발생하였습니다" in txt or "접수번호 오류" in txt:
-        print(f"[WARN] document.xml 응답 내 에러 문구 감지: rcept_no={rcept_no}")
-        return None
-
-    return txt
-
-
 # ---------------------------
 # 2) XML에서 제3자배정 '배정대상자 테이블' 파싱
 # ---------------------------
@@ -149,43 +91,47 @@ def run_fill_allocation_tables():
 
     updated: List[Dict[str, Any]] = []
 
-    for idx, item in enumerate(data, start=1):
-        corp_code = item.get("corp_code")
-        corp_name = item.get("corp_name")
-        year = item.get("year")
-        event = item.get("event") or {}
-        rcept_no = event.get("rcept_no")
-
-        print("=" * 60)
-        print(f"({idx}/{len(data)}) {corp_name} ({corp_code}), year={year}")
-        print(f"  - rcept_no={rcept_no}")
-
-        # 이미 allocation_tables 가 채워져 있으면 스킵할 수도 있음 (원하면 조건 추가)
-        # if item.get("allocation_tables"):
-        #     print("  → 이미 allocation_tables 존재, 스킵\n")
-        #     updated.append(item)
-        #     continue
-
-        if not rcept_no:
-            print("  → rcept_no 없음, 스킵\n")
+    # document.xml 은 window 만큼 미리 동시에 받아 두고, 입력 순서대로 꺼내 쓴다
+    rcept_nos = [(item.get("event") or {}).get("rcept_no") for item in data]
+
+    with DartSession(api_key=DART_KEY) as dart:
+        documents = dart.map_documents(rcept_nos)
+        for idx, (item, (_, raw)) in enumerate(zip(data, documents), start=1):
+            corp_code = item.get("corp_code")
+            corp_name = item.get("corp_name")
+            year = item.get("year")
+            event = item.get("event") or {}
+            rcept_no = event.get("rcept_no")
+
+            print("=" * 60)
+            print(f"({idx}/{len(data)}) {corp_name} ({corp_code}), year={year}")
+            print(f"  - rcept_no={rcept_no}")
+
+            # 이미 allocation_tables 가 채워져 있으면 스킵할 수도 있음 (원하면 조건 추가)
+            # if item.get("allocation_tables"):
+            #     print("  → 이미 allocation_tables 존재, 스킵\n")
+            #     updated.append(item)
+            #     continue
+
+            if not rcept_no:
+                print("  → rcept_no 없음, 스킵\n")
+                updated.append(item)
+                continue
+
+            xml_text = document_xml_text(raw, rcept_no)
+
+            if xml_text is None:
+                print(" → document.xml 가져오기 실패, allocation_tables 비워둠\n")
+                item["allocation_tables"] = []
+                updated.append(item)
+                continue
+
+            allocations = parse_third_party_allocation(xml_text)
+            print(f" → 제3자배정 배정대상자 {len(allocations)}명 추출")
+
+            item["allocation_tables"] = allocations
             updated.append(item)
-            continue
-
-        xml_text = fetch_document_xml(rcept_no)
-        time.sleep(1.0)  
-
-        if xml_text is None:
-            print(" → document.xml 가져오기 실패, allocation_tables 비워둠\n")
-            item["allocation_tables"] = []
-            updated.append(item)
-            continue
-
-        allocations = parse_third_party_allocation(xml_text)
-        print(f" → 제3자배정 배정대상자 {len(allocations)}명 추출")
-
-        item["allocation_tables"] = allocations
-        updated.append(item)
-        print()
+            print()
 
     # 2) 결과 저장
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
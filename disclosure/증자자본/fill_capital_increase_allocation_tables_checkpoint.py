@@ -2,7 +2,7 @@
 - 목적:
   제3자배정 이벤트 목록(JSON)을 기반으로 document.xml을 재조회하고,
   배정대상자(THD_ASN_LST) 테이블을 파싱하여 allocation_tables를 채운다.
-  중간에 끊겨도 복구 가능하도록 partial 파일을 매번 저장한다.
+  중간에 끊겨도 이어서 돌 수 있도록 처리한 이벤트를 저널(JSONL)에 한 줄씩 남긴다.
 
 - 입력:
   - ./output/capital_increase_third_party_tables.json
@@ -11,88 +11,32 @@
   1) rcept_no로 document.xml(zip/xml) 다운로드
   2) THD_ASN_LST 파싱
   3) 합계/소계 행 등 노이즈 행 제거
-  4) 매 이벤트마다 partial 파일 저장 (checkpoint)
+  4) 매 이벤트마다 저널에 한 줄 추가 (checkpoint), 다시 돌리면 저널에 있는 rcept_no 는 건너뜀
 
 - 출력:
-  - ./output/capital_increase_third_party_table_with_alloc.partial.json (checkpoint)
+  - ./output/capital_increase_third_party_table_with_alloc.json.journal.jsonl (checkpoint, 완료 후 삭제)
   - ./output/capital_increase_third_party_table_with_alloc.json (final)
 """
 
 import os
-import io
+import sys
 import json
-import time
-import zipfile
-import requests
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+# disclosure/dart_client.py 의 공용 OpenDART 클라이언트를 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dart_client import DartSession
+from fetch_document_xml import document_xml_text
+from checkpoint_journal import CheckpointJournal
+
 load_dotenv()
 DART_KEY = os.getenv("OPEN_DART_API_KEY")
 
-DOC_URL = "https://opendart.fss.or.kr/api/document.xml"
-
 INPUT_FILE = "./output/capital_increase_third_party_tables.json"
 OUTPUT_FILE = "./output/capital_increase_third_party_table_with_alloc.json"
-PARTIAL_FILE = "./output/capital_increase_third_party_table_with_alloc.partial.json"
-
-
-def fetch_document_xml(rcept_no: str) -> Optional[str]:
-    """
-    document.xml API 호출 후:
-    1) resp.content를 ZIP으로 먼저 시도
-    2) BadZipFile이면 일반 텍스트(euc-kr → utf-8)로 디코딩 시도
-    """
-    params = {
-        "crtfc_key": DART_KEY,
-        "rcept_no": rcept_no,
-    }
-
-    try:
-        resp = requests.get(DOC_URL, params=params, timeout=20)
-        resp.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"[WARN] document.xml 요청 실패: rcept_no={rcept_no}, 이유={e}")
-        return None
-
-    raw = resp.content
-
-    # 1) ZIP 우선 시도
-    try:
-        with zipfile.ZipFile(io.BytesIO(raw)) as z:
-            names = z.namelist()
-            xml_candidates = [n for n in names if n.lower().endswith(".xml")]
-            if not xml_candidates:
-                print(f"[WARN] ZIP 안에 xml 파일 없음: rcept_no={rcept_no}, files={names}")
-                return None
-
-            xml_name = xml_candidates[0]
-            xml_bytes = z.read(xml_name)
-
-        try:
-            xml_text = xml_bytes.decode("euc-kr")
-        except UnicodeDecodeError:
-            xml_text = xml_bytes.decode("utf-8", errors="ignore")
-
-        return xml_text
-
-    except zipfile.BadZipFile:
-        # ZIP 아니면 일반 텍스트로
-        pass
-
-    # 2) 일반 텍스트 디코딩
-    try:
-        txt = raw.decode("euc-kr")
-    except UnicodeDecodeError:
-        txt = raw.decode("utf-8", errors="ignore")
-
-    if "오류가 발생하였습니다" in txt or "접수번호 오류" in txt:
-        print(f"[WARN] document.xml 응답 내 에러 문구 감지: rcept_no={rcept_no}")
-        return None
-
-    return txt
 
 
 # ---------------------------
@@ -200,58 +144,69 @@ def run_fill_allocation_tables():
 
     updated: List[Dict[str, Any]] = []
 
-    # 혹시 PARTIAL_FILE 이 이미 있으면, 재시도 시 이어서 쓸 수도 있음
-    # (지금은 간단하게 무시하고 새로 도는 형태로 둠)
-    # 필요하면 여기서 로드 로직 추가해도 됨.
-
-    for idx, item in enumerate(data, start=1):
-        corp_code = item.get("corp_code")
-        corp_name = item.get("corp_name")
-        year = item.get("year")
-        event = item.get("event") or {}
-        rcept_no = event.get("rcept_no")
-
-        print("=" * 60)
-        print(f"({idx}/{total}) {corp_name} ({corp_code}), year={year}")
-        print(f"  - rcept_no={rcept_no}")
-
-        if not rcept_no:
-            print("  → rcept_no 없음, allocation_tables 비움\n")
-            item["allocation_tables"] = []
-            updated.append(item)
-        else:
-            xml_text = fetch_document_xml(rcept_no)
-            time.sleep(1.0)  # API 부하 방지 
-
-            if xml_text is None:
-                print("  → document.xml 가져오기 실패, allocation_tables 비워둠\n")
+    # 지난번에 끊긴 실행이 있으면 저널에서 이미 처리한 rcept_no 를 복구해서 이어간다
+    # (최종 JSON 은 읽지 않음 → 끝까지 돈 뒤 다시 실행하면 처음부터 새로 파싱)
+    journal = CheckpointJournal(OUTPUT_FILE, key=lambda it: (it.get("event") or {}).get("rcept_no"))
+    already_done_rcept = {
+        (it.get("event") or {}).get("rcept_no"): it for it in journal.load(include_output=False)
+    }
+    if already_done_rcept:
+        print(f"저널에서 이어서 시작: 이미 처리한 rcept_no {len(already_done_rcept)}개\n")
+
+    # document.xml 은 window 만큼 미리 동시에 받아 두고, 입력 순서대로 꺼내 쓴다 (이미 처리한 건 안 받음)
+    rcept_nos = [
+        rno if rno not in already_done_rcept else None
+        for rno in ((item.get("event") or {}).get("rcept_no") for item in data)
+    ]
+
+    with DartSession(api_key=DART_KEY) as dart, journal:
+        documents = dart.map_documents(rcept_nos)
+        for idx, (item, (_, raw)) in enumerate(zip(data, documents), start=1):
+            corp_code = item.get("corp_code")
+            corp_name = item.get("corp_name")
+            year = item.get("year")
+            event = item.get("event") or {}
+            rcept_no = event.get("rcept_no")
+
+            if rcept_no in already_done_rcept:
+                updated.append(already_done_rcept[rcept_no])
+                continue
+
+            print("=" * 60)
+            print(f"({idx}/{total}) {corp_name} ({corp_code}), year={year}")
+            print(f"  - rcept_no={rcept_no}")
+
+            if not rcept_no:
+                print("  → rcept_no 없음, allocation_tables 비움\n")
                 item["allocation_tables"] = []
                 updated.append(item)
             else:
-                try:
-                    allocations = parse_third_party_allocation(xml_text)
-                    print(f"  → 제3자배정 배정대상자 {len(allocations)}명 추출 (합계 행 제거 후)")
-                except Exception as e:
-                    print(f"[WARN] XML 파싱 중 오류 발생: rcept_no={rcept_no}, 이유={e}")
-                    allocations = []
-
-                item["allocation_tables"] = allocations
-                updated.append(item)
-                print()
-
-        # 매 건마다 PARTIAL_FILE로 중간 저장해서, 중간에 끊겨도 여기까지 남도록
-        try:
-            with open(PARTIAL_FILE, "w", encoding="utf-8") as pf:
-                json.dump(updated, pf, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"[WARN] PARTIAL_FILE 저장 실패: {e}")
-
-    # 2) 전체 완료 후 최종 파일로 저장
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(updated, f, ensure_ascii=False, indent=2)
+                xml_text = document_xml_text(raw, rcept_no)
+
+                if xml_text is None:
+                    print("  → document.xml 가져오기 실패, allocation_tables 비워둠\n")
+                    item["allocation_tables"] = []
+                    updated.append(item)
+                else:
+                    try:
+                        allocations = parse_third_party_allocation(xml_text)
+                        print(f"  → 제3자배정 배정대상자 {len(allocations)}명 추출 (합계 행 제거 후)")
+                    except Exception as e:
+                        print(f"[WARN] XML 파싱 중 오류 발생: rcept_no={rcept_no}, 이유={e}")
+                        allocations = []
+
+                    item["allocation_tables"] = allocations
+                    updated.append(item)
+                    print()
+
+                    # 매 건마다 저널에 한 줄 추가해서, 중간에 끊겨도 여기까지 남도록
+                    # (가져오기 실패한 건은 남기지 않음 → 이어서 돌릴 때 다시 시도)
+                    journal.append(item)
+
+    # 2) 전체 완료 후 최종 파일로 저장 (저널은 삭제)
+    journal.compact(updated)
 
     print("\n전체 처리 완료!")
-    print(f"   → 중간 결과(백업): {PARTIAL_FILE}")
     print(f"   → 최종 결과: {OUTPUT_FILE}")
 
 
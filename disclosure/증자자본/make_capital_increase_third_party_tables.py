@@ -1,27 +1,21 @@
 import os
+import sys
 import json
-import time
-import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+# disclosure/dart_client.py 의 공용 OpenDART 클라이언트를 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dart_client import DartSession
+from fetch_document_xml import document_xml_text
+from checkpoint_journal import CheckpointJournal
+
 load_dotenv()
 DART_KEY = os.getenv("OPEN_DART_API_KEY")
 
-DOC_URL = "https://opendart.fss.or.kr/api/document.xml"
 PIIC_INPUT_PATH = "./output/piic_top100_details.json"
 OUTPUT_PATH = "./output/capital_increase_third_party_tables.json"
 
-# results 리스트를 JSON으로 안전하게 저장
-def save_results_safely(results, path: str):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp_path = path + ".tmp"
-
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-
-    os.replace(tmp_path, path)
-
 # 공백, 줄바꿈 제거
 def normalize_text(s: str) -> str:
     if s is None:
@@ -29,28 +23,6 @@ def normalize_text(s: str) -> str:
     return " ".join(str(s).split())
 
 
-# document.xml 원문 문자열로 반환
-def fetch_document_xml(rcept_no: str) -> str | None:
-    params = {
-        "crtfc_key": DART_KEY,
-        "rcept_no": rcept_no,
-    }
-
-    try:
-        resp = requests.get(DOC_URL, params=params, timeout=15)
-        resp.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"[WARN] document.xml 요청 실패: rcept_no={rcept_no}, 이유={e}")
-        return None
-
-    txt = resp.text
-    if "접수번호 오류" in txt or "오류가 발생하였습니다" in txt:
-        print(f"document.xml 응답 내 에러 문구 감지: rcept_no={rcept_no}")
-        return None
-
-    return txt
-
-
 #  테이블 파싱
 KEYWORDS = ["배정대상자", "청약배정대상", "배정 내역", "배정내역", "배정방법", "배정 방식"]
 
@@ -100,48 +72,44 @@ def main():
     with open(PIIC_INPUT_PATH, "r", encoding="utf-8") as f:
         piic_data = json.load(f)
 
-    results = []
-    already_processed_rcept = set()
-
-    if os.path.exists(OUTPUT_PATH):
-        try:
-            with open(OUTPUT_PATH, "r", encoding="utf-8") as f:
-                results = json.load(f)
-            for rec in results:
-                already_processed_rcept.add(rec["rcept_no"])
-            print(f"기존 결과 {len(results)}개 불러옴 (rcept_no {len(already_processed_rcept)}개)")
-        except Exception:
-            print("기존 결과 읽기 실패 ")
-            results = []
-            already_processed_rcept = set()
+    # 최종 JSON + 지난번에 끊긴 저널
+    journal = CheckpointJournal(OUTPUT_PATH, key=lambda rec: rec["event"]["rcept_no"])
+    results = journal.load()
+    already_processed_rcept = {rec["event"]["rcept_no"] for rec in results}
+    if results:
+        print(f"기존 결과 {len(results)}개 불러옴 (rcept_no {len(already_processed_rcept)}개)")
 
     print("\n제3자배정(third_party=True) 이벤트에 대해 document.xml 파싱 시작\n")
 
+    # 처리할 (회사, 이벤트) 를 먼저 모아 두고 document.xml 은 동시에 받는다
+    targets = []
+    queued_rcept = set(already_processed_rcept)
     for corp in piic_data:
-        corp_code = corp.get("corp_code")
-        corp_name = corp.get("corp_name")
-
         for ev in corp.get("events", []):
             if not ev.get("third_party"):
                 continue  # 제3자배정 아닌 건 스킵
 
             rcept_no = ev.get("rcept_no")
-            ic_mthn = ev.get("ic_mthn")
-
-            if not rcept_no:
+            if not rcept_no or rcept_no in queued_rcept:
+                # 이미 저장된(또는 이번에 이미 넣은) 접수번호면 스킵
                 continue
 
-            if rcept_no in already_processed_rcept:
-                # 이미 저장된 접수번호면 스킵
-                continue
+            queued_rcept.add(rcept_no)
+            targets.append((corp, ev))
+
+    with DartSession(api_key=DART_KEY) as dart, journal:
+        documents = dart.map_documents(ev["rcept_no"] for _, ev in targets)
+        for (corp, ev), (rcept_no, raw) in zip(targets, documents):
+            corp_code = corp.get("corp_code")
+            corp_name = corp.get("corp_name")
+            ic_mthn = ev.get("ic_mthn")
 
             print(f"{corp_name} ({corp_code}), rcept_no={rcept_no}, 방법={ic_mthn}")
 
             # 1. document.xml 가져오기
-            xml_text = fetch_document_xml(rcept_no)
+            xml_text = document_xml_text(raw, rcept_no)
             if not xml_text:
                 print(f"document.xml 없음 / 에러로 스킵")
-                time.sleep(0.3)
                 continue
 
             # 2. 배정대상자 관련 테이블 파싱
@@ -165,13 +133,10 @@ def main():
                 "allocation_tables": tables,
             }
 
-            results.append(result_rec)
+            journal.append(result_rec)
             already_processed_rcept.add(rcept_no)
 
-            save_results_safely(results, OUTPUT_PATH)
-
-            # DART 호출 너무 빠르게 안 하도록 딜레이
-            time.sleep(0.5)
+    journal.compact()
 
     print(f"\n끝 - 총 {len(results)}개 제3자배정 이벤트에 대한 document.xml 테이블이 {OUTPUT_PATH}에 저장되었습니다.\n")
 
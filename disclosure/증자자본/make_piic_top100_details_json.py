@@ -1,58 +1,32 @@
 import json
-import time
 import os
-import requests
+import sys
 from dotenv import load_dotenv
 
+# disclosure/dart_client.py 의 공용 OpenDART 클라이언트를 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dart_client import DartError, DartSession
+from checkpoint_journal import CheckpointJournal
+
 load_dotenv()
 DART_KEY = os.getenv("OPEN_DART_API_KEY")
-PIIC_URL = "https://opendart.fss.or.kr/api/piicDecsn.json"
+PIIC_ENDPOINT = "piicDecsn.json"
 OUTPUT_PATH = "./output/piic_top100_details.json"
 
-# 중간에 끊기거나 에러가 나도 정상적으로 저장
-def save_results_safely(results, path: str):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp_path = path + ".tmp"
-
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-
-    os.replace(tmp_path, path)
-
-# 유상증자 결정 API 호출 
-def fetch_piic_list(corp_code: str, bgn_de: str, end_de: str):
-    params = {
-        "crtfc_key": DART_KEY,
+# 유상증자 결정 API 요청 파라미터 (연도 단위)
+def piic_params(corp_code: str, year: int):
+    return {
         "corp_code": corp_code,
-        "bgn_de": bgn_de,
-        "end_de": end_de,
+        "bgn_de": f"{year}0101",
+        "end_de": f"{year}1231",
     }
 
-    try:
-        r = requests.get(PIIC_URL, params=params, timeout=10)
-    except requests.exceptions.RequestException as e:
-        print("error")
-        return []
-
-    try:
-        data = r.json()
-    except Exception:
-        print(f"JSON 파싱 실패: corp={corp_code}, 기간={bgn_de}~{end_de}")
-        return []
-
-    status = data.get("status")
-    msg = data.get("message")
-
-    if status == "000":
-        return data.get("list", [])
-
-    elif status == "013":
-        # 조회건수 0 →
-        return []
-
-    else:
-        print(f"piicDecsn error {status}: {msg}")
+# 유상증자 결정 API 응답 → 행 리스트 (013 조회건수 0 은 빈 리스트)
+def piic_rows(resp, corp_code: str, year: int):
+    if isinstance(resp, DartError):
+        print(f"piicDecsn error: corp={corp_code}, year={year}, {resp}")
         return []
+    return resp.list
 
 # dart piicDecsn list를 우리가 쓰기 좋은 형태로 정규화
 def normalize_piic_events(piic_list):
@@ -79,15 +53,11 @@ def normalize_piic_events(piic_list):
 
 
 def main():
-    results = []
-    if os.path.exists(OUTPUT_PATH):
-        try:
-            with open(OUTPUT_PATH, "r", encoding="utf-8") as f:
-                results = json.load(f)
-            print(f"기존 결과 {len(results)}개 불러옴: {OUTPUT_PATH}")
-        except Exception:
-            print("기존 파일 읽기 실패")
-            results = []
+    # 최종 JSON + 지난번에 끊긴 저널
+    journal = CheckpointJournal(OUTPUT_PATH, key=lambda r: (r["corp_code"], r["year"]))
+    results = journal.load()
+    if results:
+        print(f"기존 결과 {len(results)}개 불러옴: {OUTPUT_PATH}")
 
     already_done = {(r["corp_code"], r["year"]) for r in results}
 
@@ -98,26 +68,24 @@ def main():
 
     print(f"총 {len(target_list)}개 기업 처리 시작\n")
 
-    for comp in target_list:
-        corp_name = comp.get("name")
-        corp_code = comp.get("corp_code")
-
-        if not corp_code:
-            continue
-
-        found_any_for_corp = False
-
-        # 2019년부터 2025년까지 유상증자 결정 데이터 조회
-        for year in range(2019, 2025 + 1):
-            if (corp_code, year) in already_done:
-                continue
-
-            bgn_de = f"{year}0101"
-            end_de = f"{year}1231"
-
-            piic_list = fetch_piic_list(corp_code, bgn_de, end_de)
+    # 2019년부터 2025년까지 유상증자 결정 데이터 조회 (아직 안 한 (회사, 연도) 만 한꺼번에)
+    jobs = [
+        (comp, year)
+        for comp in target_list
+        if comp.get("corp_code")
+        for year in range(2019, 2025 + 1)
+        if (comp["corp_code"], year) not in already_done
+    ]
+    params_list = (piic_params(comp["corp_code"], year) for comp, year in jobs)
+
+    printed_corp = None
+    with DartSession(api_key=DART_KEY) as dart, journal:
+        for (comp, year), (_, resp) in zip(jobs, dart.map_json(PIIC_ENDPOINT, params_list)):
+            corp_name = comp.get("name")
+            corp_code = comp.get("corp_code")
+
+            piic_list = piic_rows(resp, corp_code, year)
             if not piic_list:
-                time.sleep(0.2)
                 continue
 
             events = normalize_piic_events(piic_list)
@@ -125,9 +93,9 @@ def main():
             third_cnt = sum(1 for e in events if e["third_party"])
 
             if total_cnt >= 1:
-                if not found_any_for_corp:
+                if printed_corp != corp_code:
                     print(f"{corp_name} ({corp_code})")
-                    found_any_for_corp = True
+                    printed_corp = corp_code
 
                 print(f"- {year}: 전체 {total_cnt}건 (제3자배정 {third_cnt}건)")
 
@@ -139,12 +107,10 @@ def main():
                     "third_party_count": third_cnt,
                     "events": events,
                 }
-                results.append(record)
+                journal.append(record)
                 already_done.add((corp_code, year))
 
-                save_results_safely(results, OUTPUT_PATH)
-
-            time.sleep(0.2)
+    journal.compact()
 
     print(f"완료! 총 {len(results)}개 (corp_code, year) 결과가 {OUTPUT_PATH}에 저장되었습니다.\n")
 
@@ -4,26 +4,39 @@
 - 입력:
   - company_list_market.json (상장사 목록)
 - 처리:
-  1) piicDecsn(유상증자결정) 연도별 조회
+  0) 공시검색(list.json, 주요사항보고서)으로 기간 내 유상증자결정 공시를 낸 회사/연도만 골라냄
+  1) 그 회사/연도만 piicDecsn(유상증자결정) 조회
   2) "제3자배정" 이벤트만 필터링
   3) document.xml(zip/xml) 다운로드
   4) ACLASS="THD_ASN_LST" 배정대상자 테이블 파싱 → allocation_tables 생성
 - 출력:
   - ./output/capital_increase_third_party_full.json
     (각 이벤트별 배정대상자 테이블이 채워진 원천 데이터)
+  - ./output/capital_increase_third_party_full.json.journal.jsonl
+    (진행 중 체크포인트. 끝나면 위 JSON 으로 합치고 삭제, 중간에 끊기면 다음 실행이 이어서 씀)
+  - ./output/capital_increase_third_party_scan_state.json (마지막으로 공시검색한 날짜)
+
+- 실행:
+  python scan_all_listed_third_party_allocation.py           # YEARS 전체 기간 (공시검색 → piicDecsn)
+  python scan_all_listed_third_party_allocation.py --daily   # 지난 실행 이후 새 공시만
+  python scan_all_listed_third_party_allocation.py --poll    # 예전 방식: 전 상장사 × 전 연도 piicDecsn
 """
 
 import os
-import io
+import sys
 import json
-import time
-import zipfile
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 
-import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+# disclosure/dart_client.py 의 공용 OpenDART 클라이언트를 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dart_client import DartError, DartSession
+from fetch_document_xml import document_xml_text
+from checkpoint_journal import CheckpointJournal
+
 # ==========================
 #  환경변수 & 상수 설정
 # ==========================
@@ -33,25 +46,20 @@ DART_KEY = os.getenv("OPEN_DART_API_KEY")
 if not DART_KEY:
     raise RuntimeError("OPEN_DART_API_KEY 가 .env 에 설정되어 있지 않습니다.")
 
-PIIC_URL = "https://opendart.fss.or.kr/api/piicDecsn.json"
-DOC_URL = "https://opendart.fss.or.kr/api/document.xml"
+PIIC_ENDPOINT = "piicDecsn.json"
+LIST_ENDPOINT = "list.json"
 
 COMPANY_FILE = "company_list_market.json"
 OUTPUT_PATH = "./output/capital_increase_third_party_full.json"
+STATE_PATH = "./output/capital_increase_third_party_scan_state.json"
 # 연도설정
 YEARS = list(range(2022, 2025 + 1))
-API_SLEEP_SEC = 0.25
-
-
-# results 리스트를 JSON으로 안전하게 저장
-def save_results_safely(results: List[Dict[str, Any]], path: str) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp_path = path + ".tmp"
 
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-
-    os.replace(tmp_path, path)
+# 공시검색(list.json) 은 corp_code 없이 부르면 기간이 3개월로 제한된다
+DISCOVERY_WINDOW_DAYS = 90
+LIST_PAGE_COUNT = 100
+# --daily 인데 지난 실행 기록이 없으면 며칠 전부터 볼지
+DAILY_LOOKBACK_DAYS = 7
 
 
 def normalize_text(s: Optional[str]) -> str:
@@ -61,43 +69,146 @@ def normalize_text(s: Optional[str]) -> str:
     return " ".join(str(s).split())
 
 
-# piicDecsn 조회
-def fetch_piic_list(corp_code: str, bgn_de: str, end_de: str) -> List[Dict[str, Any]]:
-    params = {
-        "crtfc_key": DART_KEY,
+# piicDecsn 요청 파라미터 (기본은 연도 단위, --daily 는 그 해 안의 새 구간만)
+def piic_params(corp_code: str, bgn_de: str, end_de: str) -> Dict[str, Any]:
+    return {
         "corp_code": corp_code,
         "bgn_de": bgn_de,
         "end_de": end_de,
     }
 
-    try:
-        r = requests.get(PIIC_URL, params=params, timeout=10)
-    except requests.exceptions.RequestException as e:
-        print(f"piicDecsn 요청 실패: corp={corp_code}, 기간={bgn_de}~{end_de}")
-        print(f"       이유: {e}")
-        return []
-
-    try:
-        data = r.json()
-    except Exception:
-        print(f"JSON 파싱 실패: corp={corp_code}, 기간={bgn_de}~{end_de}")
-        print("       raw text (앞 200자):", r.text[:200])
-        return []
-
-    status = data.get("status")
-    msg = data.get("message")
 
-    if status == "000":
-        return data.get("list", []) or []
+def iter_windows(bgn: date, end: date):
+    """[bgn, end] 을 연도 경계와 DISCOVERY_WINDOW_DAYS 단위로 자른 (시작일, 종료일)"""
+    cur = bgn
+    while cur <= end:
+        stop = min(end, cur + timedelta(days=DISCOVERY_WINDOW_DAYS - 1), date(cur.year, 12, 31))
+        yield cur, stop
+        cur = stop + timedelta(days=1)
+
+
+# 공시검색 요청 파라미터 (주요사항보고서만, 접수일 오름차순 → 새 공시는 뒤 페이지에 붙는다)
+def list_params(bgn: date, end: date, page_no: int) -> Dict[str, Any]:
+    return {
+        "bgn_de": f"{bgn:%Y%m%d}",
+        "end_de": f"{end:%Y%m%d}",
+        "pblntf_ty": "B",
+        "pblntf_detail_ty": "B001",
+        "sort": "date",
+        "sort_mth": "asc",
+        "page_no": page_no,
+        "page_count": LIST_PAGE_COUNT,
+    }
 
-    elif status == "013":
-        # 조회건수 0 → 정상적으로 "없는 것"
-        return []
 
-    else:
-        print(f"[ERROR] piicDecsn error {status}: {msg}")
-        print("URL:", r.url)
+def is_piic_filing(row: Dict[str, Any]) -> bool:
+    """본인 회사의 주요사항보고서(유상증자결정) ([기재정정] 등 포함, 자회사 주요경영사항은 제외)"""
+    report_nm = row.get("report_nm") or ""
+    return "유상증자결정" in report_nm and "자회사" not in report_nm
+
+
+def discover_piic_filers(dart: DartSession, bgn: date, end: date) -> Dict[str, Dict[int, Tuple[str, str]]]:
+    """
+    공시검색으로 [bgn, end] 에 유상증자결정 공시를 낸 회사를 찾는다.
+    → {corp_code: {연도: (piicDecsn bgn_de, end_de)}}  (기간은 그 연도와 [bgn, end] 의 겹치는 부분)
+    한 구간이라도 검색에 실패하면 빠뜨린 공시가 생기므로 예외를 그대로 올린다.
+    """
+    windows = list(iter_windows(bgn, end))
+    rows: List[Dict[str, Any]] = []
+    more_pages: List[Tuple[date, date, int]] = []
+
+    first_pages = dart.map_json(LIST_ENDPOINT, (list_params(w_bgn, w_end, 1) for w_bgn, w_end in windows))
+    for (w_bgn, w_end), (_, resp) in zip(windows, first_pages):
+        if isinstance(resp, DartError):
+            raise resp
+        rows.extend(resp.list)
+        total_page = int(resp.data.get("total_page") or 1)
+        more_pages.extend((w_bgn, w_end, page_no) for page_no in range(2, total_page + 1))
+
+    for _, resp in dart.map_json(LIST_ENDPOINT, (list_params(*page) for page in more_pages)):
+        if isinstance(resp, DartError):
+            raise resp
+        rows.extend(resp.list)
+
+    filers: Dict[str, Dict[int, Tuple[str, str]]] = {}
+    piic_cnt = 0
+    for row in rows:
+        if not is_piic_filing(row) or not row.get("corp_code"):
+            continue
+        piic_cnt += 1
+        year = int(row["rcept_dt"][:4])
+        y_bgn = max(bgn, date(year, 1, 1))
+        y_end = min(end, date(year, 12, 31))
+        filers.setdefault(row["corp_code"], {})[year] = (f"{y_bgn:%Y%m%d}", f"{y_end:%Y%m%d}")
+
+    print(
+        f"공시검색 {bgn:%Y-%m-%d}~{end:%Y-%m-%d}: 주요사항보고서 {len(rows)}건 "
+        f"→ 유상증자결정 {piic_cnt}건, 회사 {len(filers)}개 "
+        f"(list.json {len(windows) + len(more_pages)}번 호출)"
+    )
+    return filers
+
+
+def load_scan_state() -> Dict[str, Any]:
+    if not os.path.exists(STATE_PATH):
+        return {}
+    with open(STATE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_scan_state(last_discovered_de: date) -> None:
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    with open(STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"last_discovered_de": f"{last_discovered_de:%Y%m%d}"}, f, ensure_ascii=False, indent=2)
+
+
+def discovery_range(mode: str, today: date) -> Tuple[date, date]:
+    """공시검색 기간. --daily 는 지난번 검색 마지막 날부터 (그날 늦게 올라온 공시까지 다시 보려고 하루 겹침)"""
+    if mode == "daily":
+        last_de = load_scan_state().get("last_discovered_de")
+        if last_de:
+            bgn = datetime.strptime(last_de, "%Y%m%d").date()
+        else:
+            bgn = today - timedelta(days=DAILY_LOOKBACK_DAYS)
+        return bgn, today
+    return date(min(YEARS), 1, 1), min(date(max(YEARS), 12, 31), today)
+
+
+def build_piic_jobs(
+    dart: DartSession, companies: List[Dict[str, Any]], mode: str
+) -> Tuple[List[Tuple[int, Dict[str, Any], int, str, str]], Optional[date]]:
+    """
+    piicDecsn 을 부를 (회사 번호, 회사, 연도, bgn_de, end_de) 목록과, 끝나면 기록할 공시검색 마지막 날
+    - poll: 전 상장사 × YEARS (공시검색 안 함)
+    - 그 밖: 공시검색에 걸린 회사/연도만
+    """
+    targets = [(idx_c, comp) for idx_c, comp in enumerate(companies, start=1) if comp.get("corp_code")]
+
+    if mode == "poll":
+        jobs = [
+            (idx_c, comp, year, f"{year}0101", f"{year}1231")
+            for idx_c, comp in targets
+            for year in YEARS
+        ]
+        return jobs, None
+
+    bgn, end = discovery_range(mode, date.today())
+    filers = discover_piic_filers(dart, bgn, end)
+    jobs = [
+        (idx_c, comp, year, bgn_de, end_de)
+        for idx_c, comp in targets
+        for year, (bgn_de, end_de) in sorted(filers.get(comp["corp_code"], {}).items())
+    ]
+    print(f"piicDecsn 호출 {len(jobs)}번 (전 상장사 폴링이면 {len(targets) * len(YEARS)}번)")
+    return jobs, end
+
+
+# piicDecsn 응답 → 행 리스트 (013 조회건수 0 은 정상적으로 "없는 것")
+def piic_rows(resp: Any, corp_code: str, year: int) -> List[Dict[str, Any]]:
+    if isinstance(resp, DartError):
+        print(f"[ERROR] piicDecsn 실패: corp={corp_code}, year={year}, {resp}")
         return []
+    return resp.list
 
 
 def normalize_piic_events(piic_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -125,55 +236,6 @@ def normalize_piic_events(piic_list: List[Dict[str, Any]]) -> List[Dict[str, Any
     return events
 
 
-# document.xml 가져오기
-def fetch_document_xml(rcept_no: str) -> Optional[str]:
-    params = {
-        "crtfc_key": DART_KEY,
-        "rcept_no": rcept_no,
-    }
-
-    try:
-        resp = requests.get(DOC_URL, params=params, timeout=20)
-        resp.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"[WARN] document.xml 요청 실패: rcept_no={rcept_no}, 이유={e}")
-        return None
-
-    raw = resp.content
-
-    try:
-        with zipfile.ZipFile(io.BytesIO(raw)) as z:
-            names = z.namelist()
-            xml_candidates = [n for n in names if n.lower().endswith(".xml")]
-            if not xml_candidates:
-                print(f"[WARN] ZIP 안에 xml 파일 없음: rcept_no={rcept_no}, files={names}")
-                return None
-
-            xml_name = xml_candidates[0]
-            xml_bytes = z.read(xml_name)
-
-        try:
-            xml_text = xml_bytes.decode("euc-kr")
-        except UnicodeDecodeError:
-            xml_text = xml_bytes.decode("utf-8", errors="ignore")
-
-        return xml_text
-
-    except zipfile.BadZipFile:
-        pass
-
-    try:
-        txt = raw.decode("euc-kr")
-    except UnicodeDecodeError:
-        txt = raw.decode("utf-8", errors="ignore")
-
-    if "오류가 발생하였습니다" in txt or "접수번호 오류" in txt:
-        print(f"document.xml 응답 내 에러 문구 감지: rcept_no={rcept_no}")
-        return None
-
-    return txt
-
-
 # 제3자배정 배정대상자 테이블 파싱
 def parse_third_party_allocation(xml_text: str) -> List[Dict[str, Any]]:
 
@@ -219,23 +281,14 @@ def parse_third_party_allocation(xml_text: str) -> List[Dict[str, Any]]:
 
 # 메인 파이프라인
 def main():
-    # 기존 결과 로드
-    results: List[Dict[str, Any]] = []
-    already_done_rcept: set[str] = set()
-
-    if os.path.exists(OUTPUT_PATH):
-        try:
-            with open(OUTPUT_PATH, "r", encoding="utf-8") as f:
-                results = json.load(f)
-            for rec in results:
-                rno = rec.get("event", {}).get("rcept_no")
-                if rno:
-                    already_done_rcept.add(rno)
-            print(f"기존 결과 {len(results)}개 불러옴 (이미 처리한 rcept_no {len(already_done_rcept)}개)")
-        except Exception:
-            print("기존 결과 읽기 실패 → 새로 시작합니다.")
-            results = []
-            already_done_rcept = set()
+    # 기존 결과 로드 (최종 JSON + 지난번에 끊긴 저널)
+    journal = CheckpointJournal(OUTPUT_PATH, key=lambda rec: rec.get("event", {}).get("rcept_no"))
+    results = journal.load()
+    already_done_rcept: set[str] = {
+        rec.get("event", {}).get("rcept_no") for rec in results if rec.get("event", {}).get("rcept_no")
+    }
+    if results:
+        print(f"기존 결과 {len(results)}개 불러옴 (이미 처리한 rcept_no {len(already_done_rcept)}개)")
 
     # 회사 리스트 로드
     with open(COMPANY_FILE, "r", encoding="utf-8") as f:
@@ -244,28 +297,31 @@ def main():
     total_corps = len(companies)
     print(f"\n상장사 총 {total_corps}개 대상 (company_list_market.json 기준)\n")
 
-    # 메인 루프
-    for idx_c, comp in enumerate(companies, start=1):
-        corp_name = comp.get("name")
-        corp_code = comp.get("corp_code")
-
-        if not corp_code:
-            continue
-
-        print("\n" + "=" * 70)
-        print(f"({idx_c}/{total_corps}) {corp_name} ({corp_code})")
-        print("=" * 70)
-
-        found_any_for_corp = False
-
-        # 연도별로 piicDecsn 조회
-        for year in YEARS:
-            bgn_de = f"{year}0101"
-            end_de = f"{year}1231"
-
-            piic_list = fetch_piic_list(corp_code, bgn_de, end_de)
-            time.sleep(API_SLEEP_SEC)
-
+    args = sys.argv[1:]
+    mode = "poll" if "--poll" in args else "daily" if "--daily" in args else "discover"
+
+    with DartSession(api_key=DART_KEY) as dart, journal:
+        jobs, discovered_until = build_piic_jobs(dart, companies, mode)
+
+        # (회사, 연도) piicDecsn 조회를 한꺼번에 흘려 보내고 결과는 순서대로 받는다
+        params_list = (piic_params(comp["corp_code"], bgn_de, end_de) for _, comp, _, bgn_de, end_de in jobs)
+        responses = dart.map_json(PIIC_ENDPOINT, params_list)
+        current_corp = None
+        found_any_for_corp = True
+        for (idx_c, comp, year, _, _), (_, resp) in zip(jobs, responses):
+            corp_name = comp.get("name")
+            corp_code = comp.get("corp_code")
+
+            if corp_code != current_corp:
+                if not found_any_for_corp:
+                    print("→ 이 회사에서는 제3자배정 건이 발견되지 않았습니다.")
+                print("\n" + "=" * 70)
+                print(f"({idx_c}/{total_corps}) {corp_name} ({corp_code})")
+                print("=" * 70)
+                current_corp = corp_code
+                found_any_for_corp = False
+
+            piic_list = piic_rows(resp, corp_code, year)
             if not piic_list:
                 continue
 
@@ -284,18 +340,16 @@ def main():
 
             found_any_for_corp = True
 
-            # 제3자배정 이벤트별로 document.xml 파싱
-            for ev in third_events:
-                rcept_no = ev.get("rcept_no")
-                if not rcept_no:
-                    continue
-
-                if rcept_no in already_done_rcept:
-                    continue
+            # 제3자배정 이벤트별로 document.xml 파싱 (새 rcept_no 만 동시에 받아 둔다)
+            new_events = [
+                ev for ev in third_events
+                if ev.get("rcept_no") and ev.get("rcept_no") not in already_done_rcept
+            ]
+            documents = dart.map_documents(ev["rcept_no"] for ev in new_events)
 
+            for ev, (rcept_no, raw) in zip(new_events, documents):
                 print(f"rcept_no={rcept_no}, 방법={ev.get('ic_mthn')}")
-                xml_text = fetch_document_xml(rcept_no)
-                time.sleep(API_SLEEP_SEC)
+                xml_text = document_xml_text(raw, rcept_no)
 
                 if not xml_text:
                     print("→ document.xml 없음 / 에러로 스킵")
@@ -317,15 +371,19 @@ def main():
                     "allocation_tables": allocation_tables,
                 }
 
-                results.append(record)
+                # 중간 저장 (저널에 한 줄 추가, results 에도 같이 붙음)
+                journal.append(record)
                 already_done_rcept.add(rcept_no)
 
-                # 중간 저장
-                save_results_safely(results, OUTPUT_PATH)
-
         if not found_any_for_corp:
             print("→ 이 회사에서는 제3자배정 건이 발견되지 않았습니다.")
 
+    journal.compact()
+
+    # 끝까지 돈 경우에만 기록 (중간에 죽으면 다음 --daily 가 같은 구간을 다시 본다)
+    if discovered_until is not None:
+        save_scan_state(discovered_until)
+
     print(f"\n전체 완료! 제3자배정 이벤트 {len(results)}건이 {OUTPUT_PATH} 에 저장되었습니다.\n")
 
 
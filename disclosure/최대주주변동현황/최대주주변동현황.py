@@ -1,11 +1,14 @@
 import os
+import sys
 import json
-import time
-import requests
 from tqdm import tqdm
 from datetime import datetime
 from dotenv import load_dotenv
 
+# disclosure/dart_client.py 의 공용 OpenDART 클라이언트를 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dart_client import DartError, DartSession
+
 load_dotenv()
 DART_KEY = os.getenv("OPEN_DART_API_KEY")
 
@@ -28,22 +31,14 @@ CURRENT_YEAR = datetime.now().year  # 2025
 YEARS = [CURRENT_YEAR - 1, CURRENT_YEAR - 2, CURRENT_YEAR - 3]  # 2024, 2023, 2022
 
 
-def call_hyslr_change(corp_code: str, year: int):
-    """최대주주변동현황 API 호출"""
-    url = "https://opendart.fss.or.kr/api/hyslrChgSttus.json"
-    params = {
-        "crtfc_key": DART_KEY,
+def hyslr_change_params(corp_code: str, year: int) -> dict:
+    """최대주주변동현황 API (hyslrChgSttus.json) 요청 파라미터"""
+    return {
         "corp_code": corp_code,
         "bsns_year": str(year),
         "reprt_code": "11011",  
     }
 
-    try:
-        resp = requests.get(url, params=params, timeout=10)
-        return resp.json()
-    except Exception:
-        return {"status": "error", "message": "connection or parse error"}
-
 
 # -------------------------
 # 유틸 함수들
@@ -165,17 +160,23 @@ def main():
 
     os.makedirs("./output", exist_ok=True)
 
-    for comp in tqdm(target_companies):
-        corp_code = comp["corp_code"]
-        corp_name = comp["name"]
+    jobs = [(comp, year) for comp in target_companies for year in YEARS]
+    params_list = (hyslr_change_params(comp["corp_code"], year) for comp, year in jobs)
 
-        for year in YEARS:
-            resp = call_hyslr_change(corp_code, year)
+    with DartSession(api_key=DART_KEY) as dart:
+        responses = dart.map_json("hyslrChgSttus.json", params_list)
+        for (comp, year), (_, resp) in tqdm(zip(jobs, responses), total=len(jobs)):
+            corp_code = comp["corp_code"]
+            corp_name = comp["name"]
 
-            if resp.get("status") != "000" or "list" not in resp:
+            if isinstance(resp, DartError):
+                print(f"[ERROR] {corp_name}({corp_code}) {year}년 조회 실패: {resp}")
                 continue
 
-            rows = resp["list"]
+            if not resp.ok or not resp.list:
+                continue
+
+            rows = resp.list
             valid_rows = [r for r in rows if has_valid_change_row(r)]
             if not valid_rows:
                 continue
@@ -190,8 +191,6 @@ def main():
             for idx, row in enumerate(valid_rows, start=1):
                 edges.append(build_change_edge(comp, row, year, idx))
 
-            time.sleep(0.1)
-
     
     with open(RAW_OUTPUT_FILE, "w", encoding="utf-8") as f:
         json.dump({"items": raw_results}, f, ensure_ascii=False, indent=2)
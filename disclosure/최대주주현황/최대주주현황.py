@@ -1,10 +1,13 @@
 import os
+import sys
 import json
-import time
-import requests
 from tqdm import tqdm
 from dotenv import load_dotenv
 
+# disclosure/dart_client.py 의 공용 OpenDART 클라이언트를 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dart_client import DartError, DartSession
+
 load_dotenv()
 DART_KEY = os.getenv("OPEN_DART_API_KEY")
 
@@ -17,22 +20,15 @@ YEARS = [2025]
 # -----------------------------
 # 공통 유틸
 # -----------------------------
-def call_hyslr_status(corp_code: str, year: int):
+def hyslr_status_params(corp_code: str, year: int) -> dict:
     """
-    최대주주현황 API 호출 (/api/hyslrSttus.json)
+    최대주주현황 API (/api/hyslrSttus.json) 요청 파라미터
     """
-    url = "https://opendart.fss.or.kr/api/hyslrSttus.json"
-    params = {
-        "crtfc_key": DART_KEY,
+    return {
         "corp_code": corp_code,
         "bsns_year": str(year),
         "reprt_code": "11011",  
     }
-    resp = requests.get(url, params=params, timeout=10)
-    try:
-        return resp.json()
-    except Exception:
-        return {"status": "error", "message": "json parse error"}
 
 
 def to_float(val):
@@ -237,19 +233,24 @@ def main():
     os.makedirs("./output", exist_ok=True)
 
 
-    for comp in tqdm(companies):
-        corp_code = comp["corp_code"]
-        corp_name = comp["name"]
+    # (회사, 연도) 조합을 한꺼번에 흘려 보내고, 결과는 순서대로 받아 처리
+    jobs = [(comp, year) for comp in companies for year in YEARS]
+    params_list = (hyslr_status_params(comp["corp_code"], year) for comp, year in jobs)
+
+    with DartSession(api_key=DART_KEY) as dart:
+        responses = dart.map_json("hyslrSttus.json", params_list)
+        for (comp, year), (_, resp) in tqdm(zip(jobs, responses), total=len(jobs)):
+            corp_code = comp["corp_code"]
+            corp_name = comp["name"]
 
-        for year in YEARS:
             try:
-                resp = call_hyslr_status(corp_code, year)
+                if isinstance(resp, DartError):
+                    raise resp
 
-    
-                if resp.get("status") != "000" or "list" not in resp:
+                if not resp.ok or not resp.list:
                     continue
 
-                rows = resp["list"]
+                rows = resp.list
                 valid_rows = [r for r in rows if has_valid_hyslr_row(r)]
 
                 if not valid_rows:
@@ -269,8 +270,6 @@ def main():
                     edge = build_hyslr_edge(comp, row, year, idx)
                     edges.append(edge)
 
-                time.sleep(0.1)
-
             except Exception as e:
                 print(f"[ERROR] {corp_name}({corp_code}) {year}년 처리 중 오류: {e}")
                 continue
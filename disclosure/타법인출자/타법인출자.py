@@ -1,34 +1,37 @@
 import os
+import sys
 import json
-import time
-import requests
 from tqdm import tqdm
 from dotenv import load_dotenv
 
+# company/company_match.py 의 n-gram 퍼지 조회 / company_store.py 의 기업 저장소를 같이 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "company"))
+from company_match import NgramIndex
+from company_store import open_company_store
+
+# disclosure/dart_client.py 의 공용 OpenDART 클라이언트를 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dart_client import DartError, DartSession
+
 load_dotenv()
 DART_KEY = os.getenv("OPEN_DART_API_KEY")
 
-INPUT_CORP_FILE = "../company/corp_merged.json"
 RAW_OUTPUT_FILE = "./output/otr_invest_raw.json"
 EDGE_OUTPUT_FILE = "./output/otr_invest_edges.json"
 
 # 조회 연도
 YEARS = [2023, 2024, 2025]
 
-def call_dart_invest_api(corp_code: str, year: int):
-    """DART 타법인출자 API 호출"""
-    url = "https://opendart.fss.or.kr/api/otrCprInvstmntSttus.json"
-    params = {
-        "crtfc_key": DART_KEY,
+# 이름이 정확히 같지 않을 때 퍼지 매칭으로 인정할 최소 유사도 (비상장 피투자사가 많아서 높게)
+FUZZY_MATCH_MIN_SCORE = 0.85
+
+def dart_invest_params(corp_code: str, year: int) -> dict:
+    """DART 타법인출자 API (otrCprInvstmntSttus.json) 요청 파라미터"""
+    return {
         "corp_code": corp_code,
         "bsns_year": str(year),
         "reprt_code": "11011",  # 사업보고서
     }
-    resp = requests.get(url, params=params, timeout=10)
-    try:
-        return resp.json()
-    except Exception:
-        return {"status": "error", "message": "json parse error"}
 
 
 def has_valid_data(item: dict) -> bool:
@@ -172,15 +175,16 @@ def main():
     if not DART_KEY:
         raise RuntimeError("OPEN_DART_API_KEY 가 없음.")
 
-    with open(INPUT_CORP_FILE, "r", encoding="utf-8") as f:
-        companies = json.load(f)
+    # 투자사 목록(corp_merged) 과 피투자사 이름 → corp_code 조회는 기업 저장소에서
+    store = open_company_store()
+    companies = list(store.iter_companies(source="KR"))
 
-    # json 기업 이름 매칭
-    corp_name_to_code: dict[str, str] = {}
+    # 저장소 이름 인덱스에 없을 때("삼성 전자 홀딩스", 오타 등) 쓰는 n-gram 역색인
+    corp_name_index = NgramIndex()
     for c in companies:
         name_clean = clean_name_for_match(c["name"])
         if name_clean:
-            corp_name_to_code[name_clean] = c["corp_code"]
+            corp_name_index.add(c["corp_code"], name_clean)
 
     raw_results = []  # 원본 구조를 모으는 리스트
     edges = []        # 그래프 edge 리스트
@@ -189,20 +193,25 @@ def main():
 
     print("\n전체 기업에 대해 2023~2025 타법인출자 관계 수집\n")
 
-    for comp in tqdm(companies):
-        investor_code = comp["corp_code"]
-        investor_name = comp["name"]
+    # (회사, 연도) 조합을 한꺼번에 흘려 보내고, 결과는 순서대로 받아 처리
+    jobs = [(comp, year) for comp in companies for year in YEARS]
+    params_list = (dart_invest_params(comp["corp_code"], year) for comp, year in jobs)
+
+    with DartSession(api_key=DART_KEY) as dart:
+        responses = dart.map_json("otrCprInvstmntSttus.json", params_list)
+        for (comp, year), (_, resp) in tqdm(zip(jobs, responses), total=len(jobs)):
+            investor_code = comp["corp_code"]
+            investor_name = comp["name"]
 
-        for year in YEARS:
             try:
-                # DART API 호출
-                resp = call_dart_invest_api(investor_code, year)
+                if isinstance(resp, DartError):
+                    raise resp
 
-                if resp.get("status") != "000" or "list" not in resp:
-                    # 에러 또는 데이터 없음
+                if not resp.ok or not resp.list:
+                    # 데이터 없음
                     continue
 
-                rows = resp["list"]
+                rows = resp.list
                 valid_rows = [r for r in rows if has_valid_data(r)]
 
                 if not valid_rows:
@@ -219,29 +228,38 @@ def main():
                     }
                 )
 
-                
+                # 이번 응답의 피투자사 이름을 한 번에 조회
+                investee_codes = store.corp_codes_by_names(
+                    clean_name_for_match(row.get("inv_prm", "")) for row in valid_rows
+                )
+
                 for idx, row in enumerate(valid_rows, start=1):
                     raw_investee_name = row.get("inv_prm", "")
                     investee_clean = clean_name_for_match(raw_investee_name)
-                    investee_code = corp_name_to_code.get(investee_clean)
+                    investee_code = investee_codes.get(investee_clean)
+                    investee_name = investee_clean
+
+                    if investee_code is None and investee_clean:
+                        hits = corp_name_index.search(investee_clean, k=1, min_score=FUZZY_MATCH_MIN_SCORE)
+                        if hits:
+                            investee_code, _, investee_name = hits[0]
 
                     edge = build_edge(
                         investor=comp,
                         investee_code=investee_code,
-                        investee_name_resolved=investee_clean if investee_clean else None,
+                        investee_name_resolved=investee_name if investee_name else None,
                         row=row,
                         year=year,
                         index=idx,
                     )
                     edges.append(edge)
 
-                # 과도한 호출 방지용 딜레이 
-                time.sleep(0.1)
-
             except Exception as e:
                 print(f"ERROR: {investor_name}({investor_code}) {year}년 처리 중 오류 → {e}")
                 continue
 
+    store.close()
+
     # -------------------------------
     # 결과 저장
     with open(RAW_OUTPUT_FILE, "w", encoding="utf-8") as f:
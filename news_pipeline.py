@@ -1,10 +1,20 @@
 import asyncio
-from typing import Any, Dict
+import copy
+import hashlib
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
 import json
+import os
 import sys
-import re
+import time
 from pathlib import Path
 from context import FakeContext 
+from agents.base import MODEL_ID
+from agents.cache import AgentResponseCache
+from agents.decoding import decode_agent_text, decode_agent_value, event_text
+from agents.tracing import Span, annotate, traced
+from agents.resilience import AgentOutputError, call_with_retries
+from utils.near_duplicate import SimHashIndex, simhash
 
 # --- ADK Agent Imports ---
 from agents.news_type_classifier.agent import (
@@ -14,13 +24,75 @@ from agents.news_type_classifier.agent import (
 from agents.entity_extractor.agent import (
     entity_extractor_agent,
     EntityExtractorInput,
+    EntityExtractorOutput,
 )
+from agents.entity_extractor.dictionary import extract_entities_from_dictionary
 from agents.relation_sentiment.agent import (
     relation_sentiment_agent,
     RelationSentimentInput,
 )
+from agents.combined_analysis.agent import (
+    combined_analysis_agent,
+    CombinedAnalysisInput,
+)
+
+# 같은 기사/프롬프트/모델 조합이면 LLM 을 다시 부르지 않도록 디스크 캐시를 둔다.
+response_cache = AgentResponseCache()
+
+# 현재 분석 중 어느 단계라도 실패해서 기본값/부분 결과로 채웠는지 (중복 기사 인덱스 등록 여부 판단용)
+analysis_partial: ContextVar[bool] = ContextVar("analysis_partial", default=False)
+
+
+def mark_partial() -> None:
+    analysis_partial.set(True)
+    annotate(partial=True)
+
+
+async def run_agent_once(agent, context, span: Span):
+    """
+    에이전트를 한 번 실행한다. 스트리밍 중간 이벤트는 텍스트만 보관하고,
+    마지막 응답 한 번만 output_schema 로 파싱/검증한다.
+    응답이 비었거나 검증에 실패하면 AgentOutputError.
+    """
+    last_text = None
+
+    async for event in agent.run_async(context):
+        span.mark_event()
+
+        usage = getattr(event, "usage_metadata", None)
+        if usage is not None:
+            span.set(
+                input_tokens=usage.prompt_token_count,
+                output_tokens=usage.candidates_token_count,
+            )
+
+        if getattr(event, "output", None) is not None:
+            final_output = decode_agent_value(agent, event.output)
+            if final_output is None:
+                raise AgentOutputError("output_validation_failed")
+            return final_output
+
+        text_val = event_text(event)
+        if text_val:
+            last_text = text_val
+
+    span.set(output_chars=len(last_text or ""))
+
+    if last_text is None:
+        raise AgentOutputError("empty_response")
+
+    final_output = decode_agent_text(agent, last_text)
+    if final_output is None:
+        raise AgentOutputError("output_validation_failed")
+    return final_output
+
 
 async def run_async_agent(agent, context, payload):
+    """
+    에이전트를 실행하고 결과를 agent.output_schema 모델로 돌려준다.
+    캐시 → (timeout / 재시도 / hedge / circuit breaker) → run_agent_once 순서.
+    끝내 실패하면 None.
+    """
     final_output = None
     
     if hasattr(payload, 'model_dump'):
@@ -32,52 +104,33 @@ async def run_async_agent(agent, context, payload):
 
     context.agent = agent 
 
-
-    try:
-        async for event in agent.run_async(context):
-            
-
-            if hasattr(event, "output") and event.output is not None:
-                final_output = event.output
-                break 
-
-            if hasattr(event, "content") and event.content:
-                try:
-                    if hasattr(event.content, 'parts') and event.content.parts:
-                        text_val = event.content.parts[0].text
-                    else:
-                        text_val = str(event.content)
-
-                    text_val = re.sub(r"```json\s*", "", text_val)
-                    text_val = re.sub(r"```", "", text_val)
-                    text_val = text_val.strip()
-
-                    data_dict = json.loads(text_val)
-
-                    class DictToObj:
-                        def __init__(self, d):
-                            for k, v in d.items():
-                                if isinstance(v, list):
-                                    setattr(self, k, [DictToObj(i) if isinstance(i, dict) else i for i in v])
-                                else:
-                                    setattr(self, k, v)
-                        def model_dump(self):
-                            def convert(obj):
-                                if isinstance(obj, DictToObj):
-                                    return {k: convert(v) for k, v in obj.__dict__.items()}
-                                elif isinstance(obj, list):
-                                    return [convert(i) for i in obj]
-                                else:
-                                    return obj
-                            return convert(self)
-
-                    final_output = DictToObj(data_dict)
-                    
-                except Exception as e:
-                    pass 
-
-    except Exception as e:
-        print(f"[에러] 에이전트 실행 중 예외 발생: {e}")
+    with Span("agent", agent=agent.name) as span:
+        span.set(
+            prompt_chars=len(str(getattr(agent, "instruction", ""))),
+            input_chars=len(json.dumps(context.input, ensure_ascii=False, default=str)),
+        )
+
+        cache_key = response_cache.make_key(agent, context.input)
+        # sqlite 조회/디코딩은 스레드에서 (배치 모드에서 다른 기사 코루틴을 막지 않도록)
+        cached_output = await response_cache.aget(cache_key, lambda value: decode_agent_value(agent, value))
+        if cached_output is not None:
+            span.set(cache="hit")
+            return cached_output
+
+        span.set(cache="bypass" if response_cache.bypass else "miss")
+
+        try:
+            # 재시도/hedge 로 동시에 여러 번 돌 수 있으므로 시도마다 context 를 복사
+            final_output = await call_with_retries(
+                agent.name,
+                lambda: run_agent_once(agent, copy.copy(context), span),
+            )
+        except Exception as e:
+            print(f"[에러] 에이전트 실행 중 예외 발생: {type(e).__name__}: {e}")
+            span.fail(f"{type(e).__name__}: {e}")
+
+        if final_output is not None:
+            await response_cache.aset(cache_key, agent.name, final_output.model_dump())
 
     return final_output
 
@@ -88,47 +141,126 @@ def run(agent, context, payload):
 # ============================================================
 #  뉴스 파이프라인 메인 로직
 # ============================================================
-def run_news_analysis(article: str) -> Dict[str, Any]:
-
-    context = FakeContext()
-
-    prompt_injected_article = (
+def build_prompt_injected_article(article: str) -> str:
+    return (
         f"--- [분석 대상 뉴스 기사 시작] ---\n"
         f"{article}\n"
         f"--- [분석 대상 뉴스 기사 끝] ---\n"
         f"위 기사 내용을 바탕으로 지시사항을 수행하세요."
     )
 
-    print("뉴스 타입 분류 중...")
-    news_type_res = run(
-        news_type_classifier_agent,
-        context,
-        NewsTypeInput(article=prompt_injected_article) 
+
+# 기업 사전(company_match)만으로 기사 속 기업이 다 설명되면 엔티티 추출 LLM 호출을 건너뛴다.
+ENTITY_FAST_PATH = os.getenv("ENTITY_FAST_PATH", "").lower() in ("1", "true", "yes")
+
+# chain: 3단계 에이전트 체인 / combined: combined_analysis_agent 단일 호출
+ANALYSIS_MODES = ("chain", "combined")
+ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "chain")
+
+
+async def run_combined_analysis_async(article: str) -> Dict[str, Any]:
+    """
+    세 단계를 combined_analysis_agent 한 번의 호출로 처리한다.
+    체인 모드와 비교할 수 있도록 반환 형태는 3단계(relation_sentiment) 결과와 같다.
+    """
+    prompt_injected_article = build_prompt_injected_article(article)
+
+    print("통합 분석 중 (단일 호출)...")
+    combined_res = await run_async_agent(
+        combined_analysis_agent,
+        FakeContext(),
+        CombinedAnalysisInput(article=prompt_injected_article),
     )
-    
+
+    if combined_res is None:
+        print("[경고] 통합 분석 실패. 빈 결과를 반환합니다.")
+        mark_partial()
+        return {"news_type": "기타", "entities": [], "relations": []}
+
+    data = combined_res.model_dump()
+    news_type = (data.get("news_type") or {}).get("news_type") or "기타"
+    entities = (data.get("entity_extraction") or {}).get("entities") or []
+
+    print(f"결과: {news_type}, {len(entities)}개 추출됨")
+    annotate(news_type=news_type, entity_count=len(entities))
+
+    # relation_sentiment 는 스키마 필수 필드라 없으면 디코딩 단계에서 이미 실패(None) 한다
+    print("완료!")
+    return data["relation_sentiment"]
+
+
+@traced("news_analysis")
+async def run_news_analysis_async(
+    article: str,
+    dictionary_fast_path: bool = ENTITY_FAST_PATH,
+    mode: str = ANALYSIS_MODE,
+) -> Dict[str, Any]:
+    """
+    1단계(뉴스 타입 분류)와 2단계(엔티티 추출)는 기사에만 의존하므로
+    하나의 이벤트 루프에서 asyncio.gather 로 동시에 실행하고,
+    두 결과가 모두 나온 뒤 3단계(관계/감성 분석)를 실행한다.
+
+    dictionary_fast_path=True 이면 2단계 전에 기업 사전 매칭을 먼저 돌려보고,
+    사전만으로 충분하다고 판단되면 entity_extractor_agent 를 부르지 않는다.
+
+    mode="combined" 이면 체인 대신 run_combined_analysis_async 로 처리한다.
+    """
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"알 수 없는 분석 모드: {mode} (가능: {ANALYSIS_MODES})")
+    annotate(mode=mode, article_chars=len(article))
+    if mode == "combined":
+        return await run_combined_analysis_async(article)
+
+    prompt_injected_article = build_prompt_injected_article(article)
+
+    dictionary_entities = (
+        extract_entities_from_dictionary(article) if dictionary_fast_path else None
+    )
+
+    # run_async_agent 가 context.input / context.agent 를 덮어쓰므로
+    # 동시에 도는 단계끼리는 context 를 공유하지 않는다.
+    annotate(entity_source="dictionary" if dictionary_entities is not None else "llm")
+    if dictionary_entities is not None:
+        print("뉴스 타입 분류 중... (엔티티는 기업 사전 매칭 결과 사용)")
+        news_type_res = await run_async_agent(
+            news_type_classifier_agent,
+            FakeContext(),
+            NewsTypeInput(article=prompt_injected_article),
+        )
+        entity_res = EntityExtractorOutput(entities=dictionary_entities)
+    else:
+        print("뉴스 타입 분류 + 엔티티 추출 중...")
+        news_type_res, entity_res = await asyncio.gather(
+            run_async_agent(
+                news_type_classifier_agent,
+                FakeContext(),
+                NewsTypeInput(article=prompt_injected_article),
+            ),
+            run_async_agent(
+                entity_extractor_agent,
+                FakeContext(),
+                EntityExtractorInput(article=prompt_injected_article),
+            ),
+        )
+
     if news_type_res is None:
         print("[경고] 1단계 실패. 기본값 '기타'로 진행합니다.")
+        mark_partial()
         news_type = "기타"
     else:
         news_type = news_type_res.news_type
-    
-    print(f"결과: {news_type}")
 
+    print(f"결과: {news_type}")
 
-    print("엔티티 추출 중...")
-    entity_res = run(
-        entity_extractor_agent,
-        context,
-        EntityExtractorInput(article=prompt_injected_article)
-    )
-    
     if entity_res is None:
         print("[경고] 2단계 실패. 빈 리스트로 진행합니다.")
+        mark_partial()
         entities = []
     else:
         entities = entity_res.entities
 
     print(f"결과: {len(entities)}개 추출됨")
+    annotate(news_type=news_type, entity_count=len(entities))
 
 
     print("관계 및 감성 분석 중...")
@@ -137,10 +269,11 @@ def run_news_analysis(article: str) -> Dict[str, Any]:
         news_type=news_type,
         entities=entities,
     )
-    final_res = run(relation_sentiment_agent, context, rel_input)
+    final_res = await run_async_agent(relation_sentiment_agent, FakeContext(), rel_input)
     
     if final_res is None:
         print("[경고] 3단계 실패. 부분 결과만 반환합니다.")
+        mark_partial()
         return {
             "news_type": news_type,
             "entities": [e.model_dump() if hasattr(e, 'model_dump') else e for e in entities],
@@ -151,35 +284,275 @@ def run_news_analysis(article: str) -> Dict[str, Any]:
     return final_res.model_dump()
 
 
+def run_news_analysis(
+    article: str,
+    dictionary_fast_path: bool = ENTITY_FAST_PATH,
+    mode: str = ANALYSIS_MODE,
+) -> Dict[str, Any]:
+    return asyncio.run(run_news_analysis_async(article, dictionary_fast_path, mode))
+
+
+# ============================================================
+#  중복(전재) 기사 재사용
+# ============================================================
+# NEAR_DUP_INDEX_PATH 가 있으면 SimHash 인덱스를 유지하면서,
+# 이미 분석한 기사와 거의 같은 기사는 LLM 을 부르지 않고 이전 결과를 재사용한다.
+NEAR_DUP_INDEX_PATH = os.getenv("NEAR_DUP_INDEX_PATH")
+# 배치 도중 죽어도 인덱스를 잃지 않도록 이만큼 추가될 때마다 / 이 시간이 지날 때마다 저장
+NEAR_DUP_SAVE_EVERY = int(os.getenv("NEAR_DUP_SAVE_EVERY", "20"))
+NEAR_DUP_SAVE_SEC = float(os.getenv("NEAR_DUP_SAVE_SEC", "30"))
+
+# 모드별로 결과를 만드는 에이전트 (프롬프트가 바뀌면 예전 결과를 재사용하지 않도록 지문에 넣는다)
+MODE_AGENTS = {
+    "chain": (news_type_classifier_agent, entity_extractor_agent, relation_sentiment_agent),
+    "combined": (combined_analysis_agent,),
+}
+
+
+def analysis_profile(mode: str = ANALYSIS_MODE, dictionary_fast_path: bool = ENTITY_FAST_PATH) -> str:
+    """분석 모드 + 엔티티 fast path + MODEL_ID + 해당 모드 에이전트 프롬프트의 해시"""
+    prompts = "|".join(
+        f"{agent.name}:{getattr(agent, 'instruction', '')}" for agent in MODE_AGENTS.get(mode, ())
+    )
+    payload = f"{mode}|{int(dictionary_fast_path)}|{MODEL_ID}|{prompts}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_near_dup_index() -> Optional[SimHashIndex]:
+    if not NEAR_DUP_INDEX_PATH:
+        return None
+    if not Path(NEAR_DUP_INDEX_PATH).exists():
+        return SimHashIndex()
+    index = SimHashIndex.load(NEAR_DUP_INDEX_PATH)
+    # 예전 형식(분석 지문 없는 항목) 은 어떤 모드/프롬프트 결과인지 몰라서 버린다
+    for key in [k for k, (_, _, v) in index.entries.items() if not (isinstance(v, dict) and "profile" in v)]:
+        index.remove(key)
+    return index
+
+
+near_dup_index = load_near_dup_index()
+
+
+_near_dup_unsaved = 0
+_near_dup_saved_at = time.monotonic()
+
+
+def save_near_dup_index() -> None:
+    global _near_dup_unsaved, _near_dup_saved_at
+    if near_dup_index is not None:
+        near_dup_index.save(NEAR_DUP_INDEX_PATH)
+    _near_dup_unsaved = 0
+    _near_dup_saved_at = time.monotonic()
+
+
+def _maybe_save_near_dup_index() -> None:
+    global _near_dup_unsaved
+    _near_dup_unsaved += 1
+    if _near_dup_unsaved >= NEAR_DUP_SAVE_EVERY or time.monotonic() - _near_dup_saved_at >= NEAR_DUP_SAVE_SEC:
+        save_near_dup_index()
+
+
+async def run_news_analysis_dedup_async(
+    article_id: str,
+    article: str,
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    (분석 결과, 원본 기사 id) 를 돌려준다.
+    중복이 아니면 원본 기사 id 는 None 이고, 모든 단계가 성공한 결과만 인덱스에 등록된다
+    (실패해서 기본값으로 채운 결과를 전재 기사들이 TTL 동안 재사용하지 않도록).
+    인덱스 키는 본문 해시라서 실행마다 겹치는 id(JSONL 줄 번호 등) 가 서로를 덮어쓰지 않는다.
+    분석 지문(analysis_profile) 이 다른 항목(다른 모드/모델/프롬프트의 결과) 은 중복으로 보지 않는다.
+    """
+    if near_dup_index is None:
+        return await run_news_analysis_async(article), None
+
+    profile = analysis_profile()
+    fingerprint = simhash(article)
+    hit = near_dup_index.find(fingerprint, accept=lambda entry: entry.get("profile") == profile)
+    if hit is not None:
+        _, distance, entry = hit
+        original_id, result = entry["article_id"], entry["result"]
+        print(f"[INFO] {article_id} 는 {original_id} 의 중복 기사 (해밍거리 {distance}) → 결과 재사용")
+        annotate(near_duplicate_of=original_id, simhash_distance=distance)
+        return result, original_id
+
+    token = analysis_partial.set(False)
+    try:
+        result = await run_news_analysis_async(article)
+        partial = analysis_partial.get()
+    finally:
+        analysis_partial.reset(token)
+
+    if not partial:
+        content_key = hashlib.sha256(f"{profile}|{article}".encode("utf-8")).hexdigest()
+        near_dup_index.add(
+            content_key, fingerprint, {"article_id": article_id, "profile": profile, "result": result}
+        )
+        _maybe_save_near_dup_index()
+    return result, None
+
+
 def load_article_from_file(path: str) -> str:
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"기사 파일을 찾을 수 없습니다: {p}")
     return p.read_text(encoding="utf-8")
 
+
+# ============================================================
+#  배치 / 스트림 모드
+# ============================================================
+OUTPUT_DIR = Path("output")
+DEFAULT_BATCH_CONCURRENCY = 8
+JSONL_ARTICLE_KEYS = ("article", "text", "content")
+
+
+def is_batch_source(path: Path) -> bool:
+    return str(path) == "-" or path.is_dir() or path.suffix == ".jsonl"
+
+
+def iter_articles(source: Path) -> Iterator[Tuple[str, str]]:
+    """
+    (article_id, article) 를 하나씩 흘려보낸다.
+    - 디렉토리: 안의 *.txt 파일 하나가 기사 하나 (id = 파일 stem)
+    - JSONL 파일 또는 '-'(stdin): 한 줄에 기사 하나
+      {"id": "...", "article": "..."}  (본문 키는 article / text / content 중 하나)
+      id 가 없으면 "<파일명>:<줄 번호>" (stdin 은 "stdin:<줄 번호>")
+    """
+    if source.is_dir():
+        for p in sorted(source.glob("*.txt")):
+            yield p.stem, p.read_text(encoding="utf-8")
+        return
+
+    is_stdin = str(source) == "-"
+    source_label = "stdin" if is_stdin else source.name
+    f = sys.stdin if is_stdin else source.open("r", encoding="utf-8")
+    try:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"[경고] {line_no}번째 줄 JSON 파싱 실패 → 스킵")
+                continue
+
+            article = next((rec[k] for k in JSONL_ARTICLE_KEYS if rec.get(k)), None)
+            if not article:
+                print(f"[경고] {line_no}번째 줄에 기사 본문이 없음 → 스킵")
+                continue
+
+            yield str(rec.get("id") or f"{source_label}:{line_no}"), article
+    finally:
+        if not is_stdin:
+            f.close()
+
+
+async def run_batch_async(
+    source: Path,
+    output_path: Path,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> int:
+    """
+    source 의 기사들을 최대 concurrency 개까지 동시에 분석하고,
+    끝나는 순서대로 output_path(JSONL)에 한 줄씩 바로 기록한다.
+    기사 읽기도 세마포어에 묶여 있어서, 긴 스트림이어도 메모리에는
+    처리 중인 기사만 올라간다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = set()
+    written = 0
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with output_path.open("w", encoding="utf-8") as out:
+
+        async def analyze_one(article_id: str, article: str) -> None:
+            nonlocal written
+            try:
+                with Span("batch_article", article_id=article_id):
+                    result, duplicate_of = await run_news_analysis_dedup_async(article_id, article)
+                record = {"id": article_id, "result": result}
+                if duplicate_of is not None:
+                    record["duplicate_of"] = duplicate_of
+            except Exception as e:
+                print(f"[에러] 기사 {article_id} 분석 실패: {e}")
+                record = {"id": article_id, "error": str(e)}
+            finally:
+                semaphore.release()
+
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            written += 1
+            print(f"[INFO] ({written}) {article_id} 저장 완료")
+
+        for article_id, article in iter_articles(source):
+            await semaphore.acquire()
+            task = asyncio.create_task(analyze_one(article_id, article))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if pending:
+            await asyncio.gather(*pending)
+
+    return written
+
+
+def run_batch(source: Path, output_path: Path, concurrency: int = DEFAULT_BATCH_CONCURRENCY) -> int:
+    return asyncio.run(run_batch_async(source, output_path, concurrency))
+
+
 # ============================================================
 #  실행
 # ============================================================
 if __name__ == "__main__":
+    # 사용법:
+    #   python news_pipeline.py news1.txt               → 단건 분석 (output/news1.json)
+    #   python news_pipeline.py articles/ [동시성]        → 디렉토리 배치 (output/articles.jsonl)
+    #   python news_pipeline.py feed.jsonl [동시성]       → JSONL 배치 (output/feed.jsonl)
+    #   cat feed.jsonl | python news_pipeline.py - [동시성] → stdin 스트림 (output/stdin.jsonl)
+    #   ANALYSIS_MODE=combined python news_pipeline.py ... → 단일 호출 모드 (output/*.combined.json[l])
+    #   TRACE_PATH=output/trace.jsonl python news_pipeline.py ... → 단계별 span 기록
+    #   NEAR_DUP_INDEX_PATH=output/simhash.json python news_pipeline.py ... → 중복 기사 결과 재사용
     default_path = "news1.txt"
     file_path = sys.argv[1] if len(sys.argv) > 1 else default_path
     
     input_path = Path(file_path)
+    # 같은 기사로 체인/통합 모드를 비교할 수 있게 출력 파일을 분리
+    mode_suffix = "" if ANALYSIS_MODE == "chain" else f".{ANALYSIS_MODE}"
+
+    if is_batch_source(input_path):
+        concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BATCH_CONCURRENCY
+        stem = "stdin" if file_path == "-" else input_path.resolve().stem
+        output_path = OUTPUT_DIR / f"{stem}{mode_suffix}.jsonl"
+        print(f"[INFO] 배치 분석 시작: {file_path} (동시성 {concurrency})")
+
+        count = run_batch(input_path, output_path, concurrency)
+        save_near_dup_index()
+        print(f"\n[INFO] 배치 완료: {count}건 → {output_path}")
+        print(f"[INFO] 캐시: {response_cache.stats()}")
+        sys.exit(0)
+
     print(f"[INFO] 분석 시작: {input_path}")
 
     try:
         article_text = load_article_from_file(file_path)
-        result = run_news_analysis(article_text)
+        result, duplicate_of = asyncio.run(
+            run_news_analysis_dedup_async(input_path.stem, article_text)
+        )
+        save_near_dup_index()
 
-        output_dir = Path("output")
+        output_dir = OUTPUT_DIR
         output_dir.mkdir(exist_ok=True)
-        output_filename = input_path.stem + ".json"
+        output_filename = input_path.stem + mode_suffix + ".json"
         output_path = output_dir / output_filename
 
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(result, f, indent=2, ensure_ascii=False)
 
         print(f"\n[INFO] 결과 저장 완료: {output_path}")
+        print(f"[INFO] 캐시: {response_cache.stats()}")
         
         # 화면에 출력
         # print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -1,3 +1,11 @@
 from .parsers import to_float_ratio, to_int, parse_date_str
+from .near_duplicate import simhash, hamming_distance, SimHashIndex
 
-__all__ = ["to_float_ratio", "to_int", "parse_date_str"]
+__all__ = [
+    "to_float_ratio",
+    "to_int",
+    "parse_date_str",
+    "simhash",
+    "hamming_distance",
+    "SimHashIndex",
+]
@@ -0,0 +1,175 @@
+# -----------------------------
+# 중복(전재) 기사 탐지용 SimHash 인덱스
+# -----------------------------
+import os
+import re
+import json
+import time
+import hashlib
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SIMHASH_BITS = 64
+TOKEN_RE = re.compile(r"[가-힣A-Za-z0-9]+")
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def simhash(text: str) -> int:
+    """
+    단어 bigram 을 shingle 로 쓰는 64비트 SimHash.
+    언론사명/기자 바이라인 정도만 다른 전재 기사는 해밍거리 몇 비트 이내로 모인다.
+    """
+    tokens = TOKEN_RE.findall(text.lower())
+    if len(tokens) < 2:
+        shingles = Counter(tokens)
+    else:
+        shingles = Counter(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+    weights = [0] * SIMHASH_BITS
+    for shingle, count in shingles.items():
+        h = _shingle_hash(shingle)
+        for i in range(SIMHASH_BITS):
+            weights[i] += count if (h >> i) & 1 else -count
+
+    fp = 0
+    for i, w in enumerate(weights):
+        if w > 0:
+            fp |= 1 << i
+    return fp
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """
+    SimHash 지문 → (key, value) 인덱스.
+
+    - 해밍거리 max_distance 이내 탐색: 지문을 max_distance+1 개 밴드로 나누면
+      (비둘기집 원리) 가까운 지문은 적어도 한 밴드가 정확히 같으므로,
+      밴드별 dict 조회 몇 번 + 후보 비교만으로 끝난다.
+    - ttl_sec 보다 오래된 항목과 max_entries 초과분은 오래된 순으로 제거
+    - save()/load() 로 JSON 파일에 저장/복원
+    """
+
+    def __init__(
+        self,
+        max_distance: int = 3,
+        ttl_sec: float = 3 * 24 * 3600,
+        max_entries: int = 100_000,
+    ):
+        self.max_distance = max_distance
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+
+        self.num_bands = max_distance + 1
+        self.band_bits = SIMHASH_BITS // self.num_bands
+        self.band_mask = (1 << self.band_bits) - 1
+
+        # key → (fingerprint, added_at, value), 추가된 시간 순서 유지
+        self.entries: "OrderedDict[str, Tuple[int, float, Any]]" = OrderedDict()
+        self.bands: List[Dict[int, set]] = [dict() for _ in range(self.num_bands)]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _band_values(self, fingerprint: int):
+        for i in range(self.num_bands):
+            yield i, (fingerprint >> (i * self.band_bits)) & self.band_mask
+
+    def _remove(self, key: str) -> None:
+        fingerprint, _, _ = self.entries.pop(key)
+        for i, band in self._band_values(fingerprint):
+            bucket = self.bands[i].get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.bands[i][band]
+
+    def remove(self, key: str) -> None:
+        if key in self.entries:
+            self._remove(key)
+
+    def evict(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        while self.entries:
+            key, (_, added_at, _) = next(iter(self.entries.items()))
+            if now - added_at <= self.ttl_sec and len(self.entries) <= self.max_entries:
+                break
+            self._remove(key)
+
+    def add(self, key: str, fingerprint: int, value: Any = None, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        if key in self.entries:
+            self._remove(key)
+
+        self.entries[key] = (fingerprint, now, value)
+        for i, band in self._band_values(fingerprint):
+            self.bands[i].setdefault(band, set()).add(key)
+
+        self.evict(now)
+
+    def find(
+        self,
+        fingerprint: int,
+        now: Optional[float] = None,
+        accept: Optional[Callable[[Any], bool]] = None,
+    ) -> Optional[Tuple[str, int, Any]]:
+        """
+        가장 가까운 (key, 해밍거리, value). max_distance 안에 없으면 None.
+        accept 가 있으면 accept(value) 가 참인 항목만 후보로 본다.
+        """
+        now = time.time() if now is None else now
+        best: Optional[Tuple[str, int, Any]] = None
+
+        for i, band in self._band_values(fingerprint):
+            for key in self.bands[i].get(band, ()):
+                fp, added_at, value = self.entries[key]
+                if now - added_at > self.ttl_sec:
+                    continue
+                if accept is not None and not accept(value):
+                    continue
+                dist = hamming_distance(fingerprint, fp)
+                if dist <= self.max_distance and (best is None or dist < best[1]):
+                    best = (key, dist, value)
+
+        return best
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+
+        data = {
+            "max_distance": self.max_distance,
+            "ttl_sec": self.ttl_sec,
+            "max_entries": self.max_entries,
+            "entries": [
+                {"key": k, "fp": fp, "added_at": ts, "value": v}
+                for k, (fp, ts, v) in self.entries.items()
+            ],
+        }
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SimHashIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        index = cls(
+            max_distance=data.get("max_distance", 3),
+            ttl_sec=data.get("ttl_sec", 3 * 24 * 3600),
+            max_entries=data.get("max_entries", 100_000),
+        )
+        for e in data.get("entries", []):
+            index.add(e["key"], e["fp"], e.get("value"), now=e["added_at"])
+        index.evict()
+        return index